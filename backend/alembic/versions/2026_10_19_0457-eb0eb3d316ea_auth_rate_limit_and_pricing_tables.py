@@ -0,0 +1,95 @@
+"""auth, rate limit and pricing tables
+
+Tables added after the baseline: dynamic pricing rules and sales counters,
+seat layout versions, password reset / verification tokens and the shared
+rate limit counters.
+
+The server created missing tables on startup until the lifespan change, so
+a stamped baseline database may already have some of them; those are
+skipped.
+
+Revision ID: eb0eb3d316ea
+Revises: 52bdd40d6fe8
+Create Date: 2026-10-19 04:57:38.102544
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'eb0eb3d316ea'
+down_revision = '52bdd40d6fe8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Offline (--sql) scripts cannot look, so they create every table
+    existing = set() if context.is_offline_mode() else set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'rate_limit_counter' not in existing:
+        op.create_table('rate_limit_counter',
+        sa.Column('limit_key', sa.String(length=150), nullable=False),
+        sa.Column('window_start', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('request_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('limit_key', 'window_start')
+        )
+    if 'venue_layout_version' not in existing:
+        op.create_table('venue_layout_version',
+        sa.Column('venue_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['venue_id'], ['venue.venue_id'], ),
+        sa.PrimaryKeyConstraint('venue_id')
+        )
+    if 'auth_token' not in existing:
+        op.create_table('auth_token',
+        sa.Column('token_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('purpose', sa.String(length=30), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('email', sa.String(length=100), nullable=False),
+        sa.Column('expires_at', sa.TIMESTAMP(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.user_id'], ),
+        sa.PrimaryKeyConstraint('token_id'),
+        sa.UniqueConstraint('token_hash')
+        )
+        op.create_index('ix_auth_token_expires_at', 'auth_token', ['expires_at'], unique=False)
+        op.create_index('ix_auth_token_purpose_email', 'auth_token', ['purpose', 'email'], unique=False)
+    if 'pricing_rule' not in existing:
+        op.create_table('pricing_rule',
+        sa.Column('rule_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('show_id', sa.Integer(), nullable=True),
+        sa.Column('seat_category', sa.String(length=20), nullable=True),
+        sa.Column('floor_price', sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column('ceiling_price', sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['show_id'], ['show_table.show_id'], ),
+        sa.PrimaryKeyConstraint('rule_id')
+        )
+    if 'performance_sales_counter' not in existing:
+        op.create_table('performance_sales_counter',
+        sa.Column('counter_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('performance_id', sa.Integer(), nullable=False),
+        sa.Column('seat_category', sa.String(length=20), nullable=False),
+        sa.Column('seats_sold', sa.Integer(), nullable=False),
+        sa.Column('velocity', sa.Float(), nullable=False),
+        sa.Column('velocity_updated_at', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['performance_id'], ['performance.performance_id'], ),
+        sa.PrimaryKeyConstraint('counter_id'),
+        sa.UniqueConstraint('performance_id', 'seat_category')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('performance_sales_counter')
+    op.drop_table('pricing_rule')
+    op.drop_index('ix_auth_token_purpose_email', table_name='auth_token')
+    op.drop_index('ix_auth_token_expires_at', table_name='auth_token')
+    op.drop_table('auth_token')
+    op.drop_table('venue_layout_version')
+    op.drop_table('rate_limit_counter')
@@ -0,0 +1,32 @@
+"""pricing version
+
+Single-row version counter bumped by POST /api/admin/pricing/recompute, so
+every worker's dynamic pricing thread recomputes (app/pricing_engine.py).
+
+Revision ID: a666249a493b
+Revises: aa5ea111b1c5
+Create Date: 2026-10-19 05:44:33.222711
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a666249a493b'
+down_revision = 'aa5ea111b1c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('pricing_version',
+    sa.Column('pricing_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('pricing_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('pricing_version')
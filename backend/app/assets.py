@@ -0,0 +1,77 @@
+"""
+Fingerprinted static assets
+
+build_assets.py writes content-hashed copies of the static files (plus the
+inline scripts and styles it extracts from the templates) to
+frontend/build/assets, each with .gz/.br siblings, and a manifest mapping
+logical names ("js/app.js") to them. When a manifest exists the app renders
+the built templates and serves /assets with Cache-Control: immutable,
+picking the precompressed variant the client accepts; otherwise templates
+are rendered from source and asset() points at /static.
+
+Workers read the manifest at startup, so restart them after a build.
+"""
+
+import json
+import mimetypes
+from pathlib import Path
+from typing import Dict
+import anyio
+from starlette.responses import FileResponse
+from starlette.staticfiles import StaticFiles
+from app import compression
+
+ASSETS_URL = "/assets"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_manifest: Dict[str, str] = {}
+
+
+def load_manifest(build_dir: Path) -> bool:
+    """Load build_dir/manifest.json if present; True when built assets are in use"""
+    global _manifest
+    path = build_dir / "manifest.json"
+    if not path.exists():
+        _manifest = {}
+        return False
+    _manifest = json.loads(path.read_text())
+    return True
+
+
+def asset(name: str) -> str:
+    """URL of a static file by its logical name (Jinja global)"""
+    built = _manifest.get(name)
+    if built is None:
+        return f"/static/{name}"
+    return f"{ASSETS_URL}/{built}"
+
+
+def asset_built(name: str) -> bool:
+    return name in _manifest
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for fingerprinted files: long-lived caching and precompressed variants"""
+
+    async def get_response(self, path: str, scope):
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        accepted = compression.accepted_encodings(accept_encoding)
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, path + suffix)
+            if stat_result is not None:
+                return FileResponse(
+                    full_path,
+                    stat_result=stat_result,
+                    media_type=mimetypes.guess_type(path)[0] or "application/octet-stream",
+                    headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding", "Cache-Control": IMMUTABLE}
+                )
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = IMMUTABLE
+        return response
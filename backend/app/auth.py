@@ -4,8 +4,17 @@ from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import hashlib
+import multiprocessing
 import os
+import threading
+import time
 from dotenv import load_dotenv
+from app import metrics
+from app.utils import TTLCache
 
 load_dotenv()
 
@@ -13,8 +22,19 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# Dedicated bcrypt worker pool: processes so hashing scales across cores and
+# never occupies the request threadpool. 0 workers falls back to threads.
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", str(min(os.cpu_count() or 1, 4))))
+# Hash jobs allowed to wait behind the busy workers before logins get a 503
+PASSWORD_POOL_QUEUE_LIMIT = int(os.getenv("PASSWORD_POOL_QUEUE_LIMIT", "32"))
+
+# Verified JWT claims, keyed by token digest (0 size disables the cache)
+CLAIMS_CACHE_SIZE = int(os.getenv("CLAIMS_CACHE_SIZE", "10000"))
+CLAIMS_CACHE_TTL_SECONDS = float(os.getenv("CLAIMS_CACHE_TTL_SECONDS", "300"))
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+_claims_cache = TTLCache(CLAIMS_CACHE_SIZE, CLAIMS_CACHE_TTL_SECONDS)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -27,6 +47,105 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# ============================================
+# PASSWORD WORKER POOL
+# ============================================
+
+_password_pool = None
+_password_pool_lock = threading.Lock()
+_password_slots = threading.BoundedSemaphore(max(PASSWORD_POOL_WORKERS, 1) + PASSWORD_POOL_QUEUE_LIMIT)
+
+
+def _get_password_pool():
+    """Create the worker pool on first use (spawned, so workers never inherit server threads)"""
+    global _password_pool
+    if _password_pool is None:
+        with _password_pool_lock:
+            if _password_pool is None:
+                if PASSWORD_POOL_WORKERS > 0:
+                    _password_pool = ProcessPoolExecutor(
+                        max_workers=PASSWORD_POOL_WORKERS,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    _password_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bcrypt")
+    return _password_pool
+
+
+def _reset_password_pool(broken):
+    """Drop a pool whose worker died so the next call starts a new one"""
+    global _password_pool
+    with _password_pool_lock:
+        if _password_pool is broken:
+            _password_pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
+async def _submit_to_password_pool(pool, func, *args):
+    if not _password_slots.acquire(blocking=False):
+        raise _password_pool_busy()
+    try:
+        future = pool.submit(func, *args)
+    except Exception:
+        _password_slots.release()
+        raise
+    metrics.inc("theatre_background_queue_depth", queue="password_pool")
+    future.add_done_callback(_release_password_slot)
+    return await asyncio.wrap_future(future)
+
+
+async def _run_in_password_pool(func, *args):
+    """Run a bcrypt call in the worker pool, rejecting fast when it is saturated"""
+    for _ in range(2):
+        pool = _get_password_pool()
+        try:
+            return await _submit_to_password_pool(pool, func, *args)
+        except BrokenProcessPool:
+            # A worker process died: the pool is unusable for good, replace it and retry once
+            print("Password worker pool broken, restarting it")
+            _reset_password_pool(pool)
+    raise _password_pool_busy()
+
+
+def _release_password_slot(_future):
+    _password_slots.release()
+    metrics.dec("theatre_background_queue_depth", queue="password_pool")
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the bcrypt worker pool"""
+    return await _run_in_password_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the bcrypt worker pool"""
+    return await _run_in_password_pool(get_password_hash, password)
+
+
+def warm_password_pool():
+    """Start the bcrypt workers ahead of the first login (called on application startup)"""
+    pool = _get_password_pool()
+    for _ in range(max(PASSWORD_POOL_WORKERS, 1)):
+        pool.submit(os.getpid)
+
+
+def shutdown_password_pool():
+    """Stop the bcrypt workers (called on application shutdown)"""
+    global _password_pool
+    with _password_pool_lock:
+        if _password_pool is not None:
+            _password_pool.shutdown(wait=False, cancel_futures=True)
+            _password_pool = None
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -39,10 +158,28 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+def _decode_verified(token: str) -> dict:
+    """
+    Verify a JWT and return a copy of its claims, raising JWTError if invalid
+
+    Verified claims are cached under a digest of the token, so repeat requests
+    with the same token skip the signature check. An entry never outlives the
+    token's own exp claim.
+    """
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    payload = _claims_cache.get(digest)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        exp = payload.get("exp")
+        ttl = exp - time.time() if exp else None
+        _claims_cache.set(digest, payload, ttl)
+    return dict(payload)
+
+
 def decode_access_token(token: str):
     """Decode and verify a JWT token"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_verified(token)
         return payload
     except JWTError:
         return None
@@ -53,7 +190,7 @@ def get_current_user_from_token(credentials: HTTPAuthorizationCredentials = Secu
     token = credentials.credentials
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_verified(token)
         email: str = payload.get("sub")
         user_id: int = payload.get("user_id")
         
@@ -70,18 +207,3 @@ def get_current_user_from_token(credentials: HTTPAuthorizationCredentials = Secu
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
-
-
-def verify_admin(credentials: HTTPAuthorizationCredentials = Security(security)):
-    """Verify that the current user is an admin"""
-    payload = get_current_user_from_token(credentials)
-    
-    is_admin = payload.get("is_admin", False)
-    
-    if not is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
-    
-    return payload
@@ -0,0 +1,118 @@
+"""
+Cached catalog listings with strong ETags
+
+The public show, genre, venue and performance listings change only when an
+admin edits the catalog, so each listing is rendered once to JSON bytes and
+kept in-process keyed by (catalog version, listing key). Every admin
+mutation bumps CatalogVersion in its own transaction and then drops this
+worker's cache; other workers notice the new version on their next check,
+at most CATALOG_VERSION_CHECK_SECONDS later.
+
+Responses carry a strong ETag (a hash of the body) and Cache-Control:
+no-cache, so browsers always revalidate. A matching If-None-Match gets a 304
+without touching the database whenever the version was checked recently.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Hashable, NamedTuple, Optional
+from fastapi import Request, Response
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app import models, responses
+from app.utils import TTLCache
+
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", "256"))
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "3600"))
+CATALOG_VERSION_CHECK_SECONDS = float(os.getenv("CATALOG_VERSION_CHECK_SECONDS", "2"))
+
+CATALOG_ID = 1
+
+
+class CachedListing(NamedTuple):
+    body: bytes
+    etag: str
+
+
+_listings = TTLCache(CATALOG_CACHE_SIZE, CATALOG_CACHE_TTL_SECONDS)
+_version = 0
+_checked_at = float("-inf")
+_lock = threading.Lock()
+
+
+# =============================================
+# Version counter
+# =============================================
+
+def bump_version(db: Session):
+    """Increment the catalog version inside the caller's transaction"""
+    result = db.execute(
+        update(models.CatalogVersion)
+        .where(models.CatalogVersion.catalog_id == CATALOG_ID)
+        .values(version=models.CatalogVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(models.CatalogVersion(catalog_id=CATALOG_ID, version=1))
+        db.flush()
+
+
+def invalidate():
+    """Drop this worker's cached listings (call after committing a catalog change)"""
+    global _checked_at
+    with _lock:
+        _checked_at = float("-inf")
+    _listings.clear()
+
+
+def current_version(db: Session) -> int:
+    """Catalog version, re-read from the database at most every CATALOG_VERSION_CHECK_SECONDS"""
+    global _version, _checked_at
+    now = time.monotonic()
+    if now - _checked_at < CATALOG_VERSION_CHECK_SECONDS:
+        return _version
+    version = db.query(models.CatalogVersion.version).filter(
+        models.CatalogVersion.catalog_id == CATALOG_ID
+    ).scalar() or 0
+    with _lock:
+        _version, _checked_at = version, now
+    return version
+
+
+# =============================================
+# Listings
+# =============================================
+
+def get(version: int, key: Hashable) -> Optional[CachedListing]:
+    return _listings.get((version, key))
+
+
+def render(content) -> CachedListing:
+    """Render content to JSON bytes (same encoding as FastJSONResponse) with a strong ETag"""
+    body = responses.dumps(content)
+    return CachedListing(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+
+def put(version: int, key: Hashable, content) -> CachedListing:
+    """Render content and cache it"""
+    listing = render(content)
+    _listings.set((version, key), listing)
+    return listing
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def respond(request: Request, listing: CachedListing, media_type: str = "application/json") -> Response:
+    """200 with the cached body, or 304 if the client already has it"""
+    headers = {"ETag": listing.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, listing.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=listing.body, media_type=media_type, headers=headers)
@@ -0,0 +1,115 @@
+"""
+Response compression
+
+Responses larger than COMPRESSION_MIN_SIZE with a text-like content type are
+compressed with brotli when the client accepts it (and the Brotli package is
+installed), otherwise gzip. Bodies already encoded, streamed in several
+chunks, or below the threshold are passed through untouched.
+
+A compressed body is a different representation, so a strong ETag is turned
+into a weak one; If-None-Match already uses weak comparison, so 304s keep
+working for clients that send the compressed ETag back.
+"""
+
+import gzip
+import os
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = (
+    b"application/json", b"text/", b"application/javascript", b"image/svg+xml", b"application/xml"
+)
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """Encodings the client accepts (q=0 excluded)"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip())
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing large single-chunk text responses"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                return await send(message)
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = list(start.get("headers", []))
+            content_type = next((v for k, v in headers if k == b"content-type"), b"")
+            if (
+                message.get("more_body", False)
+                or len(body) < COMPRESSION_MIN_SIZE
+                or any(k == b"content-encoding" for k, _ in headers)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                await send(start)
+                return await send(message)
+
+            body = compress(body, encoding)
+            rewritten = []
+            for name, value in headers:
+                if name == b"content-length":
+                    continue
+                if name == b"etag" and not value.startswith(b"W/"):
+                    value = b"W/" + value
+                rewritten.append((name, value))
+            rewritten += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send({**start, "headers": rewritten})
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,518 @@
+"""
+Bulk CSV import for venues, seat layouts, shows and performances
+
+Files are streamed row by row, validated in chunks and written with one
+batched INSERT per chunk. Invalid rows are skipped and reported with their
+line number; valid rows are committed together at the end (nothing is
+written on a dry run). The commit bumps the catalog version, or for seats
+the layout version of each venue, so every worker drops its cached listings.
+
+Expected columns (header row required, extra columns are ignored):
+- venues:       venue_name, address_line1, address_line2, city, postal_code,
+                country, total_capacity, phone, facilities
+- seats:        venue_id | venue_name, row_number, seat_number, section,
+                seat_category, is_accessible, is_active
+- shows:        title, genre_id | genre_name, duration_minutes, description,
+                language, age_rating, poster_url, producer, director, show_status
+- performances: show_id | show_title, venue_id | venue_name, performance_date,
+                start_time, end_time, total_seats, performance_status,
+                special_notes, price_<Category>... (one column per seat category)
+"""
+
+import csv
+from datetime import date, time, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterator, List, Optional, TextIO
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import func, insert, tuple_
+from sqlalchemy.orm import Session
+from app import models, catalog_cache, scheduling, seat_layout
+
+CHUNK_SIZE = 1000
+
+# Cap on rows listed in the error report; counts are always exact
+MAX_REPORTED_ERRORS = 500
+
+PRICE_COLUMN_PREFIX = "price_"
+
+
+# Row schemas (validated in pydantic's lax mode, so CSV strings are coerced)
+class VenueRow(BaseModel):
+    venue_name: str
+    address_line1: str
+    address_line2: Optional[str] = None
+    city: str
+    postal_code: Optional[str] = None
+    country: str
+    total_capacity: int
+    phone: Optional[str] = None
+    facilities: Optional[str] = None
+
+
+class SeatRow(BaseModel):
+    venue_id: Optional[int] = None
+    venue_name: Optional[str] = None
+    row_number: str
+    seat_number: str
+    section: Optional[str] = None
+    seat_category: str
+    is_accessible: bool = False
+    is_active: bool = True
+
+
+class ShowRow(BaseModel):
+    title: str
+    genre_id: Optional[int] = None
+    genre_name: Optional[str] = None
+    duration_minutes: int
+    description: Optional[str] = None
+    language: Optional[str] = None
+    age_rating: Optional[str] = None
+    poster_url: Optional[str] = None
+    producer: Optional[str] = None
+    director: Optional[str] = None
+    show_status: str = "Active"
+
+
+class PerformanceRow(BaseModel):
+    show_id: Optional[int] = None
+    show_title: Optional[str] = None
+    venue_id: Optional[int] = None
+    venue_name: Optional[str] = None
+    performance_date: date
+    start_time: time
+    end_time: Optional[time] = None
+    total_seats: Optional[int] = None
+    performance_status: str = "Scheduled"
+    special_notes: Optional[str] = None
+
+
+class ImportReport:
+    """Accumulates per-row results for one import run"""
+
+    def __init__(self, entity: str, dry_run: bool):
+        self.entity = entity
+        self.dry_run = dry_run
+        self.rows_read = 0
+        self.rows_inserted = 0
+        self.error_count = 0
+        self.errors: List[dict] = []
+
+    def add_error(self, line: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self) -> dict:
+        return {
+            "entity": self.entity,
+            "dry_run": self.dry_run,
+            "rows_read": self.rows_read,
+            "rows_valid": self.rows_read - self.error_count,
+            "rows_inserted": self.rows_inserted,
+            "error_count": self.error_count,
+            "errors": sorted(self.errors, key=lambda e: e["line"])
+        }
+
+
+def _clean(row: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    """Strip whitespace and turn empty cells into None"""
+    cleaned = {}
+    for key, value in row.items():
+        if key is None:
+            continue  # surplus cells without a header
+        key = key.strip()
+        if isinstance(value, str):
+            value = value.strip()
+        cleaned[key] = value if value not in ("", None) else None
+    return cleaned
+
+
+def _format_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()
+    )
+
+
+def _chunks(reader: csv.DictReader) -> Iterator[List[tuple]]:
+    """Yield lists of (line_number, cleaned_row); a quoted field may span lines, so
+    each row is numbered by the file line it starts on"""
+    reader.fieldnames  # reads the header
+    chunk = []
+    line = reader.line_num + 1
+    for row in reader:
+        chunk.append((line, _clean(row)))
+        line = reader.line_num + 1
+        if len(chunk) >= CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _validate(chunk: List[tuple], schema, report: ImportReport) -> List[tuple]:
+    """Parse a chunk against a row schema, recording failures"""
+    valid = []
+    for line, row in chunk:
+        report.rows_read += 1
+        try:
+            present = {key: value for key, value in row.items() if value is not None}
+            valid.append((line, row, schema.model_validate(present)))
+        except ValidationError as e:
+            report.add_error(line, _format_validation_error(e))
+    return valid
+
+
+class _Lookup:
+    """Per-import name/ID resolution caches so each key is queried at most once"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.venues_by_name: Dict[str, int] = {}
+        self.venue_ids: set = set()
+        self.genres_by_name: Dict[str, int] = {}
+        self.genre_ids: set = set()
+        self.shows_by_title: Dict[str, int] = {}
+        self.show_durations: Dict[int, int] = {}
+        self.active_seats: Dict[int, int] = {}
+
+    def resolve_venues(self, ids: set, names: set):
+        ids = ids - self.venue_ids
+        names = names - set(self.venues_by_name)
+        if ids:
+            for (venue_id,) in self.db.query(models.Venue.venue_id).filter(models.Venue.venue_id.in_(ids)):
+                self.venue_ids.add(venue_id)
+        if names:
+            for venue_id, name in self.db.query(models.Venue.venue_id, models.Venue.venue_name).filter(
+                models.Venue.venue_name.in_(names)
+            ):
+                self.venues_by_name[name] = venue_id
+                self.venue_ids.add(venue_id)
+
+    def venue_id(self, venue_id: Optional[int], venue_name: Optional[str]) -> Optional[int]:
+        if venue_id is not None:
+            return venue_id if venue_id in self.venue_ids else None
+        return self.venues_by_name.get(venue_name)
+
+    def resolve_genres(self, ids: set, names: set):
+        ids = ids - self.genre_ids
+        names = names - set(self.genres_by_name)
+        if ids:
+            for (genre_id,) in self.db.query(models.Genre.genre_id).filter(models.Genre.genre_id.in_(ids)):
+                self.genre_ids.add(genre_id)
+        if names:
+            for genre_id, name in self.db.query(models.Genre.genre_id, models.Genre.genre_name).filter(
+                models.Genre.genre_name.in_(names)
+            ):
+                self.genres_by_name[name] = genre_id
+                self.genre_ids.add(genre_id)
+
+    def genre_id(self, genre_id: Optional[int], genre_name: Optional[str]) -> Optional[int]:
+        if genre_id is not None:
+            return genre_id if genre_id in self.genre_ids else None
+        return self.genres_by_name.get(genre_name)
+
+    def resolve_shows(self, ids: set, titles: set):
+        ids = ids - set(self.show_durations)
+        titles = titles - set(self.shows_by_title)
+        if ids:
+            for show_id, duration in self.db.query(models.Show.show_id, models.Show.duration_minutes).filter(
+                models.Show.show_id.in_(ids)
+            ):
+                self.show_durations[show_id] = duration
+        if titles:
+            for show_id, title, duration in self.db.query(
+                models.Show.show_id, models.Show.title, models.Show.duration_minutes
+            ).filter(models.Show.title.in_(titles)):
+                self.shows_by_title[title] = show_id
+                self.show_durations[show_id] = duration
+
+    def show_id(self, show_id: Optional[int], show_title: Optional[str]) -> Optional[int]:
+        if show_id is not None:
+            return show_id if show_id in self.show_durations else None
+        return self.shows_by_title.get(show_title)
+
+    def resolve_active_seats(self, venue_ids: set):
+        venue_ids = venue_ids - set(self.active_seats)
+        if not venue_ids:
+            return
+        counts = dict(self.db.query(models.Seat.venue_id, func.count(models.Seat.seat_id)).filter(
+            models.Seat.venue_id.in_(venue_ids),
+            models.Seat.is_active == True
+        ).group_by(models.Seat.venue_id).all())
+        for venue_id in venue_ids:
+            self.active_seats[venue_id] = counts.get(venue_id, 0)
+
+
+# ============================================
+# ENTITY IMPORTERS
+# ============================================
+
+def _import_venues(db: Session, chunk: List[tuple], lookup: _Lookup, report: ImportReport, state: dict) -> List[dict]:
+    return [parsed.model_dump() for _, _, parsed in _validate(chunk, VenueRow, report)]
+
+
+def _import_seats(db: Session, chunk: List[tuple], lookup: _Lookup, report: ImportReport, state: dict) -> List[dict]:
+    valid = _validate(chunk, SeatRow, report)
+    lookup.resolve_venues(
+        {p.venue_id for _, _, p in valid if p.venue_id is not None},
+        {p.venue_name for _, _, p in valid if p.venue_id is None and p.venue_name}
+    )
+
+    # Existing seats for the venues touched by this chunk, loaded once per venue
+    seen = state.setdefault("seat_keys", set())
+    loaded = state.setdefault("seat_venues_loaded", set())
+    new_venues = {lookup.venue_id(p.venue_id, p.venue_name) for _, _, p in valid} - loaded - {None}
+    if new_venues:
+        for key in db.query(models.Seat.venue_id, models.Seat.row_number, models.Seat.seat_number).filter(
+            models.Seat.venue_id.in_(new_venues)
+        ):
+            seen.add(tuple(key))
+        loaded.update(new_venues)
+
+    rows = []
+    for line, _, parsed in valid:
+        venue_id = lookup.venue_id(parsed.venue_id, parsed.venue_name)
+        if venue_id is None:
+            report.add_error(line, "venue not found (give an existing venue_id or venue_name)")
+            continue
+        key = (venue_id, parsed.row_number, parsed.seat_number)
+        if key in seen:
+            report.add_error(line, f"duplicate seat row {parsed.row_number} number {parsed.seat_number}")
+            continue
+        seen.add(key)
+        state.setdefault("seat_venues_changed", set()).add(venue_id)
+        rows.append({
+            "venue_id": venue_id,
+            "row_number": parsed.row_number,
+            "seat_number": parsed.seat_number,
+            "section": parsed.section,
+            "seat_category": parsed.seat_category,
+            "is_accessible": parsed.is_accessible,
+            "is_active": parsed.is_active
+        })
+    return rows
+
+
+def _import_shows(db: Session, chunk: List[tuple], lookup: _Lookup, report: ImportReport, state: dict) -> List[dict]:
+    valid = _validate(chunk, ShowRow, report)
+    lookup.resolve_genres(
+        {p.genre_id for _, _, p in valid if p.genre_id is not None},
+        {p.genre_name for _, _, p in valid if p.genre_id is None and p.genre_name}
+    )
+
+    rows = []
+    for line, _, parsed in valid:
+        genre_id = lookup.genre_id(parsed.genre_id, parsed.genre_name)
+        if genre_id is None:
+            report.add_error(line, "genre not found (give an existing genre_id or genre_name)")
+            continue
+        if parsed.duration_minutes <= 0:
+            report.add_error(line, "duration_minutes must be positive")
+            continue
+        data = parsed.model_dump(exclude={"genre_name"})
+        data["genre_id"] = genre_id
+        rows.append(data)
+    return rows
+
+
+def _import_performances(db: Session, chunk: List[tuple], lookup: _Lookup, report: ImportReport, state: dict) -> List[dict]:
+    valid = _validate(chunk, PerformanceRow, report)
+    lookup.resolve_shows(
+        {p.show_id for _, _, p in valid if p.show_id is not None},
+        {p.show_title for _, _, p in valid if p.show_id is None and p.show_title}
+    )
+    lookup.resolve_venues(
+        {p.venue_id for _, _, p in valid if p.venue_id is not None},
+        {p.venue_name for _, _, p in valid if p.venue_id is None and p.venue_name}
+    )
+
+    candidates = []
+    for line, raw, parsed in valid:
+        show_id = lookup.show_id(parsed.show_id, parsed.show_title)
+        venue_id = lookup.venue_id(parsed.venue_id, parsed.venue_name)
+        if show_id is None:
+            report.add_error(line, "show not found (give an existing show_id or show_title)")
+            continue
+        if venue_id is None:
+            report.add_error(line, "venue not found (give an existing venue_id or venue_name)")
+            continue
+
+        prices = {}
+        try:
+            for column, value in raw.items():
+                if column.startswith(PRICE_COLUMN_PREFIX) and value is not None:
+                    price = Decimal(value)
+                    if not price.is_finite():
+                        raise InvalidOperation
+                    # Must fit the DECIMAL(10, 2) column
+                    price = price.quantize(Decimal("0.01"))
+                    if price < 0 or price >= Decimal("1e8"):
+                        raise InvalidOperation
+                    prices[column[len(PRICE_COLUMN_PREFIX):]] = price
+        except InvalidOperation:
+            report.add_error(line, f"invalid price in column {column}")
+            continue
+
+        starts_at = datetime.combine(parsed.performance_date, parsed.start_time)
+        if parsed.end_time:
+            ends_at = datetime.combine(parsed.performance_date, parsed.end_time)
+            if ends_at <= starts_at:
+                ends_at += timedelta(days=1)
+        else:
+            ends_at = starts_at + timedelta(minutes=lookup.show_durations[show_id])
+
+        candidates.append((line, parsed, show_id, venue_id, prices, {
+            "performance_date": parsed.performance_date,
+            "start_time": parsed.start_time,
+            "end_time": ends_at.time(),
+            "starts_at": starts_at,
+            "ends_at": ends_at
+        }))
+
+    # Venue time conflicts: against the database, then against earlier rows in the file
+    booked = state.setdefault("booked_slots", {})
+    rejected = set()
+    by_venue: Dict[int, List[tuple]] = {}
+    for candidate in candidates:
+        by_venue.setdefault(candidate[3], []).append(candidate)
+
+    for venue_id, venue_candidates in by_venue.items():
+        slots = sorted((c[5] for c in venue_candidates), key=lambda s: s["starts_at"])
+        existing = {
+            (conflict["performance_date"], conflict["start_time"])
+            for conflict in scheduling.find_venue_conflicts(db, venue_id, slots)
+            if conflict["conflicts_with"] == "existing"
+        }
+        venue_booked = booked.setdefault(venue_id, [])
+        for line, parsed, show_id, _, prices, slot in sorted(venue_candidates, key=lambda c: c[5]["starts_at"]):
+            key = (str(slot["performance_date"]), str(slot["start_time"]))
+            if key in existing:
+                report.add_error(line, "conflicts with an existing performance at this venue")
+                rejected.add(line)
+            elif any(slot["starts_at"] < end and start < slot["ends_at"] for start, end in venue_booked):
+                report.add_error(line, "overlaps an earlier row for the same venue")
+                rejected.add(line)
+            else:
+                venue_booked.append((slot["starts_at"], slot["ends_at"]))
+
+    lookup.resolve_active_seats({c[3] for c in candidates})
+
+    rows = []
+    for line, parsed, show_id, venue_id, prices, slot in candidates:
+        if line in rejected:
+            continue
+        total_seats = parsed.total_seats or lookup.active_seats.get(venue_id, 0)
+        if total_seats <= 0:
+            report.add_error(line, "total_seats missing and venue has no active seats")
+            continue
+        rows.append({
+            "show_id": show_id,
+            "venue_id": venue_id,
+            "performance_date": parsed.performance_date,
+            "start_time": parsed.start_time,
+            "end_time": slot["end_time"],
+            "total_seats": total_seats,
+            "available_seats": total_seats,
+            "performance_status": parsed.performance_status,
+            "special_notes": parsed.special_notes,
+            "_prices": prices
+        })
+    return rows
+
+
+def _insert_performances(db: Session, rows: List[dict]):
+    """Bulk insert performances, then their pricing rows keyed by the generated IDs"""
+    prices_by_key = {(r["venue_id"], r["performance_date"], r["start_time"]): r.pop("_prices") for r in rows}
+    last_id = db.query(func.max(models.Performance.performance_id)).scalar() or 0
+    db.execute(insert(models.Performance), rows)
+
+    priced_keys = [key for key, prices in prices_by_key.items() if prices]
+    if not priced_keys:
+        return
+
+    # (venue, date, start) is unique among the new rows after conflict validation,
+    # whatever their status; older cancelled performances may share it
+    pricing_rows = []
+    for performance_id, venue_id, performance_date, start_time in db.query(
+        models.Performance.performance_id,
+        models.Performance.venue_id,
+        models.Performance.performance_date,
+        models.Performance.start_time
+    ).filter(
+        models.Performance.performance_id > last_id,
+        tuple_(
+            models.Performance.venue_id,
+            models.Performance.performance_date,
+            models.Performance.start_time
+        ).in_(priced_keys)
+    ):
+        for category, price in prices_by_key[(venue_id, performance_date, start_time)].items():
+            pricing_rows.append({"performance_id": performance_id, "seat_category": category, "price": price})
+
+    if pricing_rows:
+        db.execute(insert(models.PerformancePricing), pricing_rows)
+
+
+IMPORTERS = {
+    "venues": (models.Venue, _import_venues),
+    "seats": (models.Seat, _import_seats),
+    "shows": (models.Show, _import_shows),
+    "performances": (models.Performance, _import_performances),
+}
+
+
+def import_csv(db: Session, entity: str, stream: TextIO, dry_run: bool = False) -> dict:
+    """
+    Stream one CSV file into the given entity table
+
+    Args:
+        entity: One of IMPORTERS ("venues", "seats", "shows", "performances")
+        stream: Text stream positioned at the header row
+        dry_run: Validate only; roll back instead of committing
+
+    Returns:
+        Report dict with row counts and per-line errors
+    """
+    if entity not in IMPORTERS:
+        raise ValueError(f"Unknown import entity '{entity}'. Choose from: {', '.join(IMPORTERS)}")
+
+    model, importer = IMPORTERS[entity]
+    report = ImportReport(entity, dry_run)
+    lookup = _Lookup(db)
+    state: dict = {}
+    reader = csv.DictReader(stream)
+
+    try:
+        for chunk in _chunks(reader):
+            rows = importer(db, chunk, lookup, report, state)
+            if not rows:
+                continue
+            if model is models.Performance:
+                _insert_performances(db, rows)
+            else:
+                db.execute(insert(model), rows)
+            report.rows_inserted += len(rows)
+
+        if dry_run:
+            db.rollback()
+            report.rows_inserted = 0
+        else:
+            # New seats change the venue layout: one version bump per venue
+            changed_venues = state.get("seat_venues_changed", set())
+            for venue_id in changed_venues:
+                seat_layout.bump_layout_version(db, venue_id)
+            # New venues, shows and performances change the catalog listings
+            catalog_changed = entity != "seats" and report.rows_inserted > 0
+            if catalog_changed:
+                catalog_cache.bump_version(db)
+            db.commit()
+            for venue_id in changed_venues:
+                seat_layout.invalidate(venue_id)
+            if catalog_changed:
+                catalog_cache.invalidate()
+    except Exception:
+        db.rollback()
+        raise
+
+    return report.as_dict()
@@ -1,9 +1,16 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from fastapi import Request, Response
+import ast
+import itertools
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from pathlib import Path
+from app import metrics
 
 # Load .env from backend directory
 backend_dir = Path(__file__).resolve().parent.parent
@@ -14,17 +21,90 @@ DATABASE_URL = os.getenv("DATABASE_URL", "mysql+pymysql://root:@localhost:3306/t
 # Determine if using SQLite or MySQL for engine configuration
 is_sqlite = DATABASE_URL.startswith("sqlite")
 
-if is_sqlite:
-    # SQLite configuration
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},
+
+# =============================================
+# SQLite profile
+# =============================================
+# Pragmas applied to every new SQLite connection (sync and aiosqlite):
+# WAL lets readers run alongside the writer, synchronous=NORMAL is durable
+# under WAL except on power loss, and the busy timeout makes contended writers
+# wait instead of failing with "database is locked". SQLITE_TUNED=false keeps
+# SQLite's defaults.
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "true").lower() == "true"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+    f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def apply_sqlite_pragmas(engine):
+    """Run SQLITE_PRAGMAS on each new DBAPI connection of a (sync) engine"""
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def make_sqlite_writer_engine(url: str, tuned: bool = True):
+    """
+    Single-connection engine for serialized write transactions
+
+    With one pooled connection, write sessions in this process queue on pool
+    checkout instead of racing for SQLite's lock, and every transaction starts
+    with BEGIN IMMEDIATE so the write lock is taken up front (a deferred
+    transaction that upgrades from read to write can fail with SQLITE_BUSY
+    despite the busy timeout). Other processes wait on busy_timeout.
+    """
+    writer = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+        pool_size=1,
+        max_overflow=0,
+        poolclass=metrics.TimedQueuePool,
+        pool_logging_name="writer",
         echo=False
     )
-else:
+    if tuned:
+        apply_sqlite_pragmas(writer)
+
+    @event.listens_for(writer, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself (pysqlite would defer it)
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(writer, "begin")
+    def begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return writer
+
+
+def _make_engine(url: str, name: str = "primary"):
+    if url.startswith("sqlite"):
+        # SQLite configuration
+        sqlite_engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+            echo=False
+        )
+        if SQLITE_TUNED:
+            apply_sqlite_pragmas(sqlite_engine)
+        return sqlite_engine
     # MySQL configuration with connection pooling
-    engine = create_engine(
-        DATABASE_URL,
+    return create_engine(
+        url,
+        poolclass=metrics.TimedQueuePool,  # records checkout wait time for /metrics
+        pool_logging_name=name,
         pool_pre_ping=True,  # Verify connections before using
         pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
         max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 10)),
@@ -32,8 +112,55 @@ else:
         echo=False
     )
 
+
+def _async_url(url: str) -> str:
+    """Same database through its asyncio driver (aiosqlite / aiomysql)"""
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[url.index(":"):]
+    if url.startswith("mysql"):
+        return "mysql+aiomysql" + url[url.index(":"):]
+    return url
+
+
+def _make_async_engine(url: str, name: str = "async"):
+    if url.startswith("sqlite"):
+        sqlite_engine = create_async_engine(url, connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}, echo=False)
+        if SQLITE_TUNED:
+            apply_sqlite_pragmas(sqlite_engine.sync_engine)
+        return sqlite_engine
+    return create_async_engine(
+        url,
+        poolclass=metrics.TimedAsyncQueuePool,
+        pool_logging_name=name,
+        pool_pre_ping=True,
+        pool_size=int(os.getenv("ASYNC_DB_POOL_SIZE", os.getenv("DB_POOL_SIZE", 5))),
+        max_overflow=int(os.getenv("ASYNC_DB_MAX_OVERFLOW", os.getenv("DB_MAX_OVERFLOW", 10))),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", 3600)),
+        echo=False
+    )
+
+
+engine = _make_engine(DATABASE_URL)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Booking and payment writes go through a serialized writer on SQLite; on
+# MySQL they share the primary pool and row locks do the job
+if is_sqlite:
+    writer_engine = make_sqlite_writer_engine(DATABASE_URL, tuned=SQLITE_TUNED)
+    WriteSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=writer_engine)
+else:
+    writer_engine = engine
+    WriteSessionLocal = SessionLocal
+
+# Async engine for read-heavy public endpoints; these run on the event loop
+# instead of the request threadpool, so concurrency is bounded by the pool
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(DATABASE_URL))
+
+async_engine = _make_async_engine(ASYNC_DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # Dependency
@@ -43,3 +170,229 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_write_db():
+    """Session for booking/payment write transactions (serialized writer on SQLite)"""
+    db = WriteSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# =============================================
+# Read replicas
+# =============================================
+# Read-only dependencies (get_read_db / get_async_read_db) are routed
+# round-robin across DATABASE_REPLICA_URLS. A background health check ejects
+# replicas that stop answering and re-admits them once they recover. With no
+# healthy replica, or no replicas configured, reads go to the primary.
+#
+# Read-your-writes: after a client's own booking or payment, the endpoint
+# calls mark_read_your_writes(response), which sets a short-lived cookie;
+# while it is present that client's reads stay on the primary, so replication
+# lag never hides a write it just made. A cookie (rather than worker memory)
+# keeps this working across worker processes.
+
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_HEALTH_CHECK_SECONDS = int(os.getenv("REPLICA_HEALTH_CHECK_SECONDS", "10"))
+# Longer than the worst replication lag we expect
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+STICKY_COOKIE = "db_primary_until"
+
+replica_engines = [_make_engine(url, f"replica{i}") for i, url in enumerate(DATABASE_REPLICA_URLS)]
+async_replica_engines = [
+    _make_async_engine(_async_url(url), f"async_replica{i}") for i, url in enumerate(DATABASE_REPLICA_URLS)
+]
+
+_healthy_replicas = list(range(len(replica_engines)))
+_replica_cycle = itertools.count()
+_health_stop = threading.Event()
+_health_worker = None
+
+
+def _pick_replica():
+    """Index of the next healthy replica (round-robin), or None"""
+    healthy = _healthy_replicas
+    if not healthy:
+        return None
+    return healthy[next(_replica_cycle) % len(healthy)]
+
+
+def _wants_primary(request: Request) -> bool:
+    sticky_until = request.cookies.get(STICKY_COOKIE)
+    if not sticky_until:
+        return False
+    try:
+        return float(sticky_until) > time.time()
+    except ValueError:
+        return False
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints: a healthy replica unless the client needs its own writes"""
+    index = None if _wants_primary(request) else _pick_replica()
+    db = SessionLocal() if index is None else SessionLocal(bind=replica_engines[index])
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """Async counterpart of get_read_db"""
+    index = None if _wants_primary(request) else _pick_replica()
+    if index is None:
+        session = AsyncSessionLocal()
+    else:
+        session = AsyncSessionLocal(bind=async_replica_engines[index])
+    async with session as db:
+        yield db
+
+
+def mark_read_your_writes(response: Response):
+    """Pin this client's reads to the primary for REPLICA_STICKY_SECONDS"""
+    if not replica_engines:
+        return
+    response.set_cookie(
+        STICKY_COOKIE,
+        str(time.time() + REPLICA_STICKY_SECONDS),
+        max_age=REPLICA_STICKY_SECONDS,
+        httponly=True,
+        samesite="lax"
+    )
+
+
+def check_replicas():
+    """Probe every replica with SELECT 1 and update the healthy set"""
+    global _healthy_replicas
+    healthy = []
+    for index, replica in enumerate(replica_engines):
+        try:
+            with replica.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            healthy.append(index)
+        except Exception as e:
+            if index in _healthy_replicas:
+                print(f"Read replica {index} ejected: {e}")
+    for index in set(healthy) - set(_healthy_replicas):
+        print(f"Read replica {index} back in rotation")
+    _healthy_replicas = healthy
+
+
+def _check_replicas_periodically():
+    while not _health_stop.wait(REPLICA_HEALTH_CHECK_SECONDS):
+        check_replicas()
+        metrics.inc("theatre_background_job_runs_total", job="replica_health", outcome="success")
+
+
+def start_replica_health_checks():
+    """Start the replica health check thread (no-op without replicas)"""
+    global _health_worker
+    if not replica_engines or (_health_worker and _health_worker.is_alive()):
+        return
+    _health_stop.clear()
+    check_replicas()
+    _health_worker = threading.Thread(target=_check_replicas_periodically, name="replica-health", daemon=True)
+    _health_worker.start()
+
+
+def stop_replica_health_checks():
+    _health_stop.set()
+
+
+# =============================================
+# Pool pre-warming
+# =============================================
+# Run from the application lifespan so the first requests after a (re)start
+# don't each pay for a TCP/TLS handshake and login. A database that is down
+# at boot only logs a warning; the pools connect lazily as before.
+
+DB_POOL_PREWARM = int(os.getenv("DB_POOL_PREWARM", "2"))
+
+
+def _prewarm_count(target_engine) -> int:
+    pool = target_engine.pool
+    size = pool.size() if hasattr(pool, "size") else 1
+    return min(DB_POOL_PREWARM, size)
+
+
+# =============================================
+# Schema version check
+# =============================================
+# The server no longer creates tables on startup, so a database that missed
+# `alembic upgrade head` would fail request by request on missing tables.
+
+SCHEMA_CHECK_ENABLED = os.getenv("SCHEMA_CHECK_ENABLED", "true").lower() == "true"
+
+
+def _migration_heads() -> set:
+    """Latest revisions in alembic/versions, read from the files (importing alembic costs ~0.5 s)"""
+    revisions, parents = set(), set()
+    for path in (backend_dir / "alembic" / "versions").glob("*.py"):
+        values = {}
+        for node in ast.parse(path.read_text()).body:
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+                if node.targets[0].id in ("revision", "down_revision"):
+                    values[node.targets[0].id] = ast.literal_eval(node.value)
+        if values.get("revision"):
+            revisions.add(values["revision"])
+            down = values.get("down_revision") or ()
+            parents.update(down if isinstance(down, tuple) else (down,))
+    return revisions - parents
+
+
+def check_schema_current():
+    """Refuse to start when the primary database is not at the latest alembic revision"""
+    if not SCHEMA_CHECK_ENABLED:
+        return
+    heads = _migration_heads()
+    try:
+        with engine.connect() as connection:
+            current = set()
+            if inspect(connection).has_table("alembic_version"):
+                current = set(connection.execute(text("SELECT version_num FROM alembic_version")).scalars())
+    except Exception as e:
+        # Unreachable database: requests will report it, as with pool pre-warming
+        print(f"Schema version check skipped: {e}")
+        return
+    if current != heads:
+        raise RuntimeError(
+            f"Database schema is at {', '.join(sorted(current)) or 'no alembic revision'}, "
+            f"expected {', '.join(sorted(heads))}. Run `alembic upgrade head` "
+            "(databases created before migrations: `alembic stamp 52bdd40d6fe8` first)."
+        )
+
+
+def prewarm_pools():
+    """Open DB_POOL_PREWARM connections on each sync engine and return them to the pool"""
+    for target_engine in dict.fromkeys([engine, writer_engine, *replica_engines]):
+        held = []
+        try:
+            for _ in range(_prewarm_count(target_engine)):
+                held.append(target_engine.connect())
+        except Exception as e:
+            print(f"Connection pool pre-warm failed for {target_engine.url!r}: {e}")
+        finally:
+            for connection in held:
+                connection.close()
+
+
+async def prewarm_async_pools():
+    """Async counterpart of prewarm_pools"""
+    for target_engine in [async_engine, *async_replica_engines]:
+        held = []
+        try:
+            for _ in range(_prewarm_count(target_engine.sync_engine)):
+                held.append(await target_engine.connect())
+        except Exception as e:
+            print(f"Connection pool pre-warm failed for {target_engine.url!r}: {e}")
+        finally:
+            for connection in held:
+                await connection.close()
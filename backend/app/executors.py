@@ -0,0 +1,120 @@
+"""
+Sized thread pools per endpoint class
+
+Sync endpoints used to share AnyIO's single default limiter (40 threads), so
+a burst of slow analytics queries or logins could hold every thread while
+checkout waited. Each class of work now gets its own capacity limiter:
+
+- auth:    login / registration / verification endpoints
+- db_read: sync GET endpoints
+- db_write: sync endpoints that modify data (POST/PUT/PATCH/DELETE)
+- render:  ticket (QR code) and HTML page rendering
+- default: AnyIO's own limiter, still used for sync dependencies (sessions)
+
+Routers opt in with route_class=executors.pooled_route(), which runs each
+sync endpoint in the pool matching its HTTP method (or the router's pool, or
+one set with @executors.use_pool). Pool sizes come from EXECUTOR_*_THREADS;
+size, busy and waiting counts are exported as executor_pool_* gauges.
+"""
+
+import asyncio
+import functools
+import os
+from typing import Callable, Dict, Optional
+import anyio
+import anyio.to_thread
+from fastapi.routing import APIRoute
+from app import metrics
+
+POOL_SIZES = {
+    "auth": int(os.getenv("EXECUTOR_AUTH_THREADS", "8")),
+    "db_read": int(os.getenv("EXECUTOR_DB_READ_THREADS", "24")),
+    "db_write": int(os.getenv("EXECUTOR_DB_WRITE_THREADS", "16")),
+    "render": int(os.getenv("EXECUTOR_RENDER_THREADS", "4")),
+}
+DEFAULT_THREADS = int(os.getenv("EXECUTOR_DEFAULT_THREADS", "40"))
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Limiters belong to the event loop, so they are created on first use there
+_limiters: Dict[str, anyio.CapacityLimiter] = {}
+_in_flight: Dict[str, int] = {}
+
+
+def _limiter(pool: str) -> anyio.CapacityLimiter:
+    limiter = _limiters.get(pool)
+    if limiter is None:
+        limiter = _limiters[pool] = anyio.CapacityLimiter(POOL_SIZES[pool])
+    return limiter
+
+
+def start():
+    """Create the pools and size AnyIO's default limiter (call from the lifespan handler)"""
+    default = anyio.to_thread.current_default_thread_limiter()
+    default.total_tokens = DEFAULT_THREADS
+    _limiters["default"] = default
+    for pool in POOL_SIZES:
+        _limiter(pool)
+
+
+async def run(pool: str, func: Callable, *args, **kwargs):
+    """Run a blocking call in a thread from the given pool"""
+    _in_flight[pool] = _in_flight.get(pool, 0) + 1
+    try:
+        return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs), limiter=_limiter(pool))
+    finally:
+        _in_flight[pool] -= 1
+
+
+def use_pool(pool: str):
+    """Decorator pinning a sync endpoint to a pool instead of the one picked by HTTP method"""
+    if pool not in POOL_SIZES:
+        raise ValueError(f"Unknown executor pool: {pool}")
+
+    def decorate(endpoint):
+        endpoint.executor_pool = pool
+        return endpoint
+    return decorate
+
+
+def pooled_route(pool: Optional[str] = None) -> type:
+    """APIRoute class running sync endpoints in pool (default: db_read or db_write by method)"""
+    if pool is not None and pool not in POOL_SIZES:
+        raise ValueError(f"Unknown executor pool: {pool}")
+
+    class PooledRoute(APIRoute):
+        def __init__(self, path: str, endpoint: Callable, **kwargs):
+            if not asyncio.iscoroutinefunction(endpoint):
+                endpoint = self._pooled(endpoint, kwargs.get("methods") or ["GET"])
+            super().__init__(path, endpoint, **kwargs)
+
+        @staticmethod
+        def _pooled(endpoint: Callable, methods) -> Callable:
+            methods = {method.upper() for method in methods}
+            chosen = getattr(endpoint, "executor_pool", None) or pool or (
+                "db_read" if methods <= READ_METHODS else "db_write"
+            )
+
+            @functools.wraps(endpoint)
+            async def pooled(*args, **values):
+                return await run(chosen, endpoint, *args, **values)
+            return pooled
+
+    return PooledRoute
+
+
+def _pool_stats():
+    stats = []
+    for pool, limiter in list(_limiters.items()):
+        labels = {"pool": pool}
+        busy = limiter.borrowed_tokens
+        stats += [
+            ("executor_pool_threads", labels, limiter.total_tokens),
+            ("executor_pool_busy", labels, busy),
+        ]
+        if pool in POOL_SIZES:
+            stats.append(("executor_pool_waiting", labels, max(_in_flight.get(pool, 0) - busy, 0)))
+    return stats
+
+
+metrics.add_collector(_pool_stats)
@@ -1,24 +1,55 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Cookie
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from pathlib import Path
 from typing import Optional
 from app.routers import users, shows, performances, bookings, payments, profile, admin, verification, analytics
-from app.database import get_db, engine
-from app import models, auth
+from app.database import get_db, SessionLocal, start_replica_health_checks, stop_replica_health_checks
+from app import database, auth, pricing_engine, token_store, rate_limit, sql_instrumentation, metrics, compression, assets, page_cache, executors
+from app.responses import FastJSONResponse
+
+# The schema is not created here: run `python init_db.py` for a new database
+# and `alembic upgrade head` for an existing one, so worker boot and --reload
+# never touch DDL. Startup fails if the database is behind the migrations.
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm connection pools and start background jobs before serving; stop them on shutdown"""
+    await run_in_threadpool(database.check_schema_current)
+    executors.start()
+    await run_in_threadpool(database.prewarm_pools)
+    await database.prewarm_async_pools()
+    pricing_engine.start(SessionLocal)
+    token_store.start(SessionLocal)
+    start_replica_health_checks()
+    auth.warm_password_pool()
+    metrics.start()
+    page_cache.prerender(STATIC_PAGES)
+    yield
+    pricing_engine.stop()
+    token_store.stop()
+    stop_replica_health_checks()
+    auth.shutdown_password_pool()
+    metrics.stop()
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Theatre Booking System",
     description="Online theatre booking platform API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+# Rate limiting for auth and booking endpoints (inside CORS, so 429s carry CORS headers)
+app.add_middleware(rate_limit.RateLimitMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -28,16 +59,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for large JSON and text responses
+app.add_middleware(compression.CompressionMiddleware)
+
+# Per-request query counts, N+1 detection and debug Server-Timing (outermost, so it times the whole stack)
+app.add_middleware(sql_instrumentation.SQLInstrumentationMiddleware)
+
+# Request counts, latency and in-flight gauge for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Get the project root directory
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 STATIC_DIR = BASE_DIR / "frontend" / "static"
 TEMPLATES_DIR = BASE_DIR / "frontend" / "templates"
+BUILD_DIR = BASE_DIR / "frontend" / "build"
 
 # Mount static files
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
+# Fingerprinted assets from build_assets.py, when built
+if assets.load_manifest(BUILD_DIR):
+    TEMPLATES_DIR = BUILD_DIR / "templates"
+    app.mount(assets.ASSETS_URL, assets.ImmutableStaticFiles(directory=str(BUILD_DIR / "assets")), name="assets")
+
 # Templates
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+templates.env.globals["asset"] = assets.asset
+templates.env.globals["asset_built"] = assets.asset_built
+page_cache.configure(templates)
+
+# Pages without path parameters, rendered at startup
+STATIC_PAGES = (
+    "index.html", "shows.html", "my_bookings_enhanced.html", "login.html", "register.html", "profile.html",
+    "admin.html", "booking_confirmation.html", "forgot_password.html", "reset_password.html"
+)
 
 # Include routers
 app.include_router(users.router)
@@ -55,19 +110,19 @@ app.include_router(analytics.router)
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Home page"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return await page_cache.respond(request, "index.html")
 
 
 @app.get("/shows", response_class=HTMLResponse)
 async def shows_page(request: Request):
     """Shows listing page"""
-    return templates.TemplateResponse("shows.html", {"request": request})
+    return await page_cache.respond(request, "shows.html")
 
 
 @app.get("/shows/{show_id}", response_class=HTMLResponse)
 async def show_detail_page(request: Request, show_id: int):
     """Show detail page"""
-    return templates.TemplateResponse("show_detail.html", {"request": request, "show_id": show_id})
+    return await page_cache.respond(request, "show_detail.html", show_id=show_id)
 
 
 @app.get("/performance/{performance_id}/seats", response_class=HTMLResponse)
@@ -75,13 +130,13 @@ async def seat_selection_page(request: Request, performance_id: int):
     """Seat selection page (requires login)"""
     # Check if user is logged in via localStorage (JavaScript handles this)
     # API endpoints are protected, this is just the page
-    return templates.TemplateResponse("seat_selection.html", {"request": request, "performance_id": performance_id})
+    return await page_cache.respond(request, "seat_selection.html", performance_id=performance_id)
 
 
 @app.get("/performances/{performance_id}", response_class=HTMLResponse)
 async def performance_detail_page(request: Request, performance_id: int):
     """Performance detail page - shows seat selection"""
-    return templates.TemplateResponse("seat_selection.html", {"request": request, "performance_id": performance_id})
+    return await page_cache.respond(request, "seat_selection.html", performance_id=performance_id)
 
 
 @app.get("/booking/{booking_id}/payment", response_class=HTMLResponse)
@@ -89,7 +144,7 @@ async def payment_page(request: Request, booking_id: int):
     """Payment page (requires login)"""
     # Check if user is logged in via localStorage (JavaScript handles this)
     # API endpoints are protected, this is just the page
-    return templates.TemplateResponse("payment_new.html", {"request": request, "booking_id": booking_id})
+    return await page_cache.respond(request, "payment_new.html", booking_id=booking_id)
 
 
 @app.get("/my-bookings", response_class=HTMLResponse)
@@ -97,19 +152,19 @@ async def my_bookings_page(request: Request):
     """User bookings page (requires login)"""
     # Check if user is logged in via localStorage (JavaScript handles this)
     # API endpoints are protected, this is just the page
-    return templates.TemplateResponse("my_bookings_enhanced.html", {"request": request})
+    return await page_cache.respond(request, "my_bookings_enhanced.html")
 
 
 @app.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
     """Login page"""
-    return templates.TemplateResponse("login.html", {"request": request})
+    return await page_cache.respond(request, "login.html")
 
 
 @app.get("/register", response_class=HTMLResponse)
 async def register_page(request: Request):
     """Registration page"""
-    return templates.TemplateResponse("register.html", {"request": request})
+    return await page_cache.respond(request, "register.html")
 
 
 @app.get("/profile", response_class=HTMLResponse)
@@ -117,7 +172,7 @@ async def profile_page(request: Request):
     """User profile page (requires login)"""
     # Check if user is logged in via localStorage (JavaScript handles this)
     # API endpoints are protected, this is just the page
-    return templates.TemplateResponse("profile.html", {"request": request})
+    return await page_cache.respond(request, "profile.html")
 
 
 @app.get("/admin", response_class=HTMLResponse)
@@ -125,37 +180,37 @@ async def admin_page(request: Request):
     """Admin panel page (requires admin login)"""
     # Check if user is logged in and is admin via localStorage (JavaScript handles this)
     # API endpoints are protected, this is just the page
-    return templates.TemplateResponse("admin.html", {"request": request})
+    return await page_cache.respond(request, "admin.html")
 
 
 @app.get("/booking/confirmation", response_class=HTMLResponse)
 async def booking_confirmation_page(request: Request):
     """Booking confirmation page"""
-    return templates.TemplateResponse("booking_confirmation.html", {"request": request})
+    return await page_cache.respond(request, "booking_confirmation.html")
 
 
 @app.get("/forgot-password", response_class=HTMLResponse)
 async def forgot_password_page(request: Request):
     """Forgot password page"""
-    return templates.TemplateResponse("forgot_password.html", {"request": request})
+    return await page_cache.respond(request, "forgot_password.html")
 
 
 @app.get("/reset-password", response_class=HTMLResponse)
 async def reset_password_page(request: Request):
     """Reset password page"""
-    return templates.TemplateResponse("reset_password.html", {"request": request})
+    return await page_cache.respond(request, "reset_password.html")
 
 
 @app.get("/booking/{booking_id}/ticket", response_class=HTMLResponse)
 async def ticket_page(request: Request, booking_id: int):
     """E-Ticket page (requires login and confirmed booking)"""
-    return templates.TemplateResponse("ticket.html", {"request": request, "booking_id": booking_id})
+    return await page_cache.respond(request, "ticket.html", booking_id=booking_id)
 
 
 @app.get("/show/{show_id}", response_class=HTMLResponse)
 async def show_detail_alt_page(request: Request, show_id: int):
     """Show detail page (alternate URL)"""
-    return templates.TemplateResponse("show_detail.html", {"request": request, "show_id": show_id})
+    return await page_cache.respond(request, "show_detail.html", show_id=show_id)
 
 
 @app.get("/health")
@@ -164,6 +219,12 @@ async def health_check():
     return {"status": "healthy", "message": "Theatre Booking System API is running"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus scrape endpoint (all workers when METRICS_MULTIPROC_DIR is set)"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
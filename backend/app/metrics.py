@@ -0,0 +1,391 @@
+"""
+Prometheus metrics for the API (served at /metrics)
+
+Hot-path updates are lock-free: every thread writes into its own shard (a
+plain dict only that thread mutates), and a scrape sums the shards. Copying a
+dict is atomic under the GIL, so the scraper never blocks request threads and
+never sees a torn shard. Threads come and go (AnyIO workers exit when idle),
+so a scrape folds the shards of exited threads into one retired total.
+
+Collected series:
+- http_requests_total / http_request_duration_seconds per route (route
+  template, not raw path) and http_requests_in_progress
+- http_request_db_statements / http_request_db_seconds per route, recorded
+  by app/sql_instrumentation.py
+- db_pool_* for every SQLAlchemy engine, read from engine.pool at scrape
+  time, plus a checkout wait histogram for pools built with TimedQueuePool
+- executor_pool_* for the endpoint thread pools (app/executors.py)
+- theatre_bookings_total, theatre_payments_total, theatre_refunds_total
+- theatre_background_queue_depth and theatre_background_job_runs_total
+
+Multiple workers: with METRICS_MULTIPROC_DIR set, each worker periodically
+writes its snapshot to <dir>/metrics_<pid>.json and a scrape of any worker
+merges all files. Counters and histograms are summed across every file (so
+totals survive worker restarts); gauges only across live workers. Empty the
+directory when the service is (re)deployed.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "http_requests_total": ("counter", "HTTP requests by route and status", None),
+    "http_request_duration_seconds": ("histogram", "HTTP request latency by route", LATENCY_BUCKETS),
+    "http_requests_in_progress": ("gauge", "HTTP requests currently being served", None),
+    "http_request_db_statements": ("histogram", "SQL statements per request that ran any, by route", STATEMENT_BUCKETS),
+    "http_request_db_seconds": ("histogram", "Time spent in SQL per request that ran any, by route", LATENCY_BUCKETS),
+    "db_pool_size": ("gauge", "Configured pool size", None),
+    "db_pool_checked_out": ("gauge", "Connections currently checked out", None),
+    "db_pool_checked_in": ("gauge", "Idle connections in the pool", None),
+    "db_pool_overflow": ("gauge", "Connections open beyond pool_size", None),
+    "db_pool_wait_seconds": ("histogram", "Time spent waiting for a pooled connection", POOL_WAIT_BUCKETS),
+    "executor_pool_threads": ("gauge", "Threads an endpoint pool may use at once", None),
+    "executor_pool_busy": ("gauge", "Threads of an endpoint pool currently running a call", None),
+    "executor_pool_waiting": ("gauge", "Calls waiting for a thread in an endpoint pool", None),
+    "theatre_bookings_total": ("counter", "Bookings by event (created, cancelled)", None),
+    "theatre_payments_total": ("counter", "Payments by outcome (completed, failed)", None),
+    "theatre_refunds_total": ("counter", "Refunds by source (customer, payment, admin)", None),
+    "theatre_background_queue_depth": ("gauge", "Tasks submitted to a background pool and not yet finished", None),
+    "theatre_background_job_runs_total": ("counter", "Background job runs by job and outcome", None),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_local = threading.local()
+_shards: Dict[int, dict] = {}      # thread ident -> that thread's shard
+_retired: Dict[tuple, object] = {}  # summed shards of threads that have exited
+_shards_lock = threading.Lock()
+_collectors: List[Callable[[], List[tuple]]] = []
+
+
+# =============================================
+# Recording (hot path)
+# =============================================
+
+def _shard() -> dict:
+    shard = getattr(_local, "shard", None)
+    if shard is None:
+        shard = _local.shard = {}
+        # Registers threads not started through threading, so the scrape sees them alive
+        ident = threading.current_thread().ident
+        with _shards_lock:
+            # Idents are reused: keep the totals of an exited thread not yet retired
+            previous = _shards.get(ident)
+            if previous is not None:
+                _retire(previous)
+            _shards[ident] = shard
+    return shard
+
+
+def _retire(shard: dict):
+    """Fold an exited thread's shard into _retired (caller holds _shards_lock)"""
+    for key, value in dict(shard).items():
+        _merge(_retired, key, list(value) if isinstance(value, list) else value)
+
+
+def inc(name: str, amount: float = 1, **labels):
+    """Add to a counter (or a gauge, with a negative amount to decrease it)"""
+    if not METRICS_ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    shard = _shard()
+    shard[key] = shard.get(key, 0) + amount
+
+
+def dec(name: str, amount: float = 1, **labels):
+    inc(name, -amount, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    """Record a histogram observation"""
+    if not METRICS_ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    shard = _shard()
+    buckets = METRICS[name][2]
+    series = shard.get(key)
+    if series is None:
+        # Per-bucket (non-cumulative) counts, then +Inf, then sum
+        series = shard[key] = [0] * (len(buckets) + 2)
+    for i, bound in enumerate(buckets):
+        if value <= bound:
+            series[i] += 1
+            break
+    else:
+        series[-2] += 1
+    series[-1] += value
+
+
+def add_collector(collector: Callable[[], List[tuple]]):
+    """Register a callable returning [(gauge name, labels dict, value)] evaluated at scrape time"""
+    _collectors.append(collector)
+
+
+# =============================================
+# Pool instrumentation
+# =============================================
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait (labelled by pool_logging_name)"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            observe("db_pool_wait_seconds", time.perf_counter() - started, engine=self._orig_logging_name or "default")
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async counterpart of TimedQueuePool"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            observe("db_pool_wait_seconds", time.perf_counter() - started, engine=self._orig_logging_name or "default")
+
+
+def _pool_stats() -> List[tuple]:
+    from app import database
+
+    engines = {
+        "primary": database.engine,
+        "writer": database.writer_engine,
+        "async": database.async_engine.sync_engine,
+    }
+    for index, replica in enumerate(database.replica_engines):
+        engines[f"replica{index}"] = replica
+    for index, replica in enumerate(database.async_replica_engines):
+        engines[f"async_replica{index}"] = replica.sync_engine
+
+    stats, seen = [], set()
+    for name, engine in engines.items():
+        pool = engine.pool
+        if id(pool) in seen or not isinstance(pool, QueuePool):
+            continue
+        seen.add(id(pool))
+        labels = {"engine": name}
+        stats += [
+            ("db_pool_size", labels, pool.size()),
+            ("db_pool_checked_out", labels, pool.checkedout()),
+            ("db_pool_checked_in", labels, pool.checkedin()),
+            ("db_pool_overflow", labels, max(pool.overflow(), 0)),
+        ]
+    return stats
+
+
+add_collector(_pool_stats)
+
+
+# =============================================
+# Snapshot and exposition
+# =============================================
+
+def snapshot() -> Dict[tuple, object]:
+    """This process's values: shards summed, plus collector gauges"""
+    with _shards_lock:
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in [ident for ident in _shards if ident not in alive]:
+            _retire(_shards.pop(ident))
+        shards = list(_shards.values())
+        merged: Dict[tuple, object] = {
+            key: list(value) if isinstance(value, list) else value for key, value in _retired.items()
+        }
+    for shard in shards:
+        for key, value in dict(shard).items():
+            _merge(merged, key, list(value) if isinstance(value, list) else value)
+    for collector in _collectors:
+        try:
+            for name, labels, value in collector():
+                _merge(merged, (name, tuple(sorted(labels.items()))), value)
+        except Exception as e:
+            print(f"Metrics collector error: {e}")
+    return merged
+
+
+def _merge(into: dict, key: tuple, value):
+    current = into.get(key)
+    if current is None:
+        into[key] = value
+    elif isinstance(value, list):
+        into[key] = [a + b for a, b in zip(current, value)]
+    else:
+        into[key] = current + value
+
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(METRICS_MULTIPROC_DIR, f"metrics_{pid}.json")
+
+
+def write_snapshot():
+    """Write this worker's snapshot to METRICS_MULTIPROC_DIR (atomic replace)"""
+    if not METRICS_MULTIPROC_DIR:
+        return
+    path = _snapshot_path(os.getpid())
+    rows = [[name, [list(pair) for pair in labels], value] for (name, labels), value in snapshot().items()]
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"pid": os.getpid(), "values": rows}, f)
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _aggregate() -> Dict[tuple, object]:
+    if not METRICS_MULTIPROC_DIR:
+        return snapshot()
+    write_snapshot()
+    merged: Dict[tuple, object] = {}
+    for filename in os.listdir(METRICS_MULTIPROC_DIR):
+        if not (filename.startswith("metrics_") and filename.endswith(".json")):
+            continue
+        try:
+            with open(os.path.join(METRICS_MULTIPROC_DIR, filename)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        alive = _pid_alive(data["pid"])
+        for name, labels, value in data["values"]:
+            if name not in METRICS or (METRICS[name][0] == "gauge" and not alive):
+                continue
+            _merge(merged, (name, tuple(tuple(pair) for pair in labels)), value)
+    return merged
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render() -> str:
+    """Prometheus text exposition of all workers' metrics"""
+    values = _aggregate()
+    by_name: Dict[str, list] = {}
+    for (name, labels), value in values.items():
+        by_name.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        series = by_name.get(name)
+        if not series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in sorted(series):
+            if kind != "histogram":
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets, value):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', repr(bound)))} {cumulative}")
+            cumulative += value[-2]
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(float(value[-1]))}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+# =============================================
+# Middleware
+# =============================================
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency and in-flight requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+
+        method = scope.get("method", "")
+        status_code = 500
+        started = time.perf_counter()
+        inc("http_requests_in_progress", method=method)
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            dec("http_requests_in_progress", method=method)
+            # Route template keeps label cardinality bounded; unrouted paths share one label
+            route = getattr(scope.get("route"), "path", None) or "other"
+            observe("http_request_duration_seconds", time.perf_counter() - started, method=method, route=route)
+            inc("http_requests_total", method=method, route=route, status=str(status_code))
+
+
+# =============================================
+# Multiprocess flush thread
+# =============================================
+
+_stop_event = threading.Event()
+_worker: Optional[threading.Thread] = None
+
+
+def _flush_periodically():
+    while not _stop_event.wait(METRICS_FLUSH_SECONDS):
+        try:
+            write_snapshot()
+        except Exception as e:
+            print(f"Metrics snapshot error: {e}")
+
+
+def start():
+    """Start the snapshot flush thread (no-op unless METRICS_MULTIPROC_DIR is set)"""
+    global _worker
+    if not METRICS_ENABLED or not METRICS_MULTIPROC_DIR or (_worker and _worker.is_alive()):
+        return
+    os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+    _stop_event.clear()
+    write_snapshot()
+    _worker = threading.Thread(target=_flush_periodically, name="metrics-flush", daemon=True)
+    _worker.start()
+
+
+def stop():
+    """Stop the flush thread, writing a final snapshot"""
+    _stop_event.set()
+    if METRICS_ENABLED and METRICS_MULTIPROC_DIR:
+        write_snapshot()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, Time, DECIMAL, TIMESTAMP, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Date, Time, DECIMAL, TIMESTAMP, Boolean, ForeignKey, JSON, Float, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -48,6 +48,32 @@ class AuditLog(Base):
     user = relationship("User", back_populates="audit_logs")
 
 
+class AuthToken(Base):
+    """Single-use tokens for password reset and email verification (only the SHA-256 hash is stored)"""
+    __tablename__ = "auth_token"
+    __table_args__ = (
+        Index("ix_auth_token_purpose_email", "purpose", "email"),
+        Index("ix_auth_token_expires_at", "expires_at"),
+    )
+    
+    token_id = Column(Integer, primary_key=True, autoincrement=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    purpose = Column(String(30), nullable=False)  # password_reset, email_verification
+    user_id = Column(Integer, ForeignKey("user.user_id"), nullable=True)
+    email = Column(String(100), nullable=False)
+    expires_at = Column(TIMESTAMP, nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+
+class RateLimitCounter(Base):
+    """Fixed-window request counters behind the shared (multi-worker) rate limiter backend"""
+    __tablename__ = "rate_limit_counter"
+    
+    limit_key = Column(String(150), primary_key=True)  # e.g. "LOGIN:ip:203.0.113.7"
+    window_start = Column(Integer, primary_key=True, autoincrement=False)  # Unix time
+    request_count = Column(Integer, nullable=False, default=0)
+
+
 class Genre(Base):
     __tablename__ = "genre"
     
@@ -90,6 +116,12 @@ class User(Base):
 
 class Show(Base):
     __tablename__ = "show_table"
+    __table_args__ = (
+        # Paginated catalog listings: status filter with title / id keyset order
+        Index("ix_show_status_title", "show_status", "title"),
+        Index("ix_show_genre_status", "genre_id", "show_status"),
+        Index("ix_show_language_status", "language", "show_status"),
+    )
     
     show_id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(200), nullable=False)
@@ -112,6 +144,9 @@ class Show(Base):
 
 class Venue(Base):
     __tablename__ = "venue"
+    __table_args__ = (
+        Index("ix_venue_city", "city"),
+    )
     
     venue_id = Column(Integer, primary_key=True, autoincrement=True)
     venue_name = Column(String(100), nullable=False)
@@ -149,6 +184,33 @@ class Seat(Base):
     booking_details = relationship("BookingDetail", back_populates="seat")
 
 
+class VenueLayoutVersion(Base):
+    """Version counter bumped on every seat layout change, used to invalidate cached seat maps"""
+    __tablename__ = "venue_layout_version"
+    
+    venue_id = Column(Integer, ForeignKey("venue.venue_id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+
+class CatalogVersion(Base):
+    """Version counter bumped on every admin change to the public catalog, used to invalidate cached listings"""
+    __tablename__ = "catalog_version"
+    
+    catalog_id = Column(Integer, primary_key=True)  # single row (1)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+
+class PricingVersion(Base):
+    """Version counter bumped when an admin asks for a dynamic price recompute, polled by every worker"""
+    __tablename__ = "pricing_version"
+    
+    pricing_id = Column(Integer, primary_key=True)  # single row (1)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+
 class SeatCategoryPricing(Base):
     __tablename__ = "seat_category_pricing"
     
@@ -160,6 +222,15 @@ class SeatCategoryPricing(Base):
 
 class Performance(Base):
     __tablename__ = "performance"
+    __table_args__ = (
+        # Per-show listings: upcoming scheduled performances of a show
+        Index("ix_performance_show_date_status", "show_id", "performance_date", "performance_status"),
+        # All upcoming performances and venue calendar conflict checks
+        Index("ix_performance_date_status", "performance_date", "performance_status"),
+        Index("ix_performance_venue_date", "venue_id", "performance_date"),
+        # Paginated upcoming listing in (date, start time) keyset order
+        Index("ix_performance_status_date_time", "performance_status", "performance_date", "start_time"),
+    )
     
     performance_id = Column(Integer, primary_key=True, autoincrement=True)
     show_id = Column(Integer, ForeignKey("show_table.show_id"), nullable=False)
@@ -194,8 +265,42 @@ class PerformancePricing(Base):
     performance = relationship("Performance", back_populates="pricing")
 
 
+class PricingRule(Base):
+    """Admin-configured floor/ceiling bounds for dynamic pricing"""
+    __tablename__ = "pricing_rule"
+    
+    rule_id = Column(Integer, primary_key=True, autoincrement=True)
+    show_id = Column(Integer, ForeignKey("show_table.show_id"), nullable=True)  # NULL = applies to all shows
+    seat_category = Column(String(20), nullable=True)  # NULL = applies to all categories
+    floor_price = Column(DECIMAL(10, 2), nullable=False)
+    ceiling_price = Column(DECIMAL(10, 2), nullable=False)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+
+class PerformanceSalesCounter(Base):
+    """Incrementally maintained seats-sold and sales-velocity counters per performance category"""
+    __tablename__ = "performance_sales_counter"
+    __table_args__ = (UniqueConstraint("performance_id", "seat_category"),)
+    
+    counter_id = Column(Integer, primary_key=True, autoincrement=True)
+    performance_id = Column(Integer, ForeignKey("performance.performance_id"), nullable=False)
+    seat_category = Column(String(20), nullable=False)
+    seats_sold = Column(Integer, nullable=False, default=0)  # Net of cancellations
+    velocity = Column(Float, nullable=False, default=0.0)  # Exponentially decayed seats/hour
+    velocity_updated_at = Column(TIMESTAMP, nullable=True)
+
+
 class Booking(Base):
     __tablename__ = "booking"
+    __table_args__ = (
+        # Seat availability: active bookings of a performance
+        Index("ix_booking_performance_status", "performance_id", "booking_status"),
+        Index("ix_booking_user_date", "user_id", "booking_date"),
+        # Analytics date ranges and daily grouping
+        Index("ix_booking_booking_date", "booking_date"),
+    )
     
     booking_id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("user.user_id"), nullable=False)
@@ -219,6 +324,11 @@ class Booking(Base):
 
 class BookingDetail(Base):
     __tablename__ = "booking_detail"
+    __table_args__ = (
+        # Covering indexes for the availability join in both directions
+        Index("ix_booking_detail_booking_seat", "booking_id", "seat_id"),
+        Index("ix_booking_detail_seat_booking", "seat_id", "booking_id"),
+    )
     
     booking_detail_id = Column(Integer, primary_key=True, autoincrement=True)
     booking_id = Column(Integer, ForeignKey("booking.booking_id"), nullable=False)
@@ -235,6 +345,9 @@ class BookingDetail(Base):
 
 class Payment(Base):
     __tablename__ = "payment"
+    __table_args__ = (
+        Index("ix_payment_booking_status", "booking_id", "payment_status"),
+    )
     
     payment_id = Column(Integer, primary_key=True, autoincrement=True)
     booking_id = Column(Integer, ForeignKey("booking.booking_id"), nullable=False)
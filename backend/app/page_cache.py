@@ -0,0 +1,80 @@
+"""
+Pre-rendered HTML pages
+
+The page templates take no per-user data (JavaScript loads everything), so
+each page is rendered once into bytes with a strong ETag. Pages without
+parameters are kept for the life of the worker (and pre-rendered at startup);
+pages rendered with path parameters (a show id, ...) go into an LRU of
+PAGE_CACHE_SIZE entries. Templates are rendered without the request object.
+
+Responses carry Cache-Control: no-cache, so browsers revalidate and get a
+304 while the page is unchanged.
+"""
+
+import hashlib
+import os
+from typing import Dict, Iterable, Optional
+from fastapi import Request, Response
+from fastapi.templating import Jinja2Templates
+from app import catalog_cache, executors
+from app.catalog_cache import CachedListing
+from app.utils import TTLCache
+
+# Turn off while editing templates: uvicorn --reload does not watch them
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "true").lower() == "true"
+PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", "512"))
+PAGE_CACHE_TTL_SECONDS = float(os.getenv("PAGE_CACHE_TTL_SECONDS", "86400"))
+
+_templates: Optional[Jinja2Templates] = None
+_static_pages: Dict[str, CachedListing] = {}
+_pages = TTLCache(PAGE_CACHE_SIZE, PAGE_CACHE_TTL_SECONDS)
+
+
+def configure(templates: Jinja2Templates):
+    """Use these templates and drop anything rendered with the previous ones"""
+    global _templates
+    _templates = templates
+    _static_pages.clear()
+    _pages.clear()
+
+
+def _render(name: str, context: dict) -> CachedListing:
+    body = _templates.get_template(name).render(**context).encode("utf-8")
+    return CachedListing(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+
+def prerender(names: Iterable[str]):
+    """Render parameterless pages ahead of the first request"""
+    if not PAGE_CACHE_ENABLED:
+        return
+    for name in names:
+        _static_pages[name] = _render(name, {})
+
+
+def _key(name: str, context: dict) -> tuple:
+    return (name, tuple(sorted(context.items())))
+
+
+def get_page(name: str, **context) -> CachedListing:
+    if not PAGE_CACHE_ENABLED:
+        return _render(name, context)
+    if not context:
+        page = _static_pages.get(name)
+        if page is None:
+            page = _static_pages[name] = _render(name, {})
+        return page
+    page = _pages.get(_key(name, context))
+    if page is None:
+        page = _render(name, context)
+        _pages.set(_key(name, context), page)
+    return page
+
+
+async def respond(request: Request, name: str, **context) -> Response:
+    """Cached page as a 200, or 304 if the client already has it; misses render in the render pool"""
+    page = None
+    if PAGE_CACHE_ENABLED:
+        page = _pages.get(_key(name, context)) if context else _static_pages.get(name)
+    if page is None:
+        page = await executors.run("render", get_page, name, **context)
+    return catalog_cache.respond(request, page, media_type="text/html")
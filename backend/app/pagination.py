@@ -0,0 +1,47 @@
+"""
+Keyset (cursor) pagination for list endpoints
+
+A cursor is the sort key of the last row on the previous page plus the sort
+it belongs to, base64url-encoded JSON, so the next page is a range seek on
+an index instead of an OFFSET scan and stays stable while rows are added.
+"""
+
+import base64
+import binascii
+import json
+import os
+from typing import Callable, List, Sequence
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+
+
+def encode_cursor(sort: str, values: Sequence) -> str:
+    """Opaque cursor for the row whose sort key is values"""
+    raw = json.dumps([sort, *(v.isoformat() if hasattr(v, "isoformat") else v for v in values)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, parsers: Sequence[Callable]) -> List:
+    """Sort key stored in a cursor, parsed column by column; 400 if it is malformed or from another sort"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, *values = json.loads(raw)
+        if cursor_sort != sort or len(values) != len(parsers):
+            raise ValueError(cursor)
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def order_by(columns: Sequence, descending: bool) -> list:
+    return [column.desc() if descending else column.asc() for column in columns]
+
+
+def after(columns: Sequence, values: Sequence, descending: bool):
+    """WHERE clause selecting rows that sort after the cursor row"""
+    if descending:
+        return tuple_(*columns) < tuple_(*values)
+    return tuple_(*columns) > tuple_(*values)
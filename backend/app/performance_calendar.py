@@ -0,0 +1,191 @@
+"""
+Precomputed performance calendar
+
+Every scheduled performance from today to CALENDAR_HORIZON_DAYS ahead is kept
+in memory, grouped by day, with its show, venue and seat counts, so a date
+range query only walks the days asked for.
+
+- Catalog changes (app/catalog_cache.py version) rebuild the whole calendar.
+- Bookings, cancellations and refunds in this worker update the performance's
+  seat count after commit; seat counts changed by other workers are re-read
+  in one query at most every CALENDAR_REFRESH_SECONDS.
+- When the date rolls over, past days are dropped and the day that entered
+  the horizon is loaded, without a rebuild.
+"""
+
+import os
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session, joinedload
+from app import models, catalog_cache
+
+CALENDAR_HORIZON_DAYS = int(os.getenv("CALENDAR_HORIZON_DAYS", "180"))
+CALENDAR_REFRESH_SECONDS = float(os.getenv("CALENDAR_REFRESH_SECONDS", "10"))
+
+# Sell-through buckets, checked in order: (name, minimum fraction of seats sold)
+SELL_THROUGH_BUCKETS = (("sold_out", 1.0), ("almost_full", 0.8), ("filling", 0.5), ("available", 0.0))
+
+
+def sell_through_bucket(total_seats: int, available_seats: int) -> str:
+    if total_seats <= 0 or available_seats <= 0:
+        return "sold_out"
+    sold = (total_seats - available_seats) / total_seats
+    for name, minimum in SELL_THROUGH_BUCKETS:
+        if sold >= minimum:
+            return name
+    return "available"
+
+
+def _load(db: Session, start: date, end: date) -> List[Tuple[date, dict]]:
+    """Calendar entries of the scheduled performances between start and end (inclusive)"""
+    performances = db.query(models.Performance).options(
+        joinedload(models.Performance.show), joinedload(models.Performance.venue)
+    ).filter(
+        models.Performance.performance_status == "Scheduled",
+        models.Performance.performance_date >= start,
+        models.Performance.performance_date <= end
+    ).order_by(
+        models.Performance.performance_date, models.Performance.start_time, models.Performance.performance_id
+    ).all()
+    return [
+        (p.performance_date, {
+            "performance_id": p.performance_id,
+            "show_id": p.show_id,
+            "title": p.show.title if p.show else None,
+            "venue_id": p.venue_id,
+            "venue_name": p.venue.venue_name if p.venue else None,
+            "city": p.venue.city if p.venue else None,
+            "start_time": str(p.start_time) if p.start_time else None,
+            "total_seats": p.total_seats,
+            "available_seats": p.available_seats,
+            "bucket": sell_through_bucket(p.total_seats, p.available_seats)
+        })
+        for p in performances
+    ]
+
+
+class _Calendar:
+    def __init__(self, version: int, today: date):
+        self.version = version
+        self.start = today
+        self.end = today + timedelta(days=CALENDAR_HORIZON_DAYS)
+        self.days: Dict[date, List[dict]] = {}
+        self.by_id: Dict[int, dict] = {}
+        self.refreshed_at = time.monotonic()
+
+    def add(self, entries: List[Tuple[date, dict]]):
+        for day, entry in entries:
+            self.days.setdefault(day, []).append(entry)
+            self.by_id[entry["performance_id"]] = entry
+
+    def roll_over(self, today: date, entries: List[Tuple[date, dict]]):
+        """Drop days before today and add the days that entered the horizon"""
+        for day in [day for day in self.days if day < today]:
+            for entry in self.days.pop(day):
+                self.by_id.pop(entry["performance_id"], None)
+        self.add(entries)
+        self.start = today
+        self.end = max(self.end, today + timedelta(days=CALENDAR_HORIZON_DAYS))
+
+
+_calendar: Optional[_Calendar] = None
+_lock = threading.Lock()
+
+
+def _set_available(entry: dict, available_seats: int):
+    entry["available_seats"] = available_seats
+    entry["bucket"] = sell_through_bucket(entry["total_seats"], available_seats)
+
+
+def ensure_current(db: Session):
+    """
+    Rebuild, roll over or refresh seat counts as needed before a read
+
+    Queries run without holding _lock: under AsyncSession.run_sync every
+    query yields to the event loop, and a request blocking on a held
+    threading.Lock there would stall the loop the holder needs to finish.
+    _lock only guards applying the results.
+    """
+    global _calendar
+    version = catalog_cache.current_version(db)
+    today = date.today()
+    calendar = _calendar
+    if calendar is None or calendar.version != version:
+        fresh = _Calendar(version, today)
+        fresh.add(_load(db, fresh.start, fresh.end))
+        with _lock:
+            if _calendar is None or _calendar.version < version:
+                _calendar = fresh
+        return
+
+    if calendar.start != today:
+        end = today + timedelta(days=CALENDAR_HORIZON_DAYS)
+        entries = _load(db, max(calendar.end + timedelta(days=1), today), end) if end > calendar.end else []
+        with _lock:
+            if _calendar is calendar and calendar.start != today:
+                calendar.roll_over(today, entries)
+
+    with _lock:
+        # Claim the refresh so concurrent readers do not all run it
+        if _calendar is not calendar or time.monotonic() - calendar.refreshed_at < CALENDAR_REFRESH_SECONDS:
+            return
+        calendar.refreshed_at = time.monotonic()
+        start, end = calendar.start, calendar.end
+    rows = db.query(
+        models.Performance.performance_id, models.Performance.available_seats
+    ).filter(
+        models.Performance.performance_status == "Scheduled",
+        models.Performance.performance_date >= start,
+        models.Performance.performance_date <= end
+    ).all()
+    with _lock:
+        for performance_id, available_seats in rows:
+            entry = calendar.by_id.get(performance_id)
+            if entry is not None and entry["available_seats"] != available_seats:
+                _set_available(entry, available_seats)
+
+
+def update_availability(performance_id: int, available_seats: int):
+    """Record a committed seat count change (bookings, cancellations, refunds)"""
+    with _lock:
+        entry = _calendar.by_id.get(performance_id) if _calendar is not None else None
+        if entry is not None:
+            _set_available(entry, available_seats)
+
+
+def horizon_end() -> date:
+    return date.today() + timedelta(days=CALENDAR_HORIZON_DAYS)
+
+
+def query(date_from: date, date_to: date, venue_id: Optional[int] = None,
+          show_id: Optional[int] = None, city: Optional[str] = None) -> List[dict]:
+    """Per-day performance lists and availability summaries between two dates"""
+    with _lock:
+        calendar = _calendar
+        if calendar is None:
+            return []
+        days = []
+        day = date_from
+        while day <= date_to:
+            performances = [
+                dict(entry) for entry in calendar.days.get(day, ())
+                if (venue_id is None or entry["venue_id"] == venue_id)
+                and (show_id is None or entry["show_id"] == show_id)
+                and (city is None or entry["city"] == city)
+            ]
+            if performances:
+                total_seats = sum(p["total_seats"] for p in performances)
+                available_seats = sum(p["available_seats"] for p in performances)
+                days.append({
+                    "date": day.isoformat(),
+                    "performance_count": len(performances),
+                    "total_seats": total_seats,
+                    "available_seats": available_seats,
+                    "sell_through": round((total_seats - available_seats) / total_seats, 3) if total_seats else 1.0,
+                    "bucket": sell_through_bucket(total_seats, available_seats),
+                    "performances": performances
+                })
+            day += timedelta(days=1)
+    return days
@@ -0,0 +1,126 @@
+"""
+Granular role-based access control backed by an in-process cache
+
+Admin endpoints declare the Role.can_* permission they need with
+require_permission(...). The resolver maps the token's user to a role and
+the role to its permission set using two caches:
+- roles: role_id -> permissions, loaded as one small table scan
+- users: the shared user_context cache (role_id, is_admin, account_status)
+
+After the first hit per user, a check costs no queries. Role and user
+updates invalidate the local caches immediately through a version counter;
+other worker processes pick changes up within CACHE_TTL_SECONDS (roles) or
+USER_CONTEXT_TTL_SECONDS (users).
+
+Users flagged is_admin without a role keep full access (legacy admins).
+"""
+
+import os
+import threading
+import time
+from typing import Dict, FrozenSet
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from app import models, database, auth, user_context
+
+PERMISSIONS = (
+    "can_manage_shows",
+    "can_manage_venues",
+    "can_manage_performances",
+    "can_manage_bookings",
+    "can_view_analytics",
+    "can_manage_users",
+    "can_manage_pricing",
+    "can_issue_refunds",
+)
+
+ALL_PERMISSIONS: FrozenSet[str] = frozenset(PERMISSIONS)
+
+CACHE_TTL_SECONDS = float(os.getenv("RBAC_CACHE_TTL_SECONDS", "60"))
+
+_lock = threading.Lock()
+_roles_version = 0
+_roles: Dict[int, FrozenSet[str]] = {}
+_roles_loaded_at = 0.0
+_roles_loaded_version = -1
+
+
+def invalidate_roles():
+    """Drop cached role permissions (call after creating, updating or deleting a role)"""
+    global _roles_version
+    with _lock:
+        _roles_version += 1
+
+
+def invalidate_user(user_id: int):
+    """Drop a cached user's role and status (call after changing them)"""
+    user_context.invalidate(user_id)
+
+
+def _role_permissions(db: Session, role_id: int) -> FrozenSet[str]:
+    global _roles, _roles_loaded_at, _roles_loaded_version
+    now = time.monotonic()
+    if _roles_loaded_version != _roles_version or now - _roles_loaded_at > CACHE_TTL_SECONDS:
+        version = _roles_version
+        roles = {
+            role.role_id: frozenset(p for p in PERMISSIONS if getattr(role, p))
+            for role in db.query(models.Role).all()
+        }
+        with _lock:
+            # Skip the store if an invalidation raced with the load
+            if version == _roles_version:
+                _roles = roles
+                _roles_loaded_at = now
+                _roles_loaded_version = version
+        return roles.get(role_id, frozenset())
+    return _roles.get(role_id, frozenset())
+
+
+def resolve_permissions(db: Session, user_id: int) -> FrozenSet[str]:
+    """Effective permission set of a user"""
+    context = user_context.get_user_context(db, user_id)
+    if context is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+
+    if (context["account_status"] or "Active") != "Active":
+        return frozenset()
+    if context["role_id"] is not None:
+        return _role_permissions(db, context["role_id"])
+    return ALL_PERMISSIONS if context["is_admin"] else frozenset()
+
+
+def get_current_permissions(
+    payload: dict = Depends(auth.get_current_user_from_token),
+    db: Session = Depends(database.get_db)
+) -> dict:
+    """Token payload with the user's resolved permissions under "permissions\""""
+    payload["permissions"] = resolve_permissions(db, payload.get("user_id"))
+    return payload
+
+
+def ensure(payload: dict, *required: str):
+    """Raise 403 unless the resolved payload holds every required permission"""
+    missing = [p for p in required if p not in payload.get("permissions", ())]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Permission required: {', '.join(missing)}"
+        )
+
+
+def require_permission(*required: str):
+    """
+    Dependency factory enforcing Role.can_* permissions
+
+    Usage:
+        admin: dict = Depends(permissions.require_permission("can_manage_shows"))
+    """
+    unknown = set(required) - ALL_PERMISSIONS
+    if unknown:
+        raise ValueError(f"Unknown permissions: {', '.join(sorted(unknown))}")
+
+    def dependency(payload: dict = Depends(get_current_permissions)) -> dict:
+        ensure(payload, *required)
+        return payload
+
+    return dependency
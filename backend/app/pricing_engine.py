@@ -0,0 +1,443 @@
+"""
+Demand-based dynamic pricing for performance seat categories
+
+PerformancePricing.price is treated as the admin-set base price. The engine
+periodically recomputes a live price per (performance, category) from:
+- sell-through rate (seats sold / seats in the category)
+- time to curtain
+- recent sales velocity
+and clamps the result to the most specific active PricingRule.
+
+Inputs come from PerformanceSalesCounter rows that the booking and
+cancellation paths update incrementally, so a recompute never scans bookings.
+The computed prices live in an in-memory table that is replaced wholesale on
+each recompute; readers always see either the old or the new table.
+
+Every worker recomputes its own table. An admin-requested recompute bumps
+PricingVersion, which each worker's recompute thread checks every
+PRICING_VERSION_CHECK_SECONDS, so all workers pick it up together.
+"""
+
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Optional
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app import metrics, models
+
+DYNAMIC_PRICING_ENABLED = os.getenv("DYNAMIC_PRICING_ENABLED", "false").lower() == "true"
+PRICING_RECOMPUTE_SECONDS = int(os.getenv("PRICING_RECOMPUTE_SECONDS", "300"))
+PRICING_VERSION_CHECK_SECONDS = float(os.getenv("PRICING_VERSION_CHECK_SECONDS", "5"))
+
+PRICING_ID = 1
+
+# Velocity half-life style time constant for the decayed sales rate
+VELOCITY_TAU_HOURS = float(os.getenv("PRICING_VELOCITY_TAU_HOURS", "6"))
+
+# Default bounds (as multiples of base price) when no PricingRule applies
+DEFAULT_MIN_MULTIPLIER = Decimal(os.getenv("PRICING_MIN_MULTIPLIER", "0.8"))
+DEFAULT_MAX_MULTIPLIER = Decimal(os.getenv("PRICING_MAX_MULTIPLIER", "1.5"))
+
+# Demand model weights
+SELL_THROUGH_WEIGHT = 0.6   # premium as the category fills up
+VELOCITY_WEIGHT = 0.2       # premium when projected demand exceeds remaining seats
+LAST_MINUTE_WEIGHT = 0.25   # discount for unsold seats close to curtain
+LAST_MINUTE_HORIZON_HOURS = 72.0
+
+# performance_id -> {seat_category: price}; replaced, never mutated in place
+_price_table: Dict[int, Dict[str, Decimal]] = {}
+_last_recompute: Optional[datetime] = None
+_recomputed_version = 0
+# Invalidations are numbered so a recompute reading an older snapshot drops
+# the performances invalidated since (guarded by _table_lock, like both swaps)
+_generation = 0
+_table_generation = 0               # generation the live table's snapshot started at
+_invalidated: Dict[int, int] = {}   # performance_id -> generation of its last invalidation
+_table_lock = threading.Lock()
+
+
+# ============================================
+# PRICE TABLE READS
+# ============================================
+
+def get_prices(performance_id: int) -> Optional[Dict[str, Decimal]]:
+    """Live prices for a performance, or None if the engine has no entry for it"""
+    return _price_table.get(performance_id)
+
+
+def get_price(performance_id: int, seat_category: str) -> Optional[Decimal]:
+    """Live price for one category, or None to fall back to PerformancePricing"""
+    prices = _price_table.get(performance_id)
+    if prices is None:
+        return None
+    return prices.get(seat_category)
+
+
+def invalidate(performance_id: int):
+    """Drop a performance from the live table so readers fall back to base prices"""
+    global _price_table, _generation
+    with _table_lock:
+        _generation += 1
+        _invalidated[performance_id] = _generation
+        if performance_id in _price_table:
+            table = dict(_price_table)
+            del table[performance_id]
+            _price_table = table
+
+
+def _swap(table: Dict[int, Dict[str, Decimal]], generation: int, now: datetime, version: int) -> int:
+    """Install a recomputed table unless a newer one is live; returns the entries kept"""
+    global _price_table, _table_generation, _last_recompute, _recomputed_version
+    with _table_lock:
+        if generation < _table_generation:
+            return len(_price_table)
+        for performance_id, invalidated_at in list(_invalidated.items()):
+            if invalidated_at > generation:
+                table.pop(performance_id, None)
+            else:
+                # Older invalidations are reflected in every snapshot still to come
+                del _invalidated[performance_id]
+        _price_table = table
+        _table_generation = generation
+        _last_recompute, _recomputed_version = now, version
+        return len(table)
+
+
+def status() -> dict:
+    """Engine state for the admin dashboard"""
+    return {
+        "enabled": DYNAMIC_PRICING_ENABLED,
+        "recompute_seconds": PRICING_RECOMPUTE_SECONDS,
+        "performances_priced": len(_price_table),
+        "last_recompute": str(_last_recompute) if _last_recompute else None,
+        "version": _recomputed_version
+    }
+
+
+# ============================================
+# RECOMPUTE REQUESTS
+# ============================================
+
+def request_recompute(db: Session):
+    """Ask every worker to recompute, inside the caller's transaction"""
+    result = db.execute(
+        update(models.PricingVersion)
+        .where(models.PricingVersion.pricing_id == PRICING_ID)
+        .values(version=models.PricingVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(models.PricingVersion(pricing_id=PRICING_ID, version=1))
+        db.flush()
+
+
+def requested_version(db: Session) -> int:
+    return db.query(models.PricingVersion.version).filter(
+        models.PricingVersion.pricing_id == PRICING_ID
+    ).scalar() or 0
+
+
+# ============================================
+# SALES COUNTERS
+# ============================================
+
+def _decayed_velocity(velocity: float, updated_at: Optional[datetime], now: datetime) -> float:
+    """Apply exponential decay to a stored seats/hour rate"""
+    if not velocity or updated_at is None:
+        return 0.0
+    hours = max((now - updated_at).total_seconds() / 3600, 0.0)
+    return velocity * math.exp(-hours / VELOCITY_TAU_HOURS)
+
+
+def _get_counter(db: Session, performance_id: int, seat_category: str) -> models.PerformanceSalesCounter:
+    """Fetch (locking) or create the counter row for a performance category"""
+    counter = db.query(models.PerformanceSalesCounter).filter(
+        models.PerformanceSalesCounter.performance_id == performance_id,
+        models.PerformanceSalesCounter.seat_category == seat_category
+    ).with_for_update().first()
+
+    if counter:
+        return counter
+
+    try:
+        with db.begin_nested():
+            counter = models.PerformanceSalesCounter(
+                performance_id=performance_id,
+                seat_category=seat_category,
+                seats_sold=0,
+                velocity=0.0
+            )
+            db.add(counter)
+            db.flush()
+        return counter
+    except IntegrityError:
+        # Another worker created it first
+        return db.query(models.PerformanceSalesCounter).filter(
+            models.PerformanceSalesCounter.performance_id == performance_id,
+            models.PerformanceSalesCounter.seat_category == seat_category
+        ).with_for_update().first()
+
+
+def record_sale(db: Session, performance_id: int, category_counts: Dict[str, int]):
+    """
+    Add sold seats to the counters inside the caller's booking transaction
+
+    Args:
+        category_counts: {seat_category: seats sold in this booking}
+    """
+    now = datetime.now()
+    for category, count in category_counts.items():
+        counter = _get_counter(db, performance_id, category)
+        counter.seats_sold += count
+        counter.velocity = _decayed_velocity(counter.velocity, counter.velocity_updated_at, now) + count / VELOCITY_TAU_HOURS
+        counter.velocity_updated_at = now
+
+
+def record_release(db: Session, performance_id: int, category_counts: Dict[str, int]):
+    """Return cancelled or refunded seats to the counters (velocity is left as is)"""
+    for category, count in category_counts.items():
+        counter = _get_counter(db, performance_id, category)
+        counter.seats_sold = max(counter.seats_sold - count, 0)
+
+
+def release_booking(db: Session, booking_id: int, performance_id: int):
+    """Release all seats of a booking from the counters, grouped by category"""
+    rows = db.query(
+        models.BookingDetail.seat_category,
+        func.count(models.BookingDetail.booking_detail_id)
+    ).filter(
+        models.BookingDetail.booking_id == booking_id
+    ).group_by(models.BookingDetail.seat_category).all()
+
+    record_release(db, performance_id, {category: count for category, count in rows})
+
+
+def rebuild_counters(db: Session) -> int:
+    """
+    One-off backfill of counters from existing bookings
+
+    Only needed when enabling the engine on a database with historic bookings;
+    the regular recompute never calls this. Velocity starts at zero.
+    """
+    rows = db.query(
+        models.Booking.performance_id,
+        models.BookingDetail.seat_category,
+        func.count(models.BookingDetail.booking_detail_id)
+    ).join(
+        models.BookingDetail, models.BookingDetail.booking_id == models.Booking.booking_id
+    ).filter(
+        models.Booking.booking_status.in_(["Pending", "Confirmed"])
+    ).group_by(
+        models.Booking.performance_id,
+        models.BookingDetail.seat_category
+    ).all()
+
+    db.query(models.PerformanceSalesCounter).delete()
+    db.add_all([
+        models.PerformanceSalesCounter(
+            performance_id=performance_id,
+            seat_category=category,
+            seats_sold=count,
+            velocity=0.0
+        )
+        for performance_id, category, count in rows
+    ])
+    db.commit()
+    return len(rows)
+
+
+# ============================================
+# RECOMPUTE
+# ============================================
+
+def _quantize(value: Decimal) -> Decimal:
+    return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def _pick_rule(rules: Dict[tuple, models.PricingRule], show_id: int, seat_category: str):
+    """Most specific active rule wins: show+category, show, category, global"""
+    for key in ((show_id, seat_category), (show_id, None), (None, seat_category), (None, None)):
+        if key in rules:
+            return rules[key]
+    return None
+
+
+def compute_price(
+    base_price: Decimal,
+    capacity: int,
+    seats_sold: int,
+    velocity: float,
+    hours_to_curtain: float,
+    floor_price: Optional[Decimal] = None,
+    ceiling_price: Optional[Decimal] = None
+) -> Decimal:
+    """
+    Demand-adjusted price for one category
+
+    The multiplier rises with sell-through and with sales pace relative to the
+    seats left, and falls for unsold inventory inside the last-minute horizon.
+    """
+    sell_through = min(seats_sold / capacity, 1.0) if capacity else 0.0
+    remaining = max(capacity - seats_sold, 0)
+
+    # Fraction of the remaining seats the current pace would sell before curtain
+    if remaining:
+        projected = velocity * max(hours_to_curtain, 0.0) / remaining
+    else:
+        projected = 1.0
+    pace = min(projected, 2.0) - 1.0
+
+    urgency = 1.0 - min(max(hours_to_curtain, 0.0) / LAST_MINUTE_HORIZON_HOURS, 1.0)
+
+    multiplier = (
+        1.0
+        + SELL_THROUGH_WEIGHT * (sell_through - 0.5)
+        + VELOCITY_WEIGHT * pace
+        - LAST_MINUTE_WEIGHT * urgency * (1.0 - sell_through)
+    )
+
+    price = base_price * Decimal(str(round(multiplier, 4)))
+
+    floor_price = floor_price if floor_price is not None else base_price * DEFAULT_MIN_MULTIPLIER
+    ceiling_price = ceiling_price if ceiling_price is not None else base_price * DEFAULT_MAX_MULTIPLIER
+    return _quantize(min(max(price, floor_price), ceiling_price))
+
+
+def recompute(db: Session) -> int:
+    """
+    Rebuild the live price table for all upcoming scheduled performances
+
+    Runs a fixed number of queries regardless of booking volume, builds the new
+    table off to the side and swaps it in with a single reference assignment.
+    Performances invalidated while it ran are left out until the next run.
+    Returns the number of performances priced.
+    """
+    now = datetime.now()
+    with _table_lock:
+        generation = _generation
+    # Read first: a request committed while this runs triggers one more recompute
+    version = requested_version(db)
+
+    performances = db.query(
+        models.Performance.performance_id,
+        models.Performance.show_id,
+        models.Performance.venue_id,
+        models.Performance.performance_date,
+        models.Performance.start_time
+    ).filter(
+        models.Performance.performance_date >= now.date(),
+        models.Performance.performance_status == "Scheduled"
+    ).all()
+
+    if not performances:
+        return _swap({}, generation, now, version)
+
+    performance_ids = [p.performance_id for p in performances]
+
+    base_prices = {}
+    for row in db.query(
+        models.PerformancePricing.performance_id,
+        models.PerformancePricing.seat_category,
+        models.PerformancePricing.price
+    ).filter(models.PerformancePricing.performance_id.in_(performance_ids)):
+        base_prices.setdefault(row.performance_id, {})[row.seat_category] = Decimal(row.price)
+
+    counters = {
+        (c.performance_id, c.seat_category): c
+        for c in db.query(models.PerformanceSalesCounter).filter(
+            models.PerformanceSalesCounter.performance_id.in_(performance_ids)
+        )
+    }
+
+    venue_ids = {p.venue_id for p in performances}
+    capacities = {}
+    for venue_id, category, count in db.query(
+        models.Seat.venue_id,
+        models.Seat.seat_category,
+        func.count(models.Seat.seat_id)
+    ).filter(
+        models.Seat.venue_id.in_(venue_ids),
+        models.Seat.is_active == True
+    ).group_by(models.Seat.venue_id, models.Seat.seat_category):
+        capacities[(venue_id, category)] = count
+
+    rules = {
+        (r.show_id, r.seat_category): r
+        for r in db.query(models.PricingRule).filter(models.PricingRule.is_active == True)
+    }
+
+    table = {}
+    for perf in performances:
+        categories = base_prices.get(perf.performance_id)
+        if not categories:
+            continue
+
+        curtain = datetime.combine(perf.performance_date, perf.start_time)
+        hours_to_curtain = (curtain - now).total_seconds() / 3600
+        prices = {}
+
+        for category, base_price in categories.items():
+            counter = counters.get((perf.performance_id, category))
+            seats_sold = counter.seats_sold if counter else 0
+            velocity = _decayed_velocity(counter.velocity, counter.velocity_updated_at, now) if counter else 0.0
+            rule = _pick_rule(rules, perf.show_id, category)
+
+            prices[category] = compute_price(
+                base_price=base_price,
+                capacity=capacities.get((perf.venue_id, category), 0),
+                seats_sold=seats_sold,
+                velocity=velocity,
+                hours_to_curtain=hours_to_curtain,
+                floor_price=Decimal(rule.floor_price) if rule else None,
+                ceiling_price=Decimal(rule.ceiling_price) if rule else None
+            )
+
+        table[perf.performance_id] = prices
+
+    # Atomic swap: readers hold either the old dict or the new one
+    return _swap(table, generation, now, version)
+
+
+# ============================================
+# BACKGROUND SCHEDULER
+# ============================================
+
+_stop_event = threading.Event()
+_worker: Optional[threading.Thread] = None
+
+
+def _run_periodically(session_factory):
+    due = 0.0
+    while not _stop_event.is_set():
+        db = session_factory()
+        try:
+            if time.monotonic() >= due or requested_version(db) != _recomputed_version:
+                due = time.monotonic() + PRICING_RECOMPUTE_SECONDS
+                recompute(db)
+                metrics.inc("theatre_background_job_runs_total", job="pricing_recompute", outcome="success")
+        except Exception as e:
+            metrics.inc("theatre_background_job_runs_total", job="pricing_recompute", outcome="error")
+            # Keep serving the previous table if a recompute fails
+            print(f"Dynamic pricing recompute error: {e}")
+        finally:
+            db.close()
+        _stop_event.wait(min(PRICING_VERSION_CHECK_SECONDS, PRICING_RECOMPUTE_SECONDS))
+
+
+def start(session_factory):
+    """Start the periodic recompute thread (no-op unless DYNAMIC_PRICING_ENABLED)"""
+    global _worker
+    if not DYNAMIC_PRICING_ENABLED or (_worker and _worker.is_alive()):
+        return
+    _stop_event.clear()
+    _worker = threading.Thread(target=_run_periodically, args=(session_factory,), name="pricing-engine", daemon=True)
+    _worker.start()
+
+
+def stop():
+    """Signal the recompute thread to exit"""
+    _stop_event.set()
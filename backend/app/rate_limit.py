@@ -0,0 +1,319 @@
+"""
+Sliding-window rate limiting for auth and booking endpoints
+
+Each limited route has an optional per-IP and per-user limit. Counting uses
+the sliding-window counter approximation: two fixed windows per key, with the
+previous window weighted by how much of it still overlaps the sliding window.
+That is O(1) memory and time per key and never over-admits by more than the
+weighted remainder.
+
+Backends:
+- memory (default): a dict in this process; right for a single worker
+- database: a rate_limit_counter table shared by all workers
+
+The middleware is plain ASGI (no BaseHTTPMiddleware) and only touches the
+backend for paths in the rule table, so unlimited routes pay one dict lookup.
+Rejected requests get 429 with a Retry-After header and are not counted in
+any window: every window is checked before any is incremented.
+
+Rules are configured per route through RATE_LIMIT_<NAME>, e.g.
+    RATE_LIMIT_LOGIN=ip=10/60,user=0
+where "limit/seconds" sets a window and 0 disables that dimension.
+"""
+
+import json
+import math
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from app import models, auth
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory, database
+
+# Take the client IP from X-Forwarded-For (only behind a trusted proxy)
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+
+
+class Limit(NamedTuple):
+    count: int
+    seconds: int
+
+
+class RouteRule(NamedTuple):
+    name: str
+    per_ip: Optional[Limit]
+    per_user: Optional[Limit]
+
+
+# (method, path) -> (rule name, default per-IP limit, default per-user limit)
+DEFAULT_RULES = {
+    ("POST", "/api/users/login"): ("LOGIN", Limit(10, 60), None),
+    ("POST", "/api/users/register"): ("REGISTER", Limit(5, 60), None),
+    ("POST", "/api/users/forgot-password"): ("FORGOT_PASSWORD", Limit(5, 300), None),
+    ("POST", "/api/users/reset-password"): ("RESET_PASSWORD", Limit(10, 300), None),
+    ("POST", "/api/verification/send-verification"): ("SEND_VERIFICATION", Limit(5, 300), None),
+    ("POST", "/api/verification/resend"): ("RESEND_VERIFICATION", Limit(5, 300), None),
+    ("POST", "/api/bookings/"): ("BOOKINGS", Limit(30, 60), Limit(10, 60)),
+}
+
+
+def _parse_limit(value: str) -> Optional[Limit]:
+    if value.strip() in ("", "0"):
+        return None
+    count, seconds = value.split("/")
+    return Limit(int(count), int(seconds))
+
+
+def load_rules() -> Dict[Tuple[str, str], RouteRule]:
+    """Default rule table with RATE_LIMIT_<NAME> overrides applied"""
+    rules = {}
+    for route, (name, per_ip, per_user) in DEFAULT_RULES.items():
+        override = os.getenv(f"RATE_LIMIT_{name}")
+        if override:
+            for part in override.split(","):
+                dimension, _, value = part.partition("=")
+                if dimension.strip() == "ip":
+                    per_ip = _parse_limit(value)
+                elif dimension.strip() == "user":
+                    per_user = _parse_limit(value)
+        rules[route] = RouteRule(name, per_ip, per_user)
+    return rules
+
+
+def _estimate(limit: Limit, now: float, window_start: int, previous: int, current: int) -> float:
+    elapsed_fraction = (now - window_start) / limit.seconds
+    return previous * (1 - elapsed_fraction) + current
+
+
+def _retry_after(limit: Limit, now: float, window_start: int, previous: int, current: int) -> int:
+    """Seconds until the sliding estimate drops below the limit again"""
+    if current >= limit.count or previous == 0:
+        wait = window_start + limit.seconds - now
+    else:
+        # previous * (1 - (t - window_start) / seconds) + current < count
+        wait = window_start + limit.seconds * (1 - (limit.count - current) / previous) - now
+    return max(1, math.ceil(wait))
+
+
+# =============================================
+# Backends
+# =============================================
+
+class MemoryBackend:
+    """Per-process counters; the event loop is single-threaded so no lock is needed"""
+
+    SWEEP_EVERY = 10000
+
+    def __init__(self):
+        # key -> [window_start, previous_count, current_count]
+        self._counters: Dict[str, List[int]] = {}
+        self._hits = 0
+
+    def hit(self, checks: List[Tuple[str, Limit]], now: float) -> int:
+        """Count one request against every (key, limit); returns 0 if allowed,
+        otherwise Retry-After seconds (and nothing is counted)"""
+        entries = []
+        retry_after = 0
+        for key, limit in checks:
+            window_start = int(now) // limit.seconds * limit.seconds
+            entry = self._counters.get(key)
+            if entry is None:
+                entry = self._counters[key] = [window_start, 0, 0]
+            elif entry[0] != window_start:
+                # Roll forward; anything older than the previous window no longer counts
+                entry[1] = entry[2] if entry[0] == window_start - limit.seconds else 0
+                entry[0] = window_start
+                entry[2] = 0
+
+            if _estimate(limit, now, window_start, entry[1], entry[2]) + 1 > limit.count:
+                retry_after = max(retry_after, _retry_after(limit, now, window_start, entry[1], entry[2]))
+            entries.append(entry)
+
+        if retry_after:
+            return retry_after
+        for entry in entries:
+            entry[2] += 1
+
+        self._hits += 1
+        if self._hits >= self.SWEEP_EVERY:
+            self._sweep(now)
+        return 0
+
+    def _sweep(self, now: float):
+        self._hits = 0
+        horizon = int(now) - 2 * max((limit.seconds for limit in _all_limits()), default=60)
+        self._counters = {k: v for k, v in self._counters.items() if v[0] >= horizon}
+
+    def reset(self):
+        self._counters.clear()
+
+
+class DatabaseBackend:
+    """Counters in the rate_limit_counter table, shared by every worker process"""
+
+    PURGE_EVERY = 1000
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+        self._hits = 0
+
+    def hit(self, checks: List[Tuple[str, Limit]], now: float) -> int:
+        table = models.RateLimitCounter
+
+        db = self._session_factory()
+        try:
+            windows = []
+            retry_after = 0
+            for key, limit in checks:
+                window_start = int(now) // limit.seconds * limit.seconds
+                previous_start = window_start - limit.seconds
+                counts = dict(db.query(table.window_start, table.request_count).filter(
+                    table.limit_key == key,
+                    table.window_start.in_((previous_start, window_start))
+                ).all())
+                previous = counts.get(previous_start, 0)
+                current = counts.get(window_start, 0)
+
+                if _estimate(limit, now, window_start, previous, current) + 1 > limit.count:
+                    retry_after = max(retry_after, _retry_after(limit, now, window_start, previous, current))
+                windows.append((key, window_start))
+
+            if retry_after:
+                return retry_after
+
+            for key, window_start in windows:
+                result = db.execute(
+                    update(table)
+                    .where(table.limit_key == key, table.window_start == window_start)
+                    .values(request_count=table.request_count + 1)
+                )
+                if result.rowcount == 0:
+                    try:
+                        with db.begin_nested():
+                            db.add(table(limit_key=key, window_start=window_start, request_count=1))
+                    except IntegrityError:
+                        # Another worker created the window first
+                        db.execute(
+                            update(table)
+                            .where(table.limit_key == key, table.window_start == window_start)
+                            .values(request_count=table.request_count + 1)
+                        )
+
+            self._hits += 1
+            if self._hits >= self.PURGE_EVERY:
+                self._hits = 0
+                horizon = int(now) - 2 * max((limit.seconds for limit in _all_limits()), default=60)
+                db.execute(delete(table).where(table.window_start < horizon))
+            db.commit()
+            return 0
+        finally:
+            db.close()
+
+    def reset(self):
+        db = self._session_factory()
+        try:
+            db.execute(delete(models.RateLimitCounter))
+            db.commit()
+        finally:
+            db.close()
+
+
+_rules = load_rules()
+_backend = None
+
+
+def _all_limits():
+    for rule in _rules.values():
+        if rule.per_ip:
+            yield rule.per_ip
+        if rule.per_user:
+            yield rule.per_user
+
+
+def get_backend():
+    """The configured counter backend (created on first use)"""
+    global _backend
+    if _backend is None:
+        if RATE_LIMIT_BACKEND == "database":
+            from app.database import SessionLocal
+            _backend = DatabaseBackend(SessionLocal)
+        else:
+            _backend = MemoryBackend()
+    return _backend
+
+
+# =============================================
+# Middleware
+# =============================================
+
+def _client_ip(scope) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _user_id(scope) -> Optional[int]:
+    """User ID from a valid bearer token, or None (the endpoint will reject it anyway)"""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            payload = auth.decode_access_token(token)
+            return payload.get("user_id") if payload else None
+    return None
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying the route rule table"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED:
+            return await self.app(scope, receive, send)
+
+        rule = _rules.get((scope["method"], scope["path"]))
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        backend = get_backend()
+        now = time.time()
+        checks = []
+        if rule.per_ip:
+            checks.append((f"{rule.name}:ip:{_client_ip(scope)}", rule.per_ip))
+        if rule.per_user:
+            user_id = _user_id(scope)
+            if user_id is not None:
+                checks.append((f"{rule.name}:user:{user_id}", rule.per_user))
+
+        if isinstance(backend, MemoryBackend):
+            retry_after = backend.hit(checks, now)
+        else:
+            retry_after = await run_in_threadpool(backend.hit, checks, now)
+        if retry_after:
+            return await _reject(send, retry_after)
+
+        return await self.app(scope, receive, send)
+
+
+async def _reject(send, retry_after: int):
+    body = json.dumps({"detail": "Too many requests. Please try again later."}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
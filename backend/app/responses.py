@@ -0,0 +1,38 @@
+"""
+Fast JSON responses
+
+FastJSONResponse serializes with orjson, which handles datetime, date, time,
+UUID and enums natively; Decimal is encoded like FastAPI does (int when it
+has no fractional part, float otherwise). Returning one directly from an
+endpoint also skips FastAPI's jsonable_encoder pass over the whole payload,
+which is most of the cost for large lists of dicts.
+
+It is also the app's default response class, so endpoints that return plain
+dicts get the faster final encoding too.
+"""
+
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi.encoders import decimal_encoder, jsonable_encoder
+from fastapi.responses import JSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any):
+    if isinstance(value, Decimal):
+        return decimal_encoder(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    # Anything else (Pydantic models, ...) goes through FastAPI's encoder
+    return jsonable_encoder(value)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, UploadFile, File
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_
-from typing import List, Optional
+from sqlalchemy import desc, func, or_, update, cast, Integer
+from typing import Dict, List, Optional
 from datetime import datetime, date, time
-from app import models, database, auth
+from app import models, database, permissions, scheduling, pricing_engine, csv_import, seat_layout, sql_instrumentation, metrics, catalog_cache, show_search, show_bootstrap, performance_calendar, executors
 from pydantic import BaseModel
+from app.responses import FastJSONResponse
+import codecs
 
-router = APIRouter(prefix="/api/admin", tags=["Admin"])
+router = APIRouter(prefix="/api/admin", tags=["Admin"], route_class=executors.pooled_route())
 
 
 # Pydantic schemas for admin operations
@@ -60,6 +62,29 @@ class VenueUpdate(BaseModel):
     facilities: str | None = None
 
 
+class SeatSelector(BaseModel):
+    section: str | None = None
+    rows: List[str] | None = None
+    seat_numbers: List[str] | None = None
+    seat_number_from: int | None = None
+    seat_number_to: int | None = None
+    seat_category: str | None = None
+    seat_ids: List[int] | None = None
+
+
+class SeatChanges(BaseModel):
+    is_active: bool | None = None
+    is_accessible: bool | None = None
+    seat_category: str | None = None
+    section: str | None = None
+
+
+class SeatBulkUpdate(BaseModel):
+    selector: SeatSelector
+    changes: SeatChanges
+    dry_run: bool = False
+
+
 class PerformanceCreate(BaseModel):
     show_id: int
     venue_id: int
@@ -94,6 +119,34 @@ class PerformancePricingUpdate(BaseModel):
     price: float
 
 
+class PricingRuleCreate(BaseModel):
+    show_id: int | None = None
+    seat_category: str | None = None
+    floor_price: float
+    ceiling_price: float
+    is_active: bool = True
+
+
+class RecurrenceSlot(BaseModel):
+    weekday: int  # 0 = Monday ... 6 = Sunday
+    start_time: time
+    end_time: time | None = None
+
+
+class SeasonScheduleRequest(BaseModel):
+    show_id: int
+    venue_id: int
+    start_date: date
+    end_date: date
+    slots: List[RecurrenceSlot]
+    interval_weeks: int = 1
+    exclude_dates: List[date] = []
+    prices: Dict[str, float] = {}
+    total_seats: int | None = None
+    special_notes: str | None = None
+    dry_run: bool = False
+
+
 class GenreCreate(BaseModel):
     genre_name: str
     description: str | None = None
@@ -105,7 +158,7 @@ class GenreCreate(BaseModel):
 def create_genre(
     genre: GenreCreate,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_shows"))
 ):
     """Create a new genre (Admin only)"""
     # Check if genre already exists
@@ -119,7 +172,9 @@ def create_genre(
     )
     
     db.add(new_genre)
+    catalog_cache.bump_version(db)
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(new_genre)
     
     return {"genre_id": new_genre.genre_id, "message": "Genre created successfully"}
@@ -138,7 +193,7 @@ def list_genres(db: Session = Depends(database.get_db)):
 def create_show(
     show: ShowCreate,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_shows"))
 ):
     """Create a new show (Admin only)"""
     # Verify genre exists
@@ -148,8 +203,11 @@ def create_show(
     
     new_show = models.Show(**show.dict())
     db.add(new_show)
+    catalog_cache.bump_version(db)
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(new_show)
+    show_search.reindex_show(db, new_show.show_id)
     
     return {"message": "Show created successfully", "show_id": new_show.show_id}
 
@@ -159,7 +217,7 @@ def update_show(
     show_id: int,
     show: ShowUpdate,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_shows"))
 ):
     """Update show details (Admin only)"""
     db_show = db.query(models.Show).filter(models.Show.show_id == show_id).first()
@@ -178,8 +236,11 @@ def update_show(
     for field, value in update_data.items():
         setattr(db_show, field, value)
     
+    catalog_cache.bump_version(db)
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(db_show)
+    show_search.reindex_show(db, show_id)
     
     return {"message": "Show updated successfully"}
 
@@ -188,7 +249,7 @@ def update_show(
 def delete_show(
     show_id: int,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_shows"))
 ):
     """Delete a show (Admin only)"""
     db_show = db.query(models.Show).filter(models.Show.show_id == show_id).first()
@@ -201,7 +262,10 @@ def delete_show(
         raise HTTPException(status_code=400, detail="Cannot delete show with existing performances. Set status to 'Inactive' instead.")
     
     db.delete(db_show)
+    catalog_cache.bump_version(db)
     db.commit()
+    catalog_cache.invalidate()
+    show_search.reindex_show(db, show_id)
     
     return {"message": "Show deleted successfully"}
 
@@ -212,12 +276,14 @@ def delete_show(
 def create_venue(
     venue: VenueCreate,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_venues"))
 ):
     """Create a new venue (Admin only)"""
     new_venue = models.Venue(**venue.dict())
     db.add(new_venue)
+    catalog_cache.bump_version(db)
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(new_venue)
     
     return {"message": "Venue created successfully", "venue_id": new_venue.venue_id}
@@ -228,7 +294,7 @@ def update_venue(
     venue_id: int,
     venue: VenueUpdate,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_venues"))
 ):
     """Update venue details (Admin only)"""
     db_venue = db.query(models.Venue).filter(models.Venue.venue_id == venue_id).first()
@@ -239,7 +305,9 @@ def update_venue(
     for field, value in update_data.items():
         setattr(db_venue, field, value)
     
+    catalog_cache.bump_version(db)
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(db_venue)
     
     return {"message": "Venue updated successfully"}
@@ -249,7 +317,7 @@ def update_venue(
 def delete_venue(
     venue_id: int,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_venues"))
 ):
     """Delete a venue (Admin only)"""
     db_venue = db.query(models.Venue).filter(models.Venue.venue_id == venue_id).first()
@@ -262,18 +330,201 @@ def delete_venue(
         raise HTTPException(status_code=400, detail="Cannot delete venue with existing performances")
     
     db.delete(db_venue)
+    catalog_cache.bump_version(db)
     db.commit()
+    catalog_cache.invalidate()
     
     return {"message": "Venue deleted successfully"}
 
 
+# ===== SEAT LAYOUT MANAGEMENT =====
+
+def _seat_selector_filters(venue_id: int, selector: SeatSelector) -> list:
+    """Translate a seat range selector into SQL filter clauses"""
+    filters = [models.Seat.venue_id == venue_id]
+    
+    if selector.section is not None:
+        filters.append(models.Seat.section == selector.section)
+    if selector.rows:
+        filters.append(models.Seat.row_number.in_(selector.rows))
+    if selector.seat_numbers:
+        filters.append(models.Seat.seat_number.in_(selector.seat_numbers))
+    if selector.seat_number_from is not None:
+        filters.append(cast(models.Seat.seat_number, Integer) >= selector.seat_number_from)
+    if selector.seat_number_to is not None:
+        filters.append(cast(models.Seat.seat_number, Integer) <= selector.seat_number_to)
+    if selector.seat_category is not None:
+        filters.append(models.Seat.seat_category == selector.seat_category)
+    if selector.seat_ids:
+        filters.append(models.Seat.seat_id.in_(selector.seat_ids))
+    
+    return filters
+
+
+@router.get("/venues/{venue_id}/seats")
+def list_venue_seats(
+    venue_id: int,
+    section: str | None = None,
+    seat_category: str | None = None,
+    include_inactive: bool = True,
+    db: Session = Depends(database.get_db),
+    admin: dict = Depends(permissions.require_permission("can_manage_venues"))
+):
+    """List a venue's seats with a section/category summary (Admin only)"""
+    venue = db.query(models.Venue).filter(models.Venue.venue_id == venue_id).first()
+    if not venue:
+        raise HTTPException(status_code=404, detail="Venue not found")
+    
+    query = db.query(models.Seat).filter(models.Seat.venue_id == venue_id)
+    if section is not None:
+        query = query.filter(models.Seat.section == section)
+    if seat_category is not None:
+        query = query.filter(models.Seat.seat_category == seat_category)
+    if not include_inactive:
+        query = query.filter(models.Seat.is_active == True)
+    
+    seats = query.order_by(models.Seat.seat_id).all()
+    
+    summary = {}
+    for seat in seats:
+        key = (seat.section, seat.seat_category)
+        entry = summary.setdefault(key, {"section": seat.section, "seat_category": seat.seat_category, "total": 0, "active": 0, "accessible": 0})
+        entry["total"] += 1
+        entry["active"] += 1 if seat.is_active else 0
+        entry["accessible"] += 1 if seat.is_accessible else 0
+    
+    return FastJSONResponse({
+        "venue_id": venue_id,
+        "layout_version": seat_layout.get_layout_version(db, venue_id),
+        "summary": list(summary.values()),
+        "seats": [
+            {
+                "seat_id": seat.seat_id,
+                "row_number": seat.row_number,
+                "seat_number": seat.seat_number,
+                "section": seat.section,
+                "seat_category": seat.seat_category,
+                "is_accessible": seat.is_accessible,
+                "is_active": seat.is_active
+            }
+            for seat in seats
+        ]
+    })
+
+
+@router.post("/venues/{venue_id}/seats/bulk-update")
+def bulk_update_seats(
+    venue_id: int,
+    bulk: SeatBulkUpdate,
+    request: Request,
+    db: Session = Depends(database.get_db),
+    admin: dict = Depends(permissions.require_permission("can_manage_venues"))
+):
+    """Apply one change set to a range of seats with a single UPDATE (Admin only)"""
+    venue = db.query(models.Venue).filter(models.Venue.venue_id == venue_id).first()
+    if not venue:
+        raise HTTPException(status_code=404, detail="Venue not found")
+    
+    if not bulk.selector.model_dump(exclude_none=True):
+        raise HTTPException(status_code=400, detail="Selector must narrow the seats (section, rows, numbers, category or ids)")
+    
+    changes = bulk.changes.model_dump(exclude_none=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="No changes given")
+    
+    filters = _seat_selector_filters(venue_id, bulk.selector)
+    matched = db.query(models.Seat).filter(*filters).count()
+    
+    # Seats held by pending/confirmed bookings for upcoming performances
+    booked_upcoming = db.query(models.BookingDetail.seat_id).join(
+        models.Booking, models.BookingDetail.booking_id == models.Booking.booking_id
+    ).join(
+        models.Performance, models.Booking.performance_id == models.Performance.performance_id
+    ).join(
+        models.Seat, models.BookingDetail.seat_id == models.Seat.seat_id
+    ).filter(
+        *filters,
+        models.Booking.booking_status.in_(["Pending", "Confirmed"]),
+        models.Performance.performance_date >= date.today()
+    ).distinct().count()
+    
+    if bulk.dry_run or matched == 0:
+        return {
+            "dry_run": bulk.dry_run,
+            "matched_seats": matched,
+            "booked_upcoming_seats": booked_upcoming,
+            "changes": changes,
+            "layout_version": seat_layout.get_layout_version(db, venue_id)
+        }
+    
+    seat_delta = 0
+    if "is_active" in changes:
+        if not changes["is_active"] and booked_upcoming:
+            raise HTTPException(
+                status_code=409,
+                detail=f"{booked_upcoming} selected seats are booked for upcoming performances; cancel those bookings first"
+            )
+        flipped = db.query(models.Seat).filter(*filters, models.Seat.is_active != changes["is_active"]).count()
+        seat_delta = flipped if changes["is_active"] else -flipped
+    
+    result = db.execute(
+        update(models.Seat).where(*filters).values(**changes).execution_options(synchronize_session=False)
+    )
+    if seat_delta:
+        # Upcoming performances gain or lose the seats (none of them is booked)
+        db.execute(
+            update(models.Performance).where(
+                models.Performance.venue_id == venue_id,
+                models.Performance.performance_status == "Scheduled",
+                models.Performance.performance_date >= date.today()
+            ).values(
+                total_seats=models.Performance.total_seats + seat_delta,
+                available_seats=models.Performance.available_seats + seat_delta
+            ).execution_options(synchronize_session=False)
+        )
+        catalog_cache.bump_version(db)
+    new_version = seat_layout.bump_layout_version(db, venue_id)
+    db.commit()
+    seat_layout.invalidate(venue_id)
+    if seat_delta:
+        catalog_cache.invalidate()
+    
+    # Audit log
+    log_audit_action(
+        db=db,
+        user_id=admin.get("user_id"),
+        action="BULK_UPDATE_SEATS",
+        entity_type="Venue",
+        entity_id=venue_id,
+        new_values={
+            "selector": bulk.selector.model_dump(exclude_none=True),
+            "changes": changes,
+            "updated_seats": result.rowcount,
+            "performance_seat_change": seat_delta,
+            "layout_version": new_version
+        },
+        ip_address=request.client.host if request.client else None
+    )
+    
+    return {
+        "dry_run": False,
+        "message": f"{result.rowcount} seats updated successfully",
+        "matched_seats": matched,
+        "updated_seats": result.rowcount,
+        "booked_upcoming_seats": booked_upcoming,
+        "performance_seat_change": seat_delta,
+        "changes": changes,
+        "layout_version": new_version
+    }
+
+
 # ===== PERFORMANCE MANAGEMENT =====
 
 @router.post("/performances", status_code=status.HTTP_201_CREATED)
 def create_performance(
     performance: PerformanceCreate,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_performances"))
 ):
     """Create a new performance (Admin only)"""
     # Verify show exists
@@ -288,7 +539,9 @@ def create_performance(
     
     new_performance = models.Performance(**performance.dict())
     db.add(new_performance)
+    catalog_cache.bump_version(db)
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(new_performance)
     
     return {"message": "Performance created successfully", "performance_id": new_performance.performance_id}
@@ -299,7 +552,7 @@ def update_performance(
     performance_id: int,
     performance: PerformanceUpdate,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_performances"))
 ):
     """Update performance details (Admin only)"""
     db_performance = db.query(models.Performance).filter(models.Performance.performance_id == performance_id).first()
@@ -323,7 +576,9 @@ def update_performance(
     for field, value in update_data.items():
         setattr(db_performance, field, value)
     
+    catalog_cache.bump_version(db)
     db.commit()
+    catalog_cache.invalidate()
     db.refresh(db_performance)
     
     return {"message": "Performance updated successfully"}
@@ -333,7 +588,7 @@ def update_performance(
 def delete_performance(
     performance_id: int,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_performances"))
 ):
     """Delete a performance (Admin only)"""
     db_performance = db.query(models.Performance).filter(models.Performance.performance_id == performance_id).first()
@@ -346,7 +601,9 @@ def delete_performance(
         raise HTTPException(status_code=400, detail="Cannot delete performance with existing bookings. Set status to 'Cancelled' instead.")
     
     db.delete(db_performance)
+    catalog_cache.bump_version(db)
     db.commit()
+    catalog_cache.invalidate()
     
     return {"message": "Performance deleted successfully"}
 
@@ -357,7 +614,7 @@ def delete_performance(
 def create_performance_pricing(
     pricing: PerformancePricingCreate,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_pricing"))
 ):
     """Create pricing for a performance seat category (Admin only)"""
     # Verify performance exists
@@ -380,6 +637,8 @@ def create_performance_pricing(
     db.add(new_pricing)
     db.commit()
     db.refresh(new_pricing)
+    pricing_engine.invalidate(pricing.performance_id)
+    show_bootstrap.invalidate(performance.show_id)
     
     return {"message": "Performance pricing created successfully", "pricing_id": new_pricing.pricing_id}
 
@@ -389,7 +648,7 @@ def update_performance_pricing(
     pricing_id: int,
     pricing: PerformancePricingUpdate,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_pricing"))
 ):
     """Update performance pricing (Admin only)"""
     db_pricing = db.query(models.PerformancePricing).filter(
@@ -401,6 +660,8 @@ def update_performance_pricing(
     
     db_pricing.price = pricing.price
     db.commit()
+    pricing_engine.invalidate(db_pricing.performance_id)
+    show_bootstrap.invalidate_performance(db_pricing.performance_id)
     
     return {"message": "Pricing updated successfully"}
 
@@ -409,7 +670,7 @@ def update_performance_pricing(
 def delete_performance_pricing(
     pricing_id: int,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_pricing"))
 ):
     """Delete performance pricing (Admin only)"""
     db_pricing = db.query(models.PerformancePricing).filter(
@@ -419,8 +680,11 @@ def delete_performance_pricing(
     if not db_pricing:
         raise HTTPException(status_code=404, detail="Pricing not found")
     
+    performance_id = db_pricing.performance_id
     db.delete(db_pricing)
     db.commit()
+    pricing_engine.invalidate(performance_id)
+    show_bootstrap.invalidate_performance(performance_id)
     
     return {"message": "Pricing deleted successfully"}
 
@@ -429,29 +693,350 @@ def delete_performance_pricing(
 def get_performance_pricing(
     performance_id: int,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_pricing"))
 ):
     """Get all pricing for a performance (Admin only)"""
     pricing = db.query(models.PerformancePricing).filter(
         models.PerformancePricing.performance_id == performance_id
     ).all()
+    live_prices = pricing_engine.get_prices(performance_id) or {}
     
     return [
         {
             "pricing_id": p.pricing_id,
             "seat_category": p.seat_category,
-            "price": float(p.price)
+            "price": float(p.price),
+            "live_price": float(live_prices[p.seat_category]) if p.seat_category in live_prices else None
         }
         for p in pricing
     ]
 
 
+# ===== DYNAMIC PRICING =====
+
+def _pricing_rule_dict(rule: models.PricingRule) -> dict:
+    return {
+        "rule_id": rule.rule_id,
+        "show_id": rule.show_id,
+        "seat_category": rule.seat_category,
+        "floor_price": float(rule.floor_price),
+        "ceiling_price": float(rule.ceiling_price),
+        "is_active": rule.is_active
+    }
+
+
+def _validate_pricing_rule(rule: PricingRuleCreate, db: Session):
+    if rule.floor_price < 0 or rule.ceiling_price < rule.floor_price:
+        raise HTTPException(status_code=400, detail="Require 0 <= floor_price <= ceiling_price")
+    
+    if rule.show_id is not None:
+        show = db.query(models.Show).filter(models.Show.show_id == rule.show_id).first()
+        if not show:
+            raise HTTPException(status_code=404, detail="Show not found")
+
+
+@router.get("/pricing-rules")
+def list_pricing_rules(
+    db: Session = Depends(database.get_db),
+    admin: dict = Depends(permissions.require_permission("can_manage_pricing"))
+):
+    """List dynamic pricing floor/ceiling rules (Admin only)"""
+    rules = db.query(models.PricingRule).all()
+    return [_pricing_rule_dict(r) for r in rules]
+
+
+@router.post("/pricing-rules", status_code=status.HTTP_201_CREATED)
+def create_pricing_rule(
+    rule: PricingRuleCreate,
+    db: Session = Depends(database.get_db),
+    admin: dict = Depends(permissions.require_permission("can_manage_pricing"))
+):
+    """Create a dynamic pricing rule; applies from the next recompute (Admin only)"""
+    _validate_pricing_rule(rule, db)
+    
+    existing = db.query(models.PricingRule).filter(
+        models.PricingRule.show_id == rule.show_id,
+        models.PricingRule.seat_category == rule.seat_category
+    ).first()
+    if existing:
+        raise HTTPException(status_code=400, detail="A rule for this show and category already exists. Use update endpoint.")
+    
+    new_rule = models.PricingRule(**rule.model_dump())
+    db.add(new_rule)
+    db.commit()
+    db.refresh(new_rule)
+    
+    return {"message": "Pricing rule created successfully", "rule_id": new_rule.rule_id}
+
+
+@router.put("/pricing-rules/{rule_id}")
+def update_pricing_rule(
+    rule_id: int,
+    rule: PricingRuleCreate,
+    db: Session = Depends(database.get_db),
+    admin: dict = Depends(permissions.require_permission("can_manage_pricing"))
+):
+    """Update a dynamic pricing rule (Admin only)"""
+    db_rule = db.query(models.PricingRule).filter(models.PricingRule.rule_id == rule_id).first()
+    if not db_rule:
+        raise HTTPException(status_code=404, detail="Pricing rule not found")
+    
+    _validate_pricing_rule(rule, db)
+    
+    for key, value in rule.model_dump().items():
+        setattr(db_rule, key, value)
+    
+    db.commit()
+    
+    return {"message": "Pricing rule updated successfully"}
+
+
+@router.delete("/pricing-rules/{rule_id}")
+def delete_pricing_rule(
+    rule_id: int,
+    db: Session = Depends(database.get_db),
+    admin: dict = Depends(permissions.require_permission("can_manage_pricing"))
+):
+    """Delete a dynamic pricing rule (Admin only)"""
+    db_rule = db.query(models.PricingRule).filter(models.PricingRule.rule_id == rule_id).first()
+    if not db_rule:
+        raise HTTPException(status_code=404, detail="Pricing rule not found")
+    
+    db.delete(db_rule)
+    db.commit()
+    
+    return {"message": "Pricing rule deleted successfully"}
+
+
+@router.get("/pricing/engine")
+def get_pricing_engine_status(admin: dict = Depends(permissions.require_permission("can_manage_pricing"))):
+    """Get dynamic pricing engine status (Admin only)"""
+    return pricing_engine.status()
+
+
+@router.post("/pricing/recompute")
+def recompute_dynamic_pricing(
+    db: Session = Depends(database.get_db),
+    admin: dict = Depends(permissions.require_permission("can_manage_pricing"))
+):
+    """Recompute live prices in every worker now instead of waiting for the next cycle (Admin only)"""
+    if not pricing_engine.DYNAMIC_PRICING_ENABLED:
+        raise HTTPException(status_code=409, detail="Dynamic pricing is disabled")
+    pricing_engine.request_recompute(db)
+    db.commit()
+    count = pricing_engine.recompute(db)
+    return {
+        "message": "Dynamic prices recomputed; other workers follow within "
+                   f"{pricing_engine.PRICING_VERSION_CHECK_SECONDS:g} seconds",
+        "performances_priced": count
+    }
+
+
+@router.post("/pricing/counters/rebuild")
+def rebuild_sales_counters(
+    db: Session = Depends(database.get_db),
+    admin: dict = Depends(permissions.require_permission("can_manage_pricing"))
+):
+    """Backfill sales counters from existing bookings (Admin only, one-off)"""
+    count = pricing_engine.rebuild_counters(db)
+    return {"message": "Sales counters rebuilt", "counters": count}
+
+
+# ===== SEASON SCHEDULING =====
+
+@router.post("/performances/schedule")
+def schedule_season(
+    season: SeasonScheduleRequest,
+    request: Request,
+    db: Session = Depends(database.get_db),
+    admin: dict = Depends(permissions.require_permission("can_manage_performances"))
+):
+    """Bulk create a run of performances and their pricing from a weekly recurrence rule (Admin only)"""
+    if season.end_date < season.start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    
+    if not season.slots:
+        raise HTTPException(status_code=400, detail="At least one weekly slot is required")
+    
+    if season.interval_weeks < 1:
+        raise HTTPException(status_code=400, detail="interval_weeks must be at least 1")
+    
+    if any(slot.weekday < 0 or slot.weekday > 6 for slot in season.slots):
+        raise HTTPException(status_code=400, detail="weekday must be between 0 (Monday) and 6 (Sunday)")
+    
+    if any(price < 0 for price in season.prices.values()):
+        raise HTTPException(status_code=400, detail="Prices cannot be negative")
+    
+    show = db.query(models.Show).filter(models.Show.show_id == season.show_id).first()
+    if not show:
+        raise HTTPException(status_code=404, detail="Show not found")
+    
+    venue = db.query(models.Venue).filter(models.Venue.venue_id == season.venue_id).first()
+    if not venue:
+        raise HTTPException(status_code=404, detail="Venue not found")
+    
+    slots = scheduling.expand_recurrence(
+        start_date=season.start_date,
+        end_date=season.end_date,
+        slots=[slot.model_dump() for slot in season.slots],
+        duration_minutes=show.duration_minutes,
+        interval_weeks=season.interval_weeks,
+        exclude_dates=season.exclude_dates
+    )
+    
+    if not slots:
+        raise HTTPException(status_code=400, detail="Recurrence rule produces no performances")
+    
+    if len(slots) > scheduling.MAX_SEASON_PERFORMANCES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Recurrence rule produces {len(slots)} performances (limit {scheduling.MAX_SEASON_PERFORMANCES})"
+        )
+    
+    conflicts = scheduling.find_venue_conflicts(db, season.venue_id, slots)
+    
+    # Seat count and categories come from the venue's active seat layout
+    category_counts = db.query(
+        models.Seat.seat_category,
+        func.count(models.Seat.seat_id)
+    ).filter(
+        models.Seat.venue_id == season.venue_id,
+        models.Seat.is_active == True
+    ).group_by(models.Seat.seat_category).all()
+    
+    active_seats = sum(count for _, count in category_counts)
+    total_seats = season.total_seats or active_seats or venue.total_capacity
+    unpriced_categories = sorted(
+        category for category, _ in category_counts if category not in season.prices
+    )
+    
+    preview = {
+        "show_id": season.show_id,
+        "venue_id": season.venue_id,
+        "performance_count": len(slots),
+        "pricing_count": len(slots) * len(season.prices),
+        "total_seats": total_seats,
+        "unpriced_categories": unpriced_categories,
+        "conflicts": conflicts,
+        "performances": [
+            {
+                "performance_date": str(slot["performance_date"]),
+                "start_time": str(slot["start_time"]),
+                "end_time": str(slot["end_time"])
+            }
+            for slot in slots
+        ]
+    }
+    
+    if season.dry_run:
+        return {"dry_run": True, **preview}
+    
+    if conflicts:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Schedule conflicts with existing performances", "conflicts": conflicts}
+        )
+    
+    try:
+        performance_ids = scheduling.bulk_create_season(
+            db,
+            show_id=season.show_id,
+            venue_id=season.venue_id,
+            slots=slots,
+            prices=season.prices,
+            total_seats=total_seats,
+            special_notes=season.special_notes
+        )
+        catalog_cache.bump_version(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    catalog_cache.invalidate()
+    
+    # Audit log
+    log_audit_action(
+        db=db,
+        user_id=admin.get("user_id"),
+        action="SCHEDULE_SEASON",
+        entity_type="Show",
+        entity_id=season.show_id,
+        new_values={
+            "venue_id": season.venue_id,
+            "start_date": str(season.start_date),
+            "end_date": str(season.end_date),
+            "performance_count": len(performance_ids),
+            "prices": season.prices
+        },
+        ip_address=request.client.host if request.client else None
+    )
+    
+    return {
+        "dry_run": False,
+        "message": f"{len(performance_ids)} performances scheduled successfully",
+        "performance_ids": performance_ids,
+        **preview
+    }
+
+
+# ===== BULK CSV IMPORT =====
+
+IMPORT_PERMISSIONS = {
+    "venues": "can_manage_venues",
+    "seats": "can_manage_venues",
+    "shows": "can_manage_shows",
+    "performances": "can_manage_performances",
+}
+
+
+@router.post("/import/{entity}")
+def import_csv_file(
+    entity: str,
+    request: Request,
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    db: Session = Depends(database.get_db),
+    admin: dict = Depends(permissions.get_current_permissions)
+):
+    """Bulk import venues, seats, shows or performances from a CSV upload (Admin only)"""
+    if entity not in csv_import.IMPORTERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown import type. Must be one of: {', '.join(csv_import.IMPORTERS)}"
+        )
+    
+    permissions.ensure(admin, IMPORT_PERMISSIONS[entity])
+    
+    # Decode the spooled upload incrementally instead of reading it into memory
+    stream = codecs.getreader("utf-8-sig")(file.file)
+    try:
+        report = csv_import.import_csv(db, entity, stream, dry_run=dry_run)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV file must be UTF-8 encoded")
+    
+    if not dry_run and report["rows_inserted"]:
+        log_audit_action(
+            db=db,
+            user_id=admin.get("user_id"),
+            action="BULK_IMPORT",
+            entity_type=entity,
+            new_values={
+                "filename": file.filename,
+                "rows_inserted": report["rows_inserted"],
+                "error_count": report["error_count"]
+            },
+            ip_address=request.client.host if request.client else None
+        )
+    
+    return report
+
+
 # ===== STATS & OVERVIEW =====
 
 @router.get("/stats")
 def get_admin_stats(
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_view_analytics"))
 ):
     """Get admin dashboard statistics"""
     total_shows = db.query(models.Show).count()
@@ -488,6 +1073,15 @@ def get_admin_stats(
 # RBAC - ROLE MANAGEMENT
 # =============================================
 
+@router.get("/permissions")
+def get_my_permissions(admin: dict = Depends(permissions.get_current_permissions)):
+    """Get the calling user's effective permissions"""
+    return {
+        "user_id": admin.get("user_id"),
+        "permissions": sorted(admin["permissions"])
+    }
+
+
 class RoleCreate(BaseModel):
     role_name: str
     description: str | None = None
@@ -521,7 +1115,7 @@ class RoleResponse(BaseModel):
 @router.get("/roles")
 def list_roles(
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_users"))
 ):
     """List all roles (Admin only)"""
     roles = db.query(models.Role).all()
@@ -549,7 +1143,7 @@ def create_role(
     role: RoleCreate,
     request: Request,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_users"))
 ):
     """Create a new role (Admin only)"""
     existing = db.query(models.Role).filter(models.Role.role_name == role.role_name).first()
@@ -560,6 +1154,7 @@ def create_role(
     db.add(new_role)
     db.commit()
     db.refresh(new_role)
+    permissions.invalidate_roles()
     
     # Audit log
     log_audit_action(
@@ -581,7 +1176,7 @@ def update_role(
     role: RoleCreate,
     request: Request,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_users"))
 ):
     """Update a role (Admin only)"""
     db_role = db.query(models.Role).filter(models.Role.role_id == role_id).first()
@@ -595,6 +1190,7 @@ def update_role(
     
     db.commit()
     db.refresh(db_role)
+    permissions.invalidate_roles()
     
     # Audit log
     log_audit_action(
@@ -616,7 +1212,7 @@ def delete_role(
     role_id: int,
     request: Request,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_users"))
 ):
     """Delete a role (Admin only) - only if no users assigned"""
     db_role = db.query(models.Role).filter(models.Role.role_id == role_id).first()
@@ -633,6 +1229,7 @@ def delete_role(
     role_name = db_role.role_name
     db.delete(db_role)
     db.commit()
+    permissions.invalidate_roles()
     
     # Audit log
     log_audit_action(
@@ -666,7 +1263,7 @@ def list_users(
     limit: int = 50,
     offset: int = 0,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_users"))
 ):
     """List all users with filtering options (Admin only)"""
     query = db.query(models.User)
@@ -708,14 +1305,14 @@ def list_users(
             "booking_count": booking_count
         })
     
-    return {"users": result, "total": total}
+    return FastJSONResponse({"users": result, "total": total})
 
 
 @router.get("/users/{user_id}")
 def get_user(
     user_id: int,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_users"))
 ):
     """Get a specific user's details (Admin only)"""
     user = db.query(models.User).filter(models.User.user_id == user_id).first()
@@ -765,7 +1362,7 @@ def update_user_admin(
     update: UserUpdateAdmin,
     request: Request,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_users"))
 ):
     """Update a user's admin status, role, or account status (Admin only)"""
     user = db.query(models.User).filter(models.User.user_id == user_id).first()
@@ -798,6 +1395,7 @@ def update_user_admin(
     
     db.commit()
     db.refresh(user)
+    permissions.invalidate_user(user_id)
     
     # Audit log
     log_audit_action(
@@ -825,7 +1423,7 @@ def list_all_bookings(
     limit: int = 50,
     offset: int = 0,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_bookings"))
 ):
     """List all bookings with filtering (Admin only)"""
     query = db.query(models.Booking).join(models.User).join(models.Performance).join(models.Show)
@@ -868,7 +1466,7 @@ def list_all_bookings(
             "seat_count": seat_count
         })
     
-    return {"bookings": result, "total": total}
+    return FastJSONResponse({"bookings": result, "total": total})
 
 
 class AdminCancelRequest(BaseModel):
@@ -881,7 +1479,7 @@ def admin_cancel_booking(
     cancel: AdminCancelRequest,
     request: Request,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_bookings"))
 ):
     """Cancel a booking (Admin only)"""
     booking = db.query(models.Booking).filter(models.Booking.booking_id == booking_id).first()
@@ -902,8 +1500,11 @@ def admin_cancel_booking(
     
     performance = booking.performance
     performance.available_seats += seat_count
+    pricing_engine.release_booking(db, booking_id, booking.performance_id)
     
     db.commit()
+    show_bootstrap.invalidate(performance.show_id)
+    performance_calendar.update_availability(performance.performance_id, performance.available_seats)
     
     # Audit log
     log_audit_action(
@@ -931,7 +1532,7 @@ def admin_issue_refund(
     refund: RefundRequest,
     request: Request,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_issue_refunds"))
 ):
     """Issue a refund for a booking (Admin only)"""
     booking = db.query(models.Booking).filter(models.Booking.booking_id == booking_id).first()
@@ -964,6 +1565,7 @@ def admin_issue_refund(
     payment.refund_transaction_id = f"REF-{booking.booking_reference}"
     
     db.commit()
+    metrics.inc("theatre_refunds_total", source="admin")
     
     # Audit log
     log_audit_action(
@@ -1028,7 +1630,7 @@ def list_audit_logs(
     limit: int = 100,
     offset: int = 0,
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_users"))
 ):
     """List audit logs with filtering (Admin only)"""
     query = db.query(models.AuditLog).join(models.User)
@@ -1061,13 +1663,13 @@ def list_audit_logs(
             "timestamp": str(log.timestamp)
         })
     
-    return {"logs": result, "total": total}
+    return FastJSONResponse({"logs": result, "total": total})
 
 
 @router.get("/audit-logs/actions")
 def list_audit_actions(
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_users"))
 ):
     """Get list of unique audit actions for filtering"""
     actions = db.query(models.AuditLog.action).distinct().all()
@@ -1077,8 +1679,43 @@ def list_audit_actions(
 @router.get("/audit-logs/entity-types")
 def list_entity_types(
     db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    admin: dict = Depends(permissions.require_permission("can_manage_users"))
 ):
     """Get list of unique entity types for filtering"""
     types = db.query(models.AuditLog.entity_type).distinct().all()
     return [t[0] for t in types]
+
+
+# =============================================
+# SQL DEBUG (opt-in via SQL_DEBUG_ENDPOINT_ENABLED)
+# =============================================
+
+def _require_sql_debug():
+    if not sql_instrumentation.SQL_DEBUG_ENDPOINT_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.get("/debug/sql")
+def get_sql_debug_report(
+    limit: int = 20,
+    sort: str = "statements",
+    admin: dict = Depends(permissions.require_permission("can_view_analytics"))
+):
+    """Top routes by queries per request, DB time or suspected N+1 queries"""
+    _require_sql_debug()
+    if sort not in ("statements", "db_time", "n_plus_one"):
+        raise HTTPException(status_code=400, detail="sort must be statements, db_time or n_plus_one")
+    return {
+        "n_plus_one_threshold": sql_instrumentation.N_PLUS_ONE_THRESHOLD,
+        "routes": sql_instrumentation.top_routes(limit=limit, sort=sort)
+    }
+
+
+@router.delete("/debug/sql")
+def reset_sql_debug_report(
+    admin: dict = Depends(permissions.require_permission("can_view_analytics"))
+):
+    """Clear the per-route SQL statistics"""
+    _require_sql_debug()
+    sql_instrumentation.reset()
+    return {"message": "SQL statistics cleared"}
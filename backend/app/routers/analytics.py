@@ -3,15 +3,15 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 from datetime import date, datetime, timedelta
 from typing import List
-from app import models, database, auth
+from app import models, database, permissions, executors
 
-router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
+router = APIRouter(prefix="/api/analytics", tags=["Analytics"], route_class=executors.pooled_route())
 
 
 @router.get("/dashboard")
 def get_dashboard_analytics(
-    db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    db: Session = Depends(database.get_read_db),
+    admin: dict = Depends(permissions.require_permission("can_view_analytics"))
 ):
     """Get comprehensive dashboard analytics (Admin only)"""
     
@@ -95,8 +95,8 @@ def get_dashboard_analytics(
 @router.get("/popular-shows")
 def get_popular_shows(
     limit: int = 10,
-    db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    db: Session = Depends(database.get_read_db),
+    admin: dict = Depends(permissions.require_permission("can_view_analytics"))
 ):
     """Get most popular shows by booking count (Admin only)"""
     
@@ -130,8 +130,8 @@ def get_popular_shows(
 
 @router.get("/revenue-by-performance")
 def get_revenue_by_performance(
-    db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    db: Session = Depends(database.get_read_db),
+    admin: dict = Depends(permissions.require_permission("can_view_analytics"))
 ):
     """Get revenue breakdown by performance (Admin only)"""
     
@@ -177,8 +177,8 @@ def get_revenue_by_performance(
 
 @router.get("/venue-utilization")
 def get_venue_utilization(
-    db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    db: Session = Depends(database.get_read_db),
+    admin: dict = Depends(permissions.require_permission("can_view_analytics"))
 ):
     """Get venue utilization statistics (Admin only)"""
     
@@ -212,8 +212,8 @@ def get_venue_utilization(
 @router.get("/booking-trends")
 def get_booking_trends(
     days: int = 30,
-    db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    db: Session = Depends(database.get_read_db),
+    admin: dict = Depends(permissions.require_permission("can_view_analytics"))
 ):
     """Get booking trends over time (Admin only)"""
     
@@ -243,8 +243,8 @@ def get_booking_trends(
 
 @router.get("/payment-methods")
 def get_payment_method_stats(
-    db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    db: Session = Depends(database.get_read_db),
+    admin: dict = Depends(permissions.require_permission("can_view_analytics"))
 ):
     """Get payment method distribution (Admin only)"""
     
@@ -270,8 +270,8 @@ def get_payment_method_stats(
 
 @router.get("/genre-performance")
 def get_genre_performance(
-    db: Session = Depends(database.get_db),
-    admin: dict = Depends(auth.verify_admin)
+    db: Session = Depends(database.get_read_db),
+    admin: dict = Depends(permissions.require_permission("can_view_analytics"))
 ):
     """Get performance metrics by genre (Admin only)"""
     
@@ -1,16 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List
 from decimal import Decimal
-from app import models, schemas, database, utils, ticket_utils
+from app import models, schemas, database, utils, ticket_utils, pricing_engine, seat_layout, metrics, show_bootstrap, performance_calendar, executors
 
-router = APIRouter(prefix="/api/bookings", tags=["Bookings"])
+router = APIRouter(prefix="/api/bookings", tags=["Bookings"], route_class=executors.pooled_route())
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 def create_booking(
     booking_data: schemas.BookingCreate,
-    db: Session = Depends(database.get_db)
+    response: Response,
+    db: Session = Depends(database.get_write_db)
 ):
     """Create a new booking with selected seats"""
     # Validate performance exists
@@ -38,26 +41,34 @@ def create_booking(
     total = Decimal('0.00')
     seat_details = []
     
+    # Active seats of this performance's venue (cached until the layout changes)
+    layout = seat_layout.get_venue_layout(db, performance.venue_id)
+    
     for seat_id in booking_data.seat_ids:
-        seat = db.query(models.Seat).filter(models.Seat.seat_id == seat_id).first()
+        seat = layout.by_id.get(seat_id)
         if not seat:
             raise HTTPException(status_code=404, detail=f"Seat {seat_id} not found")
         
-        price_obj = db.query(models.PerformancePricing).filter(
-            models.PerformancePricing.performance_id == booking_data.performance_id,
-            models.PerformancePricing.seat_category == seat.seat_category
-        ).first()
-        
-        if not price_obj:
-            raise HTTPException(status_code=404, detail=f"Pricing not found for {seat.seat_category}")
+        # Live dynamic price if the pricing engine has one, else the base price
+        price = pricing_engine.get_price(booking_data.performance_id, seat["category"])
+        if price is None:
+            price_obj = db.query(models.PerformancePricing).filter(
+                models.PerformancePricing.performance_id == booking_data.performance_id,
+                models.PerformancePricing.seat_category == seat["category"]
+            ).first()
+            
+            if not price_obj:
+                raise HTTPException(status_code=404, detail=f"Pricing not found for {seat['category']}")
+            
+            price = price_obj.price
         
-        total += price_obj.price
+        total += price
         seat_details.append({
             "seat_id": seat_id,
-            "price": price_obj.price,
-            "row": seat.row_number,
-            "number": seat.seat_number,
-            "category": seat.seat_category
+            "price": price,
+            "row": seat["row"],
+            "number": seat["number"],
+            "category": seat["category"]
         })
     
     # Create booking
@@ -87,7 +98,17 @@ def create_booking(
     # Update available seats
     performance.available_seats -= len(booking_data.seat_ids)
     
+    # Update per-category sales counters used by the pricing engine
+    category_counts = {}
+    for detail in seat_details:
+        category_counts[detail["category"]] = category_counts.get(detail["category"], 0) + 1
+    pricing_engine.record_sale(db, booking_data.performance_id, category_counts)
+    
     db.commit()
+    database.mark_read_your_writes(response)
+    metrics.inc("theatre_bookings_total", event="created")
+    show_bootstrap.invalidate(performance.show_id)
+    performance_calendar.update_availability(performance.performance_id, performance.available_seats)
     db.refresh(new_booking)
     
     # Get full booking details for confirmation
@@ -122,12 +143,20 @@ def create_booking(
     }
 
 
+# Everything BookingResponse serializes, loaded up front for async sessions
+BOOKING_RESPONSE_OPTIONS = (
+    selectinload(models.Booking.booking_details),
+    selectinload(models.Booking.performance).selectinload(models.Performance.show).selectinload(models.Show.genre),
+    selectinload(models.Booking.performance).selectinload(models.Performance.venue),
+)
+
+
 @router.get("/{booking_id}", response_model=schemas.BookingResponse)
-def get_booking_detail(booking_id: int, db: Session = Depends(database.get_db)):
+async def get_booking_detail(booking_id: int, db: AsyncSession = Depends(database.get_async_db)):
     """Get booking details"""
-    booking = db.query(models.Booking).filter(
+    booking = (await db.execute(select(models.Booking).options(*BOOKING_RESPONSE_OPTIONS).filter(
         models.Booking.booking_id == booking_id
-    ).first()
+    ))).scalars().first()
     
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
@@ -136,27 +165,24 @@ def get_booking_detail(booking_id: int, db: Session = Depends(database.get_db)):
 
 
 @router.get("/reference/{reference}")
-def get_booking_by_reference(reference: str, db: Session = Depends(database.get_db)):
+async def get_booking_by_reference(reference: str, db: AsyncSession = Depends(database.get_async_read_db)):
     """Get booking details by booking reference"""
-    booking = db.query(models.Booking).filter(
+    # Booking, its seats, performance, show and venue in two round trips
+    booking = (await db.execute(select(models.Booking).options(
+        selectinload(models.Booking.booking_details),
+        joinedload(models.Booking.performance).joinedload(models.Performance.show),
+        joinedload(models.Booking.performance).joinedload(models.Performance.venue)
+    ).filter(
         models.Booking.booking_reference == reference
-    ).first()
+    ))).scalars().first()
     
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
     # Get performance and show details
-    performance = db.query(models.Performance).filter(
-        models.Performance.performance_id == booking.performance_id
-    ).first()
-    
-    show = db.query(models.Show).filter(
-        models.Show.show_id == performance.show_id
-    ).first() if performance else None
-    
-    venue = db.query(models.Venue).filter(
-        models.Venue.venue_id == performance.venue_id
-    ).first() if performance else None
+    performance = booking.performance
+    show = performance.show if performance else None
+    venue = performance.venue if performance else None
     
     # Get booking details (seats)
     seats = []
@@ -184,17 +210,17 @@ def get_booking_by_reference(reference: str, db: Session = Depends(database.get_
 
 
 @router.get("/user/{user_id}", response_model=List[schemas.BookingResponse])
-def get_user_bookings(user_id: int, db: Session = Depends(database.get_db)):
+async def get_user_bookings(user_id: int, db: AsyncSession = Depends(database.get_async_read_db)):
     """Get all bookings for a specific user"""
-    bookings = db.query(models.Booking).filter(
+    bookings = (await db.execute(select(models.Booking).options(*BOOKING_RESPONSE_OPTIONS).filter(
         models.Booking.user_id == user_id
-    ).order_by(models.Booking.booking_date.desc()).all()
+    ).order_by(models.Booking.booking_date.desc()))).scalars().all()
     
     return bookings
 
 
 @router.delete("/{booking_id}")
-def cancel_booking(booking_id: int, db: Session = Depends(database.get_db)):
+def cancel_booking(booking_id: int, response: Response, db: Session = Depends(database.get_write_db)):
     """Cancel a booking"""
     booking = db.query(models.Booking).filter(
         models.Booking.booking_id == booking_id
@@ -219,13 +245,19 @@ def cancel_booking(booking_id: int, db: Session = Depends(database.get_db)):
     ).count()
     
     performance.available_seats += seat_count
+    pricing_engine.release_booking(db, booking_id, booking.performance_id)
     
     db.commit()
+    database.mark_read_your_writes(response)
+    metrics.inc("theatre_bookings_total", event="cancelled")
+    show_bootstrap.invalidate(performance.show_id)
+    performance_calendar.update_availability(performance.performance_id, performance.available_seats)
     
     return {"message": "Booking cancelled successfully"}
 
 
 @router.get("/{booking_id}/ticket")
+@executors.use_pool("render")
 def get_ticket(booking_id: int, db: Session = Depends(database.get_db)):
     """
     Get booking ticket with QR code
@@ -333,7 +365,8 @@ def send_confirmation_email(booking_id: int, db: Session = Depends(database.get_
 def request_refund(
     booking_id: int,
     refund_data: dict,
-    db: Session = Depends(database.get_db)
+    response: Response,
+    db: Session = Depends(database.get_write_db)
 ):
     """
     Request a refund for a confirmed booking
@@ -384,6 +417,7 @@ def request_refund(
     ).all()
     
     performance.available_seats += len(booking_details)
+    pricing_engine.release_booking(db, booking_id, booking.performance_id)
     
     # Update payment status to Refunded if exists
     payment = db.query(models.Payment).filter(
@@ -395,6 +429,10 @@ def request_refund(
         payment.payment_status = "Refunded"
     
     db.commit()
+    database.mark_read_your_writes(response)
+    metrics.inc("theatre_refunds_total", source="customer")
+    show_bootstrap.invalidate(performance.show_id)
+    performance_calendar.update_availability(performance.performance_id, performance.available_seats)
     
     # Get user for email notification
     user = db.query(models.User).filter(
@@ -1,16 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Dict
-from app import models, schemas, database, utils, ticket_utils
+from app import models, schemas, database, utils, ticket_utils, pricing_engine, metrics, show_bootstrap, performance_calendar, executors
 
-router = APIRouter(prefix="/api/payments", tags=["Payments"])
+router = APIRouter(prefix="/api/payments", tags=["Payments"], route_class=executors.pooled_route())
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 def process_payment(
     payment_data: schemas.PaymentCreate,
-    db: Session = Depends(database.get_db)
+    response: Response,
+    db: Session = Depends(database.get_write_db)
 ):
     """Process payment for a booking"""
     # Validate booking exists
@@ -103,6 +106,8 @@ def process_payment(
         )
     
     db.commit()
+    database.mark_read_your_writes(response)
+    metrics.inc("theatre_payments_total", outcome="completed" if payment_success else "failed")
     db.refresh(new_payment)
     
     if not payment_success:
@@ -125,11 +130,11 @@ def process_payment(
 
 
 @router.get("/{payment_id}", response_model=schemas.PaymentResponse)
-def get_payment_detail(payment_id: int, db: Session = Depends(database.get_db)):
+async def get_payment_detail(payment_id: int, db: AsyncSession = Depends(database.get_async_db)):
     """Get payment details"""
-    payment = db.query(models.Payment).filter(
+    payment = (await db.execute(select(models.Payment).filter(
         models.Payment.payment_id == payment_id
-    ).first()
+    ))).scalars().first()
     
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
@@ -138,12 +143,12 @@ def get_payment_detail(payment_id: int, db: Session = Depends(database.get_db)):
 
 
 @router.get("/booking/{booking_id}", response_model=schemas.PaymentResponse)
-def get_payment_by_booking(booking_id: int, db: Session = Depends(database.get_db)):
+async def get_payment_by_booking(booking_id: int, db: AsyncSession = Depends(database.get_async_db)):
     """Get payment for a specific booking"""
-    payment = db.query(models.Payment).filter(
+    payment = (await db.execute(select(models.Payment).filter(
         models.Payment.booking_id == booking_id,
         models.Payment.payment_status == "Completed"
-    ).first()
+    ))).scalars().first()
     
     if not payment:
         raise HTTPException(status_code=404, detail="No completed payment found for this booking")
@@ -152,11 +157,11 @@ def get_payment_by_booking(booking_id: int, db: Session = Depends(database.get_d
 
 
 @router.get("/booking/{booking_id}/history")
-def get_payment_history(booking_id: int, db: Session = Depends(database.get_db)):
+async def get_payment_history(booking_id: int, db: AsyncSession = Depends(database.get_async_read_db)):
     """Get all payment attempts for a booking"""
-    payments = db.query(models.Payment).filter(
+    payments = (await db.execute(select(models.Payment).filter(
         models.Payment.booking_id == booking_id
-    ).order_by(models.Payment.payment_date.desc()).all()
+    ).order_by(models.Payment.payment_date.desc()))).scalars().all()
     
     return [
         {
@@ -173,7 +178,7 @@ def get_payment_history(booking_id: int, db: Session = Depends(database.get_db))
 
 
 @router.post("/{payment_id}/refund")
-def process_refund(payment_id: int, db: Session = Depends(database.get_db)):
+def process_refund(payment_id: int, response: Response, db: Session = Depends(database.get_write_db)):
     """Process refund for a payment"""
     payment = db.query(models.Payment).filter(
         models.Payment.payment_id == payment_id
@@ -218,8 +223,14 @@ def process_refund(payment_id: int, db: Session = Depends(database.get_db)):
                 models.BookingDetail.booking_id == booking.booking_id
             ).count()
             performance.available_seats += seat_count
+            pricing_engine.release_booking(db, booking.booking_id, booking.performance_id)
     
     db.commit()
+    database.mark_read_your_writes(response)
+    metrics.inc("theatre_refunds_total", source="payment")
+    if booking and performance:
+        show_bootstrap.invalidate(performance.show_id)
+        performance_calendar.update_availability(performance.performance_id, performance.available_seats)
     
     return {
         "message": "Refund processed successfully",
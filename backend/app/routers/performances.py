@@ -1,19 +1,97 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from datetime import date
-from typing import List, Dict
-from app import models, schemas, database
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from datetime import date, time, timedelta
+from typing import List, Dict, Optional
+from app import models, schemas, database, pricing_engine, seat_layout, catalog_cache, pagination, performance_calendar, executors
+from app.responses import FastJSONResponse
 
-router = APIRouter(prefix="/api/performances", tags=["Performances"])
+router = APIRouter(prefix="/api/performances", tags=["Performances"], route_class=executors.pooled_route())
+
+
+# Eager loads for PerformanceResponse (lazy loading is not available on AsyncSession)
+PERFORMANCE_RESPONSE_OPTIONS = (
+    selectinload(models.Performance.show).selectinload(models.Show.genre),
+    selectinload(models.Performance.venue),
+)
+
+
+# sort name -> descending; both sorts use the (date, start time, id) keyset
+PERFORMANCE_SORTS = {"date": False, "-date": True}
+PERFORMANCE_KEYSET = (
+    models.Performance.performance_date,
+    models.Performance.start_time,
+    models.Performance.performance_id,
+)
+PERFORMANCE_CURSOR_PARSERS = (date.fromisoformat, time.fromisoformat, int)
 
 
 @router.get("/")
-def get_all_performances(db: Session = Depends(database.get_db)):
-    """Get all upcoming performances"""
-    performances = db.query(models.Performance).filter(
-        models.Performance.performance_date >= date.today(),
-        models.Performance.performance_status == "Scheduled"
-    ).all()
+async def get_all_performances(
+    request: Request,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    venue_id: Optional[int] = None,
+    show_id: Optional[int] = None,
+    city: Optional[str] = None,
+    genre: Optional[str] = None,
+    language: Optional[str] = None,
+    sort: str = "date",
+    cursor: Optional[str] = None,
+    limit: int = Query(pagination.DEFAULT_PAGE_SIZE, ge=1, le=pagination.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(database.get_async_read_db)
+):
+    """
+    Get upcoming performances a page at a time (cached until the catalog changes or the date rolls over)
+
+    date_from is clamped to today. Pass next_cursor back as cursor for the
+    following page.
+    """
+    if sort not in PERFORMANCE_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(PERFORMANCE_SORTS)}")
+    today = date.today()
+    date_from = max(date_from or today, today)
+    if date_to and date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    descending = PERFORMANCE_SORTS[sort]
+    
+    version = await db.run_sync(catalog_cache.current_version)
+    cache_key = ("performances", date_from, date_to, venue_id, show_id, city, genre, language, sort, cursor, limit)
+    listing = catalog_cache.get(version, cache_key)
+    if listing is not None:
+        return catalog_cache.respond(request, listing)
+    
+    query = select(models.Performance).filter(
+        models.Performance.performance_status == "Scheduled",
+        models.Performance.performance_date >= date_from
+    )
+    if date_to:
+        query = query.filter(models.Performance.performance_date <= date_to)
+    if venue_id:
+        query = query.filter(models.Performance.venue_id == venue_id)
+    if show_id:
+        query = query.filter(models.Performance.show_id == show_id)
+    if city:
+        query = query.join(models.Venue).filter(models.Venue.city == city)
+    if genre or language:
+        query = query.join(models.Show)
+        if genre:
+            query = query.join(models.Genre).filter(models.Genre.genre_name == genre)
+        if language:
+            query = query.filter(models.Show.language == language)
+    if cursor:
+        values = pagination.decode_cursor(cursor, sort, PERFORMANCE_CURSOR_PARSERS)
+        query = query.filter(pagination.after(PERFORMANCE_KEYSET, values, descending))
+    
+    query = query.order_by(*pagination.order_by(PERFORMANCE_KEYSET, descending)).limit(limit + 1)
+    performances = (await db.execute(query)).scalars().all()
+    
+    next_cursor = None
+    if len(performances) > limit:
+        performances = performances[:limit]
+        last = performances[-1]
+        next_cursor = pagination.encode_cursor(sort, [last.performance_date, last.start_time, last.performance_id])
     
     performances_data = []
     for p in performances:
@@ -26,27 +104,63 @@ def get_all_performances(db: Session = Depends(database.get_db)):
             "performance_status": p.performance_status
         })
     
-    return {"performances": performances_data, "count": len(performances_data)}
+    listing = catalog_cache.put(
+        version, cache_key,
+        {"performances": performances_data, "count": len(performances_data), "next_cursor": next_cursor}
+    )
+    return catalog_cache.respond(request, listing)
+
+
+@router.get("/calendar")
+async def get_performance_calendar(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    venue_id: Optional[int] = None,
+    show_id: Optional[int] = None,
+    city: Optional[str] = None,
+    db: AsyncSession = Depends(database.get_async_read_db)
+):
+    """
+    What's on each day between two dates and how full it is
+
+    Days without a matching performance are omitted. Each day and performance
+    carries a sell-through bucket: available, filling, almost_full or sold_out.
+    date_from defaults to (and is clamped to) today, date_to to 30 days later.
+    """
+    today = date.today()
+    date_from = max(date_from or today, today)
+    date_to = date_to or date_from + timedelta(days=30)
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    if date_to > performance_calendar.horizon_end():
+        raise HTTPException(
+            status_code=400,
+            detail=f"date_to must be within {performance_calendar.CALENDAR_HORIZON_DAYS} days from today"
+        )
+    
+    await db.run_sync(performance_calendar.ensure_current)
+    days = performance_calendar.query(date_from, date_to, venue_id=venue_id, show_id=show_id, city=city)
+    return {"date_from": date_from.isoformat(), "date_to": date_to.isoformat(), "days": days, "count": len(days)}
 
 
 @router.get("/show/{show_id}", response_model=List[schemas.PerformanceResponse])
-def get_performances_for_show(show_id: int, db: Session = Depends(database.get_db)):
+async def get_performances_for_show(show_id: int, db: AsyncSession = Depends(database.get_async_read_db)):
     """Get all upcoming performances for a specific show"""
-    performances = db.query(models.Performance).filter(
+    performances = (await db.execute(select(models.Performance).options(*PERFORMANCE_RESPONSE_OPTIONS).filter(
         models.Performance.show_id == show_id,
         models.Performance.performance_date >= date.today(),
         models.Performance.performance_status == "Scheduled"
-    ).all()
+    ))).scalars().all()
     
     return performances
 
 
 @router.get("/{performance_id}", response_model=schemas.PerformanceResponse)
-def get_performance_detail(performance_id: int, db: Session = Depends(database.get_db)):
+async def get_performance_detail(performance_id: int, db: AsyncSession = Depends(database.get_async_read_db)):
     """Get specific performance details"""
-    performance = db.query(models.Performance).filter(
+    performance = (await db.execute(select(models.Performance).options(*PERFORMANCE_RESPONSE_OPTIONS).filter(
         models.Performance.performance_id == performance_id
-    ).first()
+    ))).scalars().first()
     
     if not performance:
         raise HTTPException(status_code=404, detail="Performance not found")
@@ -55,56 +169,52 @@ def get_performance_detail(performance_id: int, db: Session = Depends(database.g
 
 
 @router.get("/{performance_id}/seats")
-def get_available_seats(performance_id: int, db: Session = Depends(database.get_db)):
+async def get_available_seats(performance_id: int, db: AsyncSession = Depends(database.get_async_read_db)):
     """Get seat availability for a specific performance"""
-    performance = db.query(models.Performance).filter(
+    performance = (await db.execute(select(models.Performance).filter(
         models.Performance.performance_id == performance_id
-    ).first()
+    ))).scalars().first()
     
     if not performance:
         raise HTTPException(status_code=404, detail="Performance not found")
     
-    # Get all seats for the venue
-    all_seats = db.query(models.Seat).filter(
-        models.Seat.venue_id == performance.venue_id,
-        models.Seat.is_active == True
-    ).all()
+    # Get all active seats for the venue (cached until the layout changes)
+    layout = await db.run_sync(seat_layout.get_venue_layout, performance.venue_id)
     
     # Get already booked seats
-    booked_seats = db.query(models.BookingDetail.seat_id).join(
+    booked_seats = (await db.execute(select(models.BookingDetail.seat_id).join(
         models.Booking
     ).filter(
         models.Booking.performance_id == performance_id,
         models.Booking.booking_status.in_(["Pending", "Confirmed"])
-    ).all()
-    
-    booked_seat_ids = [seat[0] for seat in booked_seats]
+    ))).all()
     
-    # Get pricing for this performance
-    pricing = db.query(models.PerformancePricing).filter(
-        models.PerformancePricing.performance_id == performance_id
-    ).all()
+    booked_seat_ids = {seat[0] for seat in booked_seats}
     
-    pricing_dict = {p.seat_category: float(p.price) for p in pricing}
+    # Get pricing for this performance (live dynamic prices when available)
+    live_prices = pricing_engine.get_prices(performance_id)
+    if live_prices is not None:
+        pricing_dict = {category: float(price) for category, price in live_prices.items()}
+    else:
+        pricing = (await db.execute(select(models.PerformancePricing).filter(
+            models.PerformancePricing.performance_id == performance_id
+        ))).scalars().all()
+        
+        pricing_dict = {p.seat_category: float(p.price) for p in pricing}
     
     # Mark seats as available or booked
     seat_map = []
-    for seat in all_seats:
+    for seat in layout.seats:
         seat_map.append({
-            "seat_id": seat.seat_id,
-            "row": seat.row_number,
-            "number": seat.seat_number,
-            "category": seat.seat_category,
-            "section": seat.section,
-            "is_accessible": seat.is_accessible,
-            "is_booked": seat.seat_id in booked_seat_ids,
-            "price": pricing_dict.get(seat.seat_category, 0.0)
+            **seat,
+            "is_booked": seat["seat_id"] in booked_seat_ids,
+            "price": pricing_dict.get(seat["category"], 0.0)
         })
     
-    return {
+    return FastJSONResponse({
         "performance_id": performance_id,
         "performance_date": str(performance.performance_date),
         "start_time": str(performance.start_time),
         "available_seats": performance.available_seats,
         "seats": seat_map
-    }
+    })
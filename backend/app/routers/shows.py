@@ -1,24 +1,89 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from datetime import date
 from typing import Optional, List
-from app import models, schemas, database
+from app import models, schemas, database, catalog_cache, pagination, show_search, show_bootstrap, executors
 
-router = APIRouter(prefix="/api/shows", tags=["Shows"])
+router = APIRouter(prefix="/api/shows", tags=["Shows"], route_class=executors.pooled_route())
+
+
+# sort name -> (keyset columns, descending, cursor value parsers)
+SHOW_SORTS = {
+    "title": ((models.Show.title, models.Show.show_id), False, (str, int)),
+    "-title": ((models.Show.title, models.Show.show_id), True, (str, int)),
+    "newest": ((models.Show.show_id,), True, (int,)),
+    "oldest": ((models.Show.show_id,), False, (int,)),
+}
 
 
 @router.get("/")
-def get_shows(
+async def get_shows(
+    request: Request,
     genre: Optional[str] = None,
+    language: Optional[str] = None,
+    venue_id: Optional[int] = None,
+    city: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
     status: str = "Active",
-    db: Session = Depends(database.get_db)
+    sort: str = "title",
+    cursor: Optional[str] = None,
+    limit: int = Query(pagination.DEFAULT_PAGE_SIZE, ge=1, le=pagination.MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(database.get_async_read_db)
 ):
-    """Retrieve all shows, optionally filter by genre"""
-    query = db.query(models.Show).options(joinedload(models.Show.genre)).filter(models.Show.show_status == status)
+    """
+    Retrieve shows a page at a time (cached until the catalog changes)
+
+    venue_id, city and the date range match shows with a scheduled performance
+    there / then; status=All disables the status filter. Pass next_cursor
+    back as cursor for the following page.
+    """
+    if sort not in SHOW_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(SHOW_SORTS)}")
+    if date_from and date_to and date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+    columns, descending, parsers = SHOW_SORTS[sort]
+    
+    version = await db.run_sync(catalog_cache.current_version)
+    cache_key = ("shows", genre, language, venue_id, city, date_from, date_to, status, sort, cursor, limit)
+    listing = catalog_cache.get(version, cache_key)
+    if listing is not None:
+        return catalog_cache.respond(request, listing)
+    
+    query = select(models.Show).options(joinedload(models.Show.genre))
     
+    if status != "All":
+        query = query.filter(models.Show.show_status == status)
     if genre:
         query = query.join(models.Genre).filter(models.Genre.genre_name == genre)
+    if language:
+        query = query.filter(models.Show.language == language)
+    if venue_id or city or date_from or date_to:
+        performances = select(models.Performance.performance_id).filter(
+            models.Performance.show_id == models.Show.show_id,
+            models.Performance.performance_status == "Scheduled"
+        )
+        if venue_id:
+            performances = performances.filter(models.Performance.venue_id == venue_id)
+        if city:
+            performances = performances.join(models.Venue).filter(models.Venue.city == city)
+        if date_from:
+            performances = performances.filter(models.Performance.performance_date >= date_from)
+        if date_to:
+            performances = performances.filter(models.Performance.performance_date <= date_to)
+        query = query.filter(performances.exists())
+    if cursor:
+        query = query.filter(pagination.after(columns, pagination.decode_cursor(cursor, sort, parsers), descending))
     
-    shows = query.all()
+    query = query.order_by(*pagination.order_by(columns, descending)).limit(limit + 1)
+    shows = (await db.execute(query)).scalars().all()
+    
+    next_cursor = None
+    if len(shows) > limit:
+        shows = shows[:limit]
+        next_cursor = pagination.encode_cursor(sort, [getattr(shows[-1], column.key) for column in columns])
     
     # Add genre_name to each show
     shows_data = []
@@ -41,13 +106,38 @@ def get_shows(
         }
         shows_data.append(show_dict)
     
-    return {"shows": shows_data, "count": len(shows_data)}
+    listing = catalog_cache.put(
+        version, cache_key, {"shows": shows_data, "count": len(shows_data), "next_cursor": next_cursor}
+    )
+    return catalog_cache.respond(request, listing)
+
+
+@router.get("/search")
+async def search_shows(
+    q: str = Query(..., min_length=1, max_length=100),
+    genre: Optional[str] = None,
+    status: str = "Active",
+    limit: int = Query(10, ge=1, le=pagination.MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(database.get_async_read_db)
+):
+    """
+    Typeahead search over show title, director, producer and genre
+
+    Every word of q matches as a prefix; results are ranked (title hits first)
+    and served from the in-memory index in app/show_search.py.
+    """
+    await db.run_sync(show_search.ensure_current)
+    found = show_search.search(q, status=status, genre=genre, limit=limit, offset=offset)
+    return {"results": found["results"], "count": len(found["results"]), "total": found["total"]}
 
 
 @router.get("/{show_id}")
-def get_show_detail(show_id: int, db: Session = Depends(database.get_db)):
+async def get_show_detail(show_id: int, db: AsyncSession = Depends(database.get_async_read_db)):
     """Get detailed information about a specific show"""
-    show = db.query(models.Show).options(joinedload(models.Show.genre)).filter(models.Show.show_id == show_id).first()
+    show = (await db.execute(
+        select(models.Show).options(joinedload(models.Show.genre)).filter(models.Show.show_id == show_id)
+    )).scalars().first()
     if not show:
         raise HTTPException(status_code=404, detail="Show not found")
     
@@ -70,17 +160,44 @@ def get_show_detail(show_id: int, db: Session = Depends(database.get_db)):
     return show_dict
 
 
+@router.get("/{show_id}/bootstrap")
+async def get_show_bootstrap(show_id: int, request: Request, db: AsyncSession = Depends(database.get_async_read_db)):
+    """
+    Everything the show detail page needs in one response
+
+    The show plus its upcoming performances, each with the min/max price and
+    remaining seats per category (cached per show, see app/show_bootstrap.py).
+    """
+    listing = await db.run_sync(show_bootstrap.get_bootstrap, show_id)
+    if listing is None:
+        raise HTTPException(status_code=404, detail="Show not found")
+    return catalog_cache.respond(request, listing)
+
+
 @router.get("/genres/")
-def get_genres(db: Session = Depends(database.get_db)):
-    """Get all available genres"""
-    genres = db.query(models.Genre).all()
-    return {"genres": genres, "count": len(genres)}
+async def get_genres(request: Request, db: AsyncSession = Depends(database.get_async_read_db)):
+    """Get all available genres (cached until the catalog changes)"""
+    version = await db.run_sync(catalog_cache.current_version)
+    listing = catalog_cache.get(version, "genres")
+    if listing is None:
+        genres = (await db.execute(select(models.Genre))).scalars().all()
+        genres_data = [
+            {"description": g.description, "genre_id": g.genre_id, "genre_name": g.genre_name}
+            for g in genres
+        ]
+        listing = catalog_cache.put(version, "genres", {"genres": genres_data, "count": len(genres_data)})
+    return catalog_cache.respond(request, listing)
 
 
 @router.get("/venues/")
-def get_venues(db: Session = Depends(database.get_db)):
-    """Get all available venues for filtering"""
-    venues = db.query(models.Venue).all()
+async def get_venues(request: Request, db: AsyncSession = Depends(database.get_async_read_db)):
+    """Get all available venues for filtering (cached until the catalog changes)"""
+    version = await db.run_sync(catalog_cache.current_version)
+    listing = catalog_cache.get(version, "venues")
+    if listing is not None:
+        return catalog_cache.respond(request, listing)
+    
+    venues = (await db.execute(select(models.Venue))).scalars().all()
     venues_data = []
     for venue in venues:
         venues_data.append({
@@ -89,4 +206,5 @@ def get_venues(db: Session = Depends(database.get_db)):
             "city": venue.city,
             "capacity": venue.total_capacity
         })
-    return {"venues": venues_data, "count": len(venues_data)}
+    listing = catalog_cache.put(version, "venues", {"venues": venues_data, "count": len(venues_data)})
+    return catalog_cache.respond(request, listing)
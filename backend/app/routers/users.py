@@ -1,50 +1,56 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import datetime, date, timedelta
-import secrets
-from app import models, schemas, database, auth
+from app import models, schemas, database, auth, token_store, user_context, executors
 
-router = APIRouter(prefix="/api/users", tags=["Users"])
+router = APIRouter(prefix="/api/users", tags=["Users"], route_class=executors.pooled_route("auth"))
 
-# In-memory storage for password reset tokens (in production, use database or Redis)
-password_reset_tokens = {}
 
+# Password endpoints are async: DB work runs in the auth executor pool and
+# bcrypt runs in the auth worker pool, so no thread is held while hashing.
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-def register_user(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
+async def register_user(user: schemas.UserCreate, db: Session = Depends(database.get_db)):
     """Register a new user"""
     # Check if email exists
-    existing_user = db.query(models.User).filter(models.User.email == user.email).first()
+    existing_user = await executors.run(
+        "auth", lambda: db.query(models.User).filter(models.User.email == user.email).first()
+    )
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Hash password
-    hashed_password = auth.get_password_hash(user.password)
-    
-    # Create user
-    new_user = models.User(
-        first_name=user.first_name,
-        last_name=user.last_name,
-        email=user.email,
-        phone=user.phone,
-        password_hash=hashed_password,
-        city=user.city,
-        country=user.country,
-        registration_date=date.today()
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    hashed_password = await auth.get_password_hash_async(user.password)
+    
+    def create_user():
+        new_user = models.User(
+            first_name=user.first_name,
+            last_name=user.last_name,
+            email=user.email,
+            phone=user.phone,
+            password_hash=hashed_password,
+            city=user.city,
+            country=user.country,
+            registration_date=date.today()
+        )
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+        return new_user
+    
+    new_user = await executors.run("auth", create_user)
     
     return {"message": "User registered successfully", "user_id": new_user.user_id}
 
 
 @router.post("/login")
-def login(credentials: schemas.UserLogin, db: Session = Depends(database.get_db)):
+async def login(credentials: schemas.UserLogin, db: Session = Depends(database.get_db)):
     """User login and JWT token generation"""
-    user = db.query(models.User).filter(models.User.email == credentials.email).first()
+    user = await executors.run(
+        "auth", lambda: db.query(models.User).filter(models.User.email == credentials.email).first()
+    )
     
-    if not user or not auth.verify_password(credentials.password, user.password_hash):
+    if not user or not await auth.verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Generate JWT token
@@ -72,7 +78,7 @@ def get_current_user(token: str, db: Session = Depends(database.get_db)):
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    user = db.query(models.User).filter(models.User.email == payload.get("sub")).first()
+    user = user_context.get_user_context(db, payload.get("user_id"))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -90,13 +96,11 @@ def forgot_password(email_data: dict, db: Session = Depends(database.get_db)):
     
     # Always return success to prevent email enumeration attacks
     if user:
-        # Generate reset token
-        reset_token = secrets.token_urlsafe(32)
-        password_reset_tokens[reset_token] = {
-            "user_id": user.user_id,
-            "email": email,
-            "expires": datetime.now() + timedelta(hours=1)
-        }
+        # Generate reset token (replaces any earlier one for this email)
+        reset_token = token_store.issue(
+            db, token_store.PASSWORD_RESET, email, timedelta(hours=1), user_id=user.user_id
+        )
+        db.commit()
         
         # In production, send email with reset link
         # For demo, we'll just return success
@@ -109,7 +113,7 @@ def forgot_password(email_data: dict, db: Session = Depends(database.get_db)):
 
 
 @router.post("/reset-password")
-def reset_password(reset_data: dict, db: Session = Depends(database.get_db)):
+async def reset_password(reset_data: dict, db: Session = Depends(database.get_db)):
     """Reset password using token (Business requirement 2.1)"""
     token = reset_data.get("token")
     new_password = reset_data.get("new_password")
@@ -120,25 +124,24 @@ def reset_password(reset_data: dict, db: Session = Depends(database.get_db)):
     if len(new_password) < 8:
         raise HTTPException(status_code=400, detail="Password must be at least 8 characters")
     
-    # Validate token
-    token_data = password_reset_tokens.get(token)
+    # Validate and redeem token (removed when the password change commits)
+    token_data = await executors.run("auth", token_store.consume, db, token_store.PASSWORD_RESET, token)
     if not token_data:
         raise HTTPException(status_code=400, detail="Invalid or expired reset token")
     
     if datetime.now() > token_data["expires"]:
-        del password_reset_tokens[token]
+        await executors.run("auth", db.commit)
         raise HTTPException(status_code=400, detail="Reset token has expired")
     
     # Update password
-    user = db.query(models.User).filter(models.User.user_id == token_data["user_id"]).first()
+    user = await executors.run(
+        "auth", lambda: db.query(models.User).filter(models.User.user_id == token_data["user_id"]).first()
+    )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    user.password_hash = auth.get_password_hash(new_password)
-    db.commit()
-    
-    # Remove used token
-    del password_reset_tokens[token]
+    user.password_hash = await auth.get_password_hash_async(new_password)
+    await executors.run("auth", db.commit)
     
     return {
         "message": "Password has been reset successfully",
@@ -1,18 +1,22 @@
-import secrets
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app import models, database
+from app import models, database, token_store, user_context, executors
 
-router = APIRouter(prefix="/api/verification", tags=["Email Verification"])
+router = APIRouter(prefix="/api/verification", tags=["Email Verification"], route_class=executors.pooled_route("auth"))
 
-# Store verification tokens (in production, use Redis or database)
-verification_tokens = {}
+VERIFICATION_TOKEN_TTL = timedelta(hours=24)
 
 
-def generate_verification_token():
-    """Generate a secure verification token"""
-    return secrets.token_urlsafe(32)
+def generate_verification_token(db: Session, user: models.User) -> str:
+    """Issue a verification token for a user, replacing any outstanding one"""
+    token = token_store.issue(
+        db, token_store.EMAIL_VERIFICATION, user.email, VERIFICATION_TOKEN_TTL, user_id=user.user_id
+    )
+    db.commit()
+    return token
 
 
 from pydantic import BaseModel
@@ -32,11 +36,7 @@ def send_verification_email(request: EmailRequest, db: Session = Depends(databas
         raise HTTPException(status_code=400, detail="Email already verified")
     
     # Generate token
-    token = generate_verification_token()
-    verification_tokens[token] = {
-        "email": request.email,
-        "expires": datetime.now() + timedelta(hours=24)
-    }
+    token = generate_verification_token(db, user)
     
     # In production, send actual email with link: f"{BASE_URL}/verify?token={token}"
     # For now, return token for testing
@@ -52,14 +52,14 @@ def send_verification_email(request: EmailRequest, db: Session = Depends(databas
 @router.post("/verify/{token}")
 def verify_email(token: str, db: Session = Depends(database.get_db)):
     """Verify user email with token"""
-    if token not in verification_tokens:
+    # Redeem token (removed when the verification commits)
+    token_data = token_store.consume(db, token_store.EMAIL_VERIFICATION, token)
+    if not token_data:
         raise HTTPException(status_code=400, detail="Invalid or expired verification token")
     
-    token_data = verification_tokens[token]
-    
     # Check if token expired
     if datetime.now() > token_data["expires"]:
-        del verification_tokens[token]
+        db.commit()
         raise HTTPException(status_code=400, detail="Verification token has expired")
     
     # Get user
@@ -74,9 +74,7 @@ def verify_email(token: str, db: Session = Depends(database.get_db)):
         user.account_status = "Active"  # Could have special "Verified" status
     
     db.commit()
-    
-    # Remove token
-    del verification_tokens[token]
+    user_context.invalidate(user.user_id)
     
     return {
         "message": "Email verified successfully",
@@ -86,9 +84,9 @@ def verify_email(token: str, db: Session = Depends(database.get_db)):
 
 
 @router.get("/status/{email}")
-def get_verification_status(email: str, db: Session = Depends(database.get_db)):
+async def get_verification_status(email: str, db: AsyncSession = Depends(database.get_async_db)):
     """Check if user's email is verified"""
-    user = db.query(models.User).filter(models.User.email == email).first()
+    user = (await db.execute(select(models.User).filter(models.User.email == email))).scalars().first()
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -111,17 +109,8 @@ def resend_verification(request: EmailRequest, db: Session = Depends(database.ge
     if user.email_verified:
         raise HTTPException(status_code=400, detail="Email already verified")
     
-    # Remove old token if exists
-    tokens_to_remove = [t for t, data in verification_tokens.items() if data["email"] == request.email]
-    for t in tokens_to_remove:
-        del verification_tokens[t]
-    
-    # Generate new token
-    token = generate_verification_token()
-    verification_tokens[token] = {
-        "email": request.email,
-        "expires": datetime.now() + timedelta(hours=24)
-    }
+    # Generate new token (the old one is revoked through the email index)
+    token = generate_verification_token(db, user)
     
     verification_link = f"http://localhost:8000/verify?token={token}"
     
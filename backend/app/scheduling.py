@@ -0,0 +1,195 @@
+"""
+Season scheduling utilities for the theatre booking system
+Expands a weekly recurrence rule into performance slots, checks them against
+the venue's existing calendar and writes performances and pricing in bulk.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import insert, tuple_
+from sqlalchemy.orm import Session
+from app import models
+
+# Upper bound on performances created by a single scheduling request
+MAX_SEASON_PERFORMANCES = 1000
+
+
+def expand_recurrence(
+    start_date: date,
+    end_date: date,
+    slots: List[dict],
+    duration_minutes: int,
+    interval_weeks: int = 1,
+    exclude_dates: Optional[List[date]] = None
+) -> List[dict]:
+    """
+    Expand a weekly recurrence rule into concrete performance slots
+
+    Args:
+        start_date: First date of the run (inclusive)
+        end_date: Last date of the run (inclusive)
+        slots: Weekly slots, each {"weekday": 0-6 (Mon-Sun), "start_time": time, "end_time": time | None}
+        duration_minutes: Show duration, used when a slot has no explicit end time
+        interval_weeks: Repeat every N weeks, counted from the week of start_date
+        exclude_dates: Dates on which nothing is scheduled (dark days, holidays)
+
+    Returns:
+        Slots sorted by start, each {"performance_date", "start_time", "end_time", "starts_at", "ends_at"}
+    """
+    excluded = set(exclude_dates or [])
+    week_zero = start_date - timedelta(days=start_date.weekday())
+    expanded = []
+
+    current = start_date
+    while current <= end_date:
+        week_index = (current - week_zero).days // 7
+        if current not in excluded and week_index % interval_weeks == 0:
+            for slot in slots:
+                if slot["weekday"] != current.weekday():
+                    continue
+                starts_at = datetime.combine(current, slot["start_time"])
+                if slot.get("end_time"):
+                    ends_at = datetime.combine(current, slot["end_time"])
+                    if ends_at <= starts_at:
+                        ends_at += timedelta(days=1)
+                else:
+                    ends_at = starts_at + timedelta(minutes=duration_minutes)
+                expanded.append({
+                    "performance_date": current,
+                    "start_time": slot["start_time"],
+                    "end_time": ends_at.time(),
+                    "starts_at": starts_at,
+                    "ends_at": ends_at
+                })
+        current += timedelta(days=1)
+
+    expanded.sort(key=lambda s: s["starts_at"])
+    return expanded
+
+
+def find_venue_conflicts(db: Session, venue_id: int, slots: List[dict]) -> List[dict]:
+    """
+    Check new slots against each other and against the venue's existing performances
+
+    Existing performances in the affected date window are loaded with a single
+    query and compared in memory. Cancelled performances never conflict.
+    """
+    if not slots:
+        return []
+
+    conflicts = []
+
+    # Overlaps within the requested run itself (slots are sorted by start)
+    for previous, current in zip(slots, slots[1:]):
+        if current["starts_at"] < previous["ends_at"]:
+            conflicts.append({
+                "performance_date": str(current["performance_date"]),
+                "start_time": str(current["start_time"]),
+                "conflicts_with": "requested",
+                "conflicting_start_time": str(previous["start_time"])
+            })
+
+    # A performance ending after midnight can overlap the next day's slots
+    window_start = slots[0]["performance_date"] - timedelta(days=1)
+    window_end = slots[-1]["performance_date"]
+
+    existing = db.query(
+        models.Performance.performance_id,
+        models.Performance.performance_date,
+        models.Performance.start_time,
+        models.Performance.end_time,
+        models.Show.duration_minutes
+    ).join(
+        models.Show, models.Performance.show_id == models.Show.show_id
+    ).filter(
+        models.Performance.venue_id == venue_id,
+        models.Performance.performance_date >= window_start,
+        models.Performance.performance_date <= window_end,
+        models.Performance.performance_status != "Cancelled"
+    ).all()
+
+    booked = []
+    for perf in existing:
+        starts_at = datetime.combine(perf.performance_date, perf.start_time)
+        if perf.end_time:
+            ends_at = datetime.combine(perf.performance_date, perf.end_time)
+            if ends_at <= starts_at:
+                ends_at += timedelta(days=1)
+        else:
+            ends_at = starts_at + timedelta(minutes=perf.duration_minutes or 0)
+        booked.append((starts_at, ends_at, perf))
+
+    for slot in slots:
+        for starts_at, ends_at, perf in booked:
+            if slot["starts_at"] < ends_at and starts_at < slot["ends_at"]:
+                conflicts.append({
+                    "performance_date": str(slot["performance_date"]),
+                    "start_time": str(slot["start_time"]),
+                    "conflicts_with": "existing",
+                    "performance_id": perf.performance_id,
+                    "conflicting_start_time": str(perf.start_time)
+                })
+
+    return conflicts
+
+
+def bulk_create_season(
+    db: Session,
+    show_id: int,
+    venue_id: int,
+    slots: List[dict],
+    prices: Dict[str, float],
+    total_seats: int,
+    special_notes: Optional[str] = None
+) -> List[int]:
+    """
+    Insert all performances and their category pricing as two batched INSERTs
+
+    The caller owns the transaction; nothing is committed here. Returns the new
+    performance IDs in slot order.
+    """
+    db.execute(
+        insert(models.Performance),
+        [
+            {
+                "show_id": show_id,
+                "venue_id": venue_id,
+                "performance_date": slot["performance_date"],
+                "start_time": slot["start_time"],
+                "end_time": slot["end_time"],
+                "total_seats": total_seats,
+                "available_seats": total_seats,
+                "performance_status": "Scheduled",
+                "special_notes": special_notes
+            }
+            for slot in slots
+        ]
+    )
+
+    # Read the generated keys back in one query; (venue, date, start) is unique
+    # after conflict validation, and this avoids relying on RETURNING support
+    keys = [(slot["performance_date"], slot["start_time"]) for slot in slots]
+    rows = db.query(
+        models.Performance.performance_id,
+        models.Performance.performance_date,
+        models.Performance.start_time
+    ).filter(
+        models.Performance.venue_id == venue_id,
+        models.Performance.show_id == show_id,
+        models.Performance.performance_status == "Scheduled",
+        tuple_(models.Performance.performance_date, models.Performance.start_time).in_(keys)
+    ).all()
+    id_by_key = {(r.performance_date, r.start_time): r.performance_id for r in rows}
+    performance_ids = [id_by_key[key] for key in keys]
+
+    if prices:
+        db.execute(
+            insert(models.PerformancePricing),
+            [
+                {"performance_id": performance_id, "seat_category": category, "price": price}
+                for performance_id in performance_ids
+                for category, price in prices.items()
+            ]
+        )
+
+    return performance_ids
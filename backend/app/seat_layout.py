@@ -0,0 +1,113 @@
+"""
+Cached venue seat layouts, invalidated through a per-venue layout version
+
+Seat rows change only when an admin edits a venue's layout, so the active
+seats of each venue are cached in-process as plain dicts. Every layout
+change bumps VenueLayoutVersion once (in the same transaction as the seat
+UPDATE); readers compare the stored version with a primary-key lookup and
+reload only when it moved. Other caches derived from a layout can register a
+listener to be told when a venue's layout is dropped.
+"""
+
+import threading
+from typing import Callable, Dict, List, NamedTuple
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app import models
+
+
+class VenueLayout(NamedTuple):
+    venue_id: int
+    version: int
+    seats: List[dict]          # active seats in seat map order
+    by_id: Dict[int, dict]     # seat_id -> seat
+
+
+_layouts: Dict[int, VenueLayout] = {}
+_lock = threading.Lock()
+_listeners: List[Callable[[int], None]] = []
+
+
+def add_invalidation_listener(listener: Callable[[int], None]):
+    """Register a callback(venue_id) run whenever a venue's cached layout is dropped"""
+    _listeners.append(listener)
+
+
+def get_layout_version(db: Session, venue_id: int) -> int:
+    """Current layout version of a venue (0 if its layout was never changed)"""
+    version = db.query(models.VenueLayoutVersion.version).filter(
+        models.VenueLayoutVersion.venue_id == venue_id
+    ).scalar()
+    return version or 0
+
+
+def bump_layout_version(db: Session, venue_id: int) -> int:
+    """
+    Increment a venue's layout version inside the caller's transaction
+
+    Uses a single set-based UPDATE so concurrent bumps from several workers
+    never lose an increment. Returns the new version.
+    """
+    result = db.execute(
+        update(models.VenueLayoutVersion)
+        .where(models.VenueLayoutVersion.venue_id == venue_id)
+        .values(version=models.VenueLayoutVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.add(models.VenueLayoutVersion(venue_id=venue_id, version=1))
+        db.flush()
+    return get_layout_version(db, venue_id)
+
+
+def invalidate(venue_id: int):
+    """Drop this worker's cached layout for a venue and notify listeners"""
+    with _lock:
+        _layouts.pop(venue_id, None)
+    for listener in _listeners:
+        listener(venue_id)
+
+
+def _load(db: Session, venue_id: int, version: int) -> VenueLayout:
+    rows = db.query(
+        models.Seat.seat_id,
+        models.Seat.row_number,
+        models.Seat.seat_number,
+        models.Seat.seat_category,
+        models.Seat.section,
+        models.Seat.is_accessible
+    ).filter(
+        models.Seat.venue_id == venue_id,
+        models.Seat.is_active == True
+    ).order_by(models.Seat.seat_id).all()
+
+    seats = [
+        {
+            "seat_id": r.seat_id,
+            "row": r.row_number,
+            "number": r.seat_number,
+            "category": r.seat_category,
+            "section": r.section,
+            "is_accessible": r.is_accessible
+        }
+        for r in rows
+    ]
+    return VenueLayout(venue_id, version, seats, {seat["seat_id"]: seat for seat in seats})
+
+
+def get_venue_layout(db: Session, venue_id: int) -> VenueLayout:
+    """Active seats of a venue, served from cache while the layout version is unchanged"""
+    version = get_layout_version(db, venue_id)
+    cached = _layouts.get(venue_id)
+    if cached is not None and cached.version == version:
+        return cached
+
+    layout = _load(db, venue_id, version)
+    with _lock:
+        current = _layouts.get(venue_id)
+        if current is None or current.version <= version:
+            _layouts[venue_id] = layout
+    if cached is not None:
+        # Another worker changed the layout; derived caches are stale too
+        for listener in _listeners:
+            listener(venue_id)
+    return layout
@@ -0,0 +1,189 @@
+"""
+Show detail bootstrap: the show, its upcoming performances, prices and availability
+
+The show detail page needs the show, every upcoming performance, the price
+range of each seat category and how many seats are left. All of it is
+assembled with five queries (show, performances, grouped pricing, grouped
+venue seat counts, grouped held seats) and cached per show as
+rendered JSON.
+
+A cached entry is valid for one catalog version and one calendar day.
+Bookings, cancellations and pricing edits in this worker drop the show's
+entry after commit; changes made by other workers show up within
+SHOW_BOOTSTRAP_TTL_SECONDS.
+"""
+
+import os
+import threading
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from app import models, catalog_cache, pricing_engine, seat_layout
+from app.utils import TTLCache
+
+SHOW_BOOTSTRAP_CACHE_SIZE = int(os.getenv("SHOW_BOOTSTRAP_CACHE_SIZE", "512"))
+SHOW_BOOTSTRAP_TTL_SECONDS = float(os.getenv("SHOW_BOOTSTRAP_TTL_SECONDS", "15"))
+
+# show_id -> (catalog version, day, CachedListing)
+_cache = TTLCache(SHOW_BOOTSTRAP_CACHE_SIZE, SHOW_BOOTSTRAP_TTL_SECONDS)
+_show_of: Dict[int, int] = {}       # performance_id -> show_id, learned while building
+_generations: Dict[int, int] = {}   # show_id -> invalidation count, so a build racing a booking is not cached
+_lock = threading.Lock()
+
+
+def invalidate(show_id: int):
+    with _lock:
+        _generations[show_id] = _generations.get(show_id, 0) + 1
+    _cache.pop(show_id)
+
+
+def invalidate_performance(performance_id: int):
+    """Drop the cached bootstrap of the show a performance belongs to (call after commit)"""
+    show_id = _show_of.get(performance_id)
+    if show_id is not None:
+        invalidate(show_id)
+
+
+def clear():
+    with _lock:
+        for show_id in _generations:
+            _generations[show_id] += 1
+    _cache.clear()
+
+
+# A venue layout change alters the seat counts of every show playing there
+seat_layout.add_invalidation_listener(lambda venue_id: clear())
+
+
+def _build(db: Session, show_id: int, today: date) -> Optional[dict]:
+    show = db.query(models.Show).options(joinedload(models.Show.genre)).filter(
+        models.Show.show_id == show_id
+    ).first()
+    if not show:
+        return None
+
+    performances = db.query(models.Performance).options(joinedload(models.Performance.venue)).filter(
+        models.Performance.show_id == show_id,
+        models.Performance.performance_date >= today,
+        models.Performance.performance_status == "Scheduled"
+    ).order_by(
+        models.Performance.performance_date, models.Performance.start_time, models.Performance.performance_id
+    ).all()
+    performance_ids = [p.performance_id for p in performances]
+    venue_ids = {p.venue_id for p in performances}
+
+    prices = defaultdict(dict)      # performance_id -> category -> (min, max)
+    seats = defaultdict(dict)       # venue_id -> category -> active seats
+    sold = defaultdict(dict)        # performance_id -> category -> seats held
+    if performance_ids:
+        for performance_id, category, low, high in db.query(
+            models.PerformancePricing.performance_id,
+            models.PerformancePricing.seat_category,
+            func.min(models.PerformancePricing.price),
+            func.max(models.PerformancePricing.price)
+        ).filter(
+            models.PerformancePricing.performance_id.in_(performance_ids)
+        ).group_by(models.PerformancePricing.performance_id, models.PerformancePricing.seat_category):
+            prices[performance_id][category] = (low, high)
+
+        for venue_id, category, count in db.query(
+            models.Seat.venue_id, models.Seat.seat_category, func.count(models.Seat.seat_id)
+        ).filter(
+            models.Seat.venue_id.in_(venue_ids), models.Seat.is_active == True
+        ).group_by(models.Seat.venue_id, models.Seat.seat_category):
+            seats[venue_id][category] = count
+
+        # Held seats, counted the way the seat map does: the sales counters
+        # only move while dynamic pricing is enabled
+        for performance_id, category, count in db.query(
+            models.Booking.performance_id,
+            models.Seat.seat_category,
+            func.count(models.BookingDetail.booking_detail_id)
+        ).join(
+            models.BookingDetail, models.BookingDetail.booking_id == models.Booking.booking_id
+        ).join(
+            models.Seat, models.Seat.seat_id == models.BookingDetail.seat_id
+        ).filter(
+            models.Booking.performance_id.in_(performance_ids),
+            models.Booking.booking_status.in_(["Pending", "Confirmed"]),
+            models.Seat.is_active == True
+        ).group_by(models.Booking.performance_id, models.Seat.seat_category):
+            sold[performance_id][category] = count
+
+    performances_data = []
+    for p in performances:
+        # Live dynamic prices replace the stored ones when the engine has them
+        category_prices = dict(prices[p.performance_id])
+        for category, price in (pricing_engine.get_prices(p.performance_id) or {}).items():
+            category_prices[category] = (price, price)
+
+        venue_seats = seats[p.venue_id]
+        categories = []
+        for category in sorted(set(category_prices) | set(venue_seats)):
+            low, high = category_prices.get(category, (None, None))
+            categories.append({
+                "category": category,
+                "min_price": float(low) if low is not None else None,
+                "max_price": float(high) if high is not None else None,
+                "total_seats": venue_seats.get(category, 0),
+                "remaining_seats": max(venue_seats.get(category, 0) - sold[p.performance_id].get(category, 0), 0)
+            })
+        listed = [c["min_price"] for c in categories if c["min_price"] is not None]
+
+        performances_data.append({
+            "performance_id": p.performance_id,
+            "venue_id": p.venue_id,
+            "venue_name": p.venue.venue_name if p.venue else None,
+            "city": p.venue.city if p.venue else None,
+            "performance_date": p.performance_date.isoformat(),
+            "start_time": str(p.start_time) if p.start_time else None,
+            "end_time": str(p.end_time) if p.end_time else None,
+            "total_seats": p.total_seats,
+            "available_seats": p.available_seats,
+            "min_price": min(listed) if listed else None,
+            "categories": categories
+        })
+
+    return {
+        "show": {
+            "show_id": show.show_id,
+            "title": show.title,
+            "description": show.description,
+            "genre_id": show.genre_id,
+            "genre_name": show.genre.genre_name if show.genre else None,
+            "duration_minutes": show.duration_minutes,
+            "language": show.language,
+            "age_rating": show.age_rating,
+            "poster_url": show.poster_url,
+            "producer": show.producer,
+            "director": show.director,
+            "show_status": show.show_status,
+            "created_at": show.created_at,
+            "updated_at": show.updated_at
+        },
+        "performances": performances_data,
+        "count": len(performances_data)
+    }
+
+
+def get_bootstrap(db: Session, show_id: int) -> Optional[catalog_cache.CachedListing]:
+    """Rendered bootstrap for a show (None if the show does not exist)"""
+    version = catalog_cache.current_version(db)
+    today = date.today()
+    entry = _cache.get(show_id)
+    if entry is not None and entry[0] == version and entry[1] == today:
+        return entry[2]
+
+    generation = _generations.get(show_id, 0)
+    content = _build(db, show_id, today)
+    if content is None:
+        return None
+    listing = catalog_cache.render(content)
+    for performance in content["performances"]:
+        _show_of[performance["performance_id"]] = show_id
+    with _lock:
+        if _generations.get(show_id, 0) == generation:
+            _cache.set(show_id, (version, today, listing))
+    return listing
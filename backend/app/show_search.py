@@ -0,0 +1,193 @@
+"""
+In-memory typeahead index over shows
+
+Every show's title, director, producer and genre name are normalized
+(lowercased, accents stripped) and split into tokens; each token and each of
+its prefixes maps to the shows containing it, weighted by field. A query
+looks up the prefixes of its tokens, keeps shows matching all of them and
+ranks them by field weight, exact-token and title-prefix bonuses, so a
+search is a handful of dict lookups.
+
+The index is tied to the catalog version (app/catalog_cache.py). Show edits
+made by this worker are applied incrementally after commit; any other
+catalog change (another worker, venues, CSV imports) moves the version
+further and the next search rebuilds the index from the database.
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Set
+from sqlalchemy.orm import Session, joinedload
+from app import catalog_cache, models
+
+MAX_PREFIX_LENGTH = 20
+
+# Field weights: a title hit outranks a director hit, and so on
+FIELD_WEIGHTS = {"title": 4, "director": 2, "producer": 1, "genre_name": 1}
+EXACT_TOKEN_BONUS = 1.5     # multiplier when the query token is a whole word
+TITLE_PREFIX_BONUS = 5      # the whole query starts the title
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase and strip accents"""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+class _Index:
+    def __init__(self, version: int):
+        self.version = version
+        self.docs: Dict[int, dict] = {}
+        # prefix -> {show_id: weight}; inner dicts are replaced, never mutated,
+        # so searches can read them without the lock
+        self.prefixes: Dict[str, Dict[int, float]] = {}
+        self.tokens: Dict[str, Dict[int, float]] = {}
+        self.keys: Dict[int, tuple] = {}  # show_id -> (prefixes, tokens) it was added under
+
+    def add(self, show: models.Show):
+        doc = {
+            "show_id": show.show_id,
+            "title": show.title,
+            "genre_name": show.genre.genre_name if show.genre else None,
+            "director": show.director,
+            "producer": show.producer,
+            "language": show.language,
+            "duration_minutes": show.duration_minutes,
+            "age_rating": show.age_rating,
+            "poster_url": show.poster_url,
+            "show_status": show.show_status
+        }
+        prefix_weights: Dict[str, float] = {}
+        token_weights: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(doc[field]):
+                token_weights[token] = max(token_weights.get(token, 0), weight)
+                for end in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                    prefix = token[:end]
+                    prefix_weights[prefix] = max(prefix_weights.get(prefix, 0), weight)
+
+        self.remove(show.show_id)
+        doc["_title"] = " ".join(tokenize(show.title))
+        self.docs[show.show_id] = doc
+        for prefix, weight in prefix_weights.items():
+            self.prefixes[prefix] = {**self.prefixes.get(prefix, {}), show.show_id: weight}
+        for token, weight in token_weights.items():
+            self.tokens[token] = {**self.tokens.get(token, {}), show.show_id: weight}
+        self.keys[show.show_id] = (tuple(prefix_weights), tuple(token_weights))
+
+    def remove(self, show_id: int):
+        keys = self.keys.pop(show_id, None)
+        self.docs.pop(show_id, None)
+        if keys is None:
+            return
+        for table, names in ((self.prefixes, keys[0]), (self.tokens, keys[1])):
+            for name in names:
+                postings = {k: v for k, v in table.get(name, {}).items() if k != show_id}
+                if postings:
+                    table[name] = postings
+                else:
+                    table.pop(name, None)
+
+
+_index: Optional[_Index] = None
+_lock = threading.Lock()
+
+
+def _load_shows(db: Session, show_id: Optional[int] = None) -> List[models.Show]:
+    query = db.query(models.Show).options(joinedload(models.Show.genre))
+    if show_id is not None:
+        query = query.filter(models.Show.show_id == show_id)
+    return query.all()
+
+
+def ensure_current(db: Session):
+    """Rebuild the index if the catalog moved since it was built"""
+    global _index
+    version = catalog_cache.current_version(db)
+    if _index is not None and _index.version == version:
+        return
+    # Load without holding _lock: under AsyncSession.run_sync every query
+    # yields to the event loop, and a request blocking on a held
+    # threading.Lock there would stall the loop the holder needs to finish
+    index = _Index(version)
+    for show in _load_shows(db):
+        index.add(show)
+    with _lock:
+        if _index is None or _index.version < version:
+            _index = index
+
+
+def reindex_show(db: Session, show_id: int):
+    """
+    Apply one show's create/update/delete after the admin transaction committed
+
+    Call after catalog_cache.invalidate(). If the version moved by more than
+    this edit's bump, some other change is missing, so the index is dropped
+    and rebuilt on the next search instead.
+    """
+    global _index
+    version = catalog_cache.current_version(db)
+    shows = _load_shows(db, show_id)
+    with _lock:
+        if _index is None or version != _index.version + 1:
+            _index = None
+            return
+        if shows:
+            _index.add(shows[0])
+        else:
+            _index.remove(show_id)
+        _index.version = version
+
+
+def search(query: str, status: Optional[str] = "Active", genre: Optional[str] = None,
+           limit: int = 10, offset: int = 0) -> dict:
+    """Ranked shows matching every token of the query as a prefix"""
+    index = _index
+    tokens = [token[:MAX_PREFIX_LENGTH] for token in tokenize(query)]
+    if index is None or not tokens:
+        return {"results": [], "total": 0}
+
+    scores: Optional[Dict[int, float]] = None
+    for token in tokens:
+        postings = index.prefixes.get(token, {})
+        exact = index.tokens.get(token, {})
+        candidates: Set[int] = set(postings) if scores is None else set(postings) & set(scores)
+        scores = {
+            show_id: (scores or {}).get(show_id, 0) + max(
+                postings[show_id], exact.get(show_id, 0) * EXACT_TOKEN_BONUS
+            )
+            for show_id in candidates
+        }
+        if not scores:
+            return {"results": [], "total": 0}
+
+    normalized_query = " ".join(tokens)
+    genre_filter = normalize(genre) if genre else None
+    ranked = []
+    for show_id, score in scores.items():
+        doc = index.docs.get(show_id)
+        if doc is None:
+            continue
+        if status and status != "All" and doc["show_status"] != status:
+            continue
+        if genre_filter and normalize(doc["genre_name"]) != genre_filter:
+            continue
+        if doc["_title"].startswith(normalized_query):
+            score += TITLE_PREFIX_BONUS
+        ranked.append((-score, doc["_title"], show_id, doc))
+    ranked.sort(key=lambda entry: entry[:3])
+
+    results = [
+        {**{k: v for k, v in doc.items() if not k.startswith("_")}, "score": -neg_score}
+        for neg_score, _, _, doc in ranked[offset:offset + limit]
+    ]
+    return {"results": results, "total": len(ranked)}
@@ -0,0 +1,195 @@
+"""
+Per-request SQL instrumentation
+
+Engine-level cursor events (registered once on the Engine class, so they
+cover the primary, writer, replica and async engines alike) record every
+statement into the current request's stats, held in a context variable that
+follows the request into the threadpool. For each request the middleware:
+- counts statements and accumulates DB time
+- flags statement shapes (SQL text with bind placeholders) run at least
+  N_PLUS_ONE_THRESHOLD times as suspected N+1 queries
+- folds the numbers into per-route aggregates and the
+  http_request_db_statements / http_request_db_seconds histograms
+- with SQL_DEBUG_ENDPOINT_ENABLED, adds a Server-Timing header:
+  db;dur=<ms>;desc="<n> queries" and app;dur=<ms>
+
+The aggregates back the opt-in admin debug endpoint. Server-Timing shares its
+setting because it hands DB timings and query counts to any client.
+Statements outside a request (background jobs, scripts) are not recorded.
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app import metrics
+
+SQL_INSTRUMENTATION_ENABLED = os.getenv("SQL_INSTRUMENTATION_ENABLED", "true").lower() == "true"
+SQL_DEBUG_ENDPOINT_ENABLED = os.getenv("SQL_DEBUG_ENDPOINT_ENABLED", "false").lower() == "true"
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+
+# Distinct shapes kept per route for the debug report
+MAX_SHAPES_PER_ROUTE = 20
+
+
+class RequestStats:
+    __slots__ = ("statements", "db_seconds", "shapes")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    def suspected_n_plus_one(self) -> Dict[str, int]:
+        return {shape: count for shape, count in self.shapes.items() if count >= N_PLUS_ONE_THRESHOLD}
+
+
+class RouteStats:
+    __slots__ = ("requests", "statements", "max_statements", "db_seconds", "n_plus_one_requests", "shapes")
+
+    def __init__(self):
+        self.requests = 0
+        self.statements = 0
+        self.max_statements = 0
+        self.db_seconds = 0.0
+        self.n_plus_one_requests = 0
+        self.shapes: Counter = Counter()  # shape -> times flagged as N+1
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("sql_request_stats", default=None)
+_routes: Dict[str, RouteStats] = {}
+_routes_lock = threading.Lock()
+_reported: set = set()
+
+
+# =============================================
+# Engine hooks
+# =============================================
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None and context is not None:
+        context._sql_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None or context is None:
+        return
+    started = getattr(context, "_sql_started", None)
+    if started is not None:
+        stats.db_seconds += time.perf_counter() - started
+    stats.statements += 1
+    stats.shapes[statement] += 1
+
+
+# =============================================
+# Aggregation
+# =============================================
+
+def _record(route: str, stats: RequestStats):
+    suspected = stats.suspected_n_plus_one()
+    with _routes_lock:
+        entry = _routes.get(route)
+        if entry is None:
+            entry = _routes[route] = RouteStats()
+        entry.requests += 1
+        entry.statements += stats.statements
+        entry.max_statements = max(entry.max_statements, stats.statements)
+        entry.db_seconds += stats.db_seconds
+        if suspected:
+            entry.n_plus_one_requests += 1
+            for shape, count in suspected.items():
+                if shape in entry.shapes or len(entry.shapes) < MAX_SHAPES_PER_ROUTE:
+                    entry.shapes[shape] += 1
+
+    for shape, count in suspected.items():
+        key = (route, shape)
+        if key not in _reported:
+            _reported.add(key)
+            print(f"Suspected N+1 on {route}: {count}x {' '.join(shape.split())[:200]}")
+
+
+def top_routes(limit: int = 20, sort: str = "statements") -> List[dict]:
+    """Per-route aggregates, worst first by avg statements, db time or N+1 requests"""
+    with _routes_lock:
+        rows = [
+            {
+                "route": route,
+                "requests": entry.requests,
+                "avg_statements": round(entry.statements / entry.requests, 2),
+                "max_statements": entry.max_statements,
+                "avg_db_ms": round(entry.db_seconds * 1000 / entry.requests, 3),
+                "total_db_ms": round(entry.db_seconds * 1000, 3),
+                "n_plus_one_requests": entry.n_plus_one_requests,
+                "suspected_n_plus_one": [
+                    {"statement": " ".join(shape.split()), "requests_flagged": flagged}
+                    for shape, flagged in entry.shapes.most_common(5)
+                ]
+            }
+            for route, entry in _routes.items()
+        ]
+    key = {
+        "statements": lambda r: r["avg_statements"],
+        "db_time": lambda r: r["total_db_ms"],
+        "n_plus_one": lambda r: r["n_plus_one_requests"],
+    }[sort]
+    rows.sort(key=key, reverse=True)
+    return rows[:limit]
+
+
+def reset():
+    """Clear per-route aggregates"""
+    with _routes_lock:
+        _routes.clear()
+    _reported.clear()
+
+
+# =============================================
+# Middleware
+# =============================================
+
+def _route_name(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}"
+
+
+class SQLInstrumentationMiddleware:
+    """ASGI middleware collecting per-request SQL stats (and Server-Timing when debugging)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_INSTRUMENTATION_ENABLED:
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and SQL_DEBUG_ENDPOINT_ENABLED:
+                app_ms = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.statements} queries", '
+                    f"app;dur={app_ms:.2f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            if stats.statements:
+                _record(_route_name(scope), stats)
+                route = getattr(scope.get("route"), "path", None) or "other"
+                metrics.observe("http_request_db_statements", stats.statements, method=scope["method"], route=route)
+                metrics.observe("http_request_db_seconds", stats.db_seconds, method=scope["method"], route=route)
@@ -5,7 +5,6 @@ Implements business requirements:
 - Email confirmation with booking details
 """
 
-import qrcode
 from io import BytesIO
 import base64
 from datetime import datetime, timedelta
@@ -30,6 +29,10 @@ def generate_qr_code(booking_reference: str, booking_id: int) -> str:
     
     Business requirement: QR code for ticket validation at venue
     """
+    # qrcode pulls in Pillow; import it on first use so workers that never
+    # issue a ticket don't pay for it at startup
+    import qrcode
+
     # QR code data contains booking reference and ID for validation
     qr_data = f"THEATRE_BOOKING:{booking_reference}:{booking_id}"
     
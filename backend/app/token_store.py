@@ -0,0 +1,145 @@
+"""
+Persistent single-use tokens for password reset and email verification
+
+Tokens live in the auth_token table so they survive restarts and are shared
+by every worker process. Only a SHA-256 hash of each token is stored; the raw
+value is returned once by issue() and never persisted. Lookups go through the
+unique hash, "tokens for this email" through the (purpose, email) index and
+the periodic purge through the expires_at index.
+
+Redeeming a token is a DELETE guarded by its primary key, so when two workers
+race on the same token only the one whose DELETE removed the row wins.
+"""
+
+import hashlib
+import os
+import secrets
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from app import metrics, models
+
+PASSWORD_RESET = "password_reset"
+EMAIL_VERIFICATION = "email_verification"
+
+TOKEN_PURGE_SECONDS = int(os.getenv("TOKEN_PURGE_SECONDS", "3600"))
+
+
+def hash_token(token: str) -> str:
+    """SHA-256 hex digest under which a token is stored"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def issue(
+    db: Session,
+    purpose: str,
+    email: str,
+    ttl: timedelta,
+    user_id: Optional[int] = None,
+    replace_existing: bool = True
+) -> str:
+    """
+    Create a token and return its raw value
+
+    By default any outstanding token of the same purpose for the email is
+    revoked first, so only the latest link works. The caller commits.
+    """
+    if replace_existing:
+        revoke_for_email(db, purpose, email)
+
+    token = secrets.token_urlsafe(32)
+    db.add(models.AuthToken(
+        token_hash=hash_token(token),
+        purpose=purpose,
+        user_id=user_id,
+        email=email,
+        expires_at=datetime.now() + ttl
+    ))
+    db.flush()
+    return token
+
+
+def consume(db: Session, purpose: str, token: str) -> Optional[dict]:
+    """
+    Redeem a token inside the caller's transaction
+
+    Returns {"user_id", "email", "expires"} if this call removed the token, or
+    None if it does not exist or another request redeemed it first. Expired
+    tokens are returned as well so callers can report expiry; check
+    data["expires"]. Nothing is final until the caller commits, so a request
+    that fails afterwards leaves the token usable.
+    """
+    row = db.query(models.AuthToken).filter(
+        models.AuthToken.token_hash == hash_token(token),
+        models.AuthToken.purpose == purpose
+    ).first()
+    if row is None:
+        return None
+
+    data = {"user_id": row.user_id, "email": row.email, "expires": row.expires_at}
+    result = db.execute(
+        delete(models.AuthToken).where(models.AuthToken.token_id == row.token_id)
+    )
+    db.expunge(row)
+    if result.rowcount == 0:
+        return None
+    return data
+
+
+def revoke_for_email(db: Session, purpose: str, email: str) -> int:
+    """Delete all tokens of a purpose issued to an email; returns how many were removed"""
+    result = db.execute(
+        delete(models.AuthToken).where(
+            models.AuthToken.purpose == purpose,
+            models.AuthToken.email == email
+        )
+    )
+    return result.rowcount
+
+
+def purge_expired(db: Session) -> int:
+    """Delete every expired token and commit; returns how many were removed"""
+    result = db.execute(
+        delete(models.AuthToken).where(models.AuthToken.expires_at < datetime.now())
+    )
+    db.commit()
+    return result.rowcount
+
+
+# =============================================
+# Periodic purge
+# =============================================
+
+_stop_event = threading.Event()
+_worker: Optional[threading.Thread] = None
+
+
+def _purge_periodically(session_factory):
+    while not _stop_event.is_set():
+        db = session_factory()
+        try:
+            purge_expired(db)
+            metrics.inc("theatre_background_job_runs_total", job="token_purge", outcome="success")
+        except Exception as e:
+            metrics.inc("theatre_background_job_runs_total", job="token_purge", outcome="error")
+            print(f"Token purge error: {e}")
+        finally:
+            db.close()
+        _stop_event.wait(TOKEN_PURGE_SECONDS)
+
+
+def start(session_factory):
+    """Start the expired-token purge thread (no-op if TOKEN_PURGE_SECONDS is 0)"""
+    global _worker
+    if TOKEN_PURGE_SECONDS <= 0 or (_worker and _worker.is_alive()):
+        return
+    _stop_event.clear()
+    _worker = threading.Thread(target=_purge_periodically, args=(session_factory,), name="token-purge", daemon=True)
+    _worker.start()
+
+
+def stop():
+    """Signal the purge thread to exit"""
+    _stop_event.set()
@@ -0,0 +1,61 @@
+"""
+Per-user context cache keyed by user_id
+
+Authenticated endpoints (profile, /api/users/me, permission checks) need the
+same handful of User columns on every request. They are loaded once per user
+into a short-TTL LRU and shared by those callers. Anything that changes a
+user's profile, role, status or verification calls invalidate(user_id); other
+worker processes see the change within USER_CONTEXT_TTL_SECONDS.
+"""
+
+import os
+from typing import Optional
+from sqlalchemy.orm import Session
+from app import models
+from app.utils import TTLCache
+
+USER_CONTEXT_CACHE_SIZE = int(os.getenv("USER_CONTEXT_CACHE_SIZE", "10000"))
+USER_CONTEXT_TTL_SECONDS = float(os.getenv("USER_CONTEXT_TTL_SECONDS", "60"))
+
+CONTEXT_COLUMNS = (
+    "user_id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "date_of_birth",
+    "address_line1",
+    "address_line2",
+    "city",
+    "postal_code",
+    "country",
+    "registration_date",
+    "email_verified",
+    "account_status",
+    "is_admin",
+    "role_id",
+)
+
+_cache = TTLCache(USER_CONTEXT_CACHE_SIZE, USER_CONTEXT_TTL_SECONDS)
+
+
+def get_user_context(db: Session, user_id: int) -> Optional[dict]:
+    """Cached User columns for a user, or None if the user does not exist"""
+    context = _cache.get(user_id)
+    if context is not None:
+        return context
+
+    row = db.query(
+        *(getattr(models.User, column) for column in CONTEXT_COLUMNS)
+    ).filter(models.User.user_id == user_id).first()
+    if row is None:
+        return None
+
+    context = dict(row._mapping)
+    _cache.set(user_id, context)
+    return context
+
+
+def invalidate(user_id: int):
+    """Drop a user's cached context (call after changing any of its columns)"""
+    _cache.pop(user_id)
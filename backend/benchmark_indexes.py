@@ -0,0 +1,254 @@
+"""
+EXPLAIN plans and timings for the booking hot-path indexes
+
+Builds a scratch database with synthetic data (1M bookings by default), runs
+each hot-path query without the indexes from the "booking hot path indexes"
+migration and then with them, and prints the query plan and median timing
+for both. A query passes when its plan uses the index expected for it.
+
+Usage:
+    python benchmark_indexes.py [--url sqlite:///./index_benchmark.db] [--bookings 1000000] [--runs 5]
+
+The target database is dropped and recreated, so never point --url at real data.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+from app import models
+from app.database import Base
+
+# Indexes added by the hot-path and catalog listing migrations, per table
+HOT_PATH_INDEXES = {
+    index.name: index
+    for table in ("booking", "booking_detail", "performance", "payment", "show_table", "venue")
+    for index in Base.metadata.tables[table].indexes
+}
+
+CHUNK_SIZE = 50000
+
+
+# =============================================
+# Data generation
+# =============================================
+
+def _insert_chunked(connection, model, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == CHUNK_SIZE:
+            connection.execute(insert(model), batch)
+            batch = []
+    if batch:
+        connection.execute(insert(model), batch)
+
+
+def populate(engine, bookings: int):
+    rng = random.Random(42)
+    venues, seats_per_venue, shows = 10, 500, 50
+    performances = max(100, bookings // 500)
+    users = max(1000, bookings // 10)
+    today = date.today()
+    now = datetime.now()
+
+    with engine.begin() as connection:
+        connection.execute(insert(models.Genre), [{"genre_name": "Drama"}])
+        connection.execute(insert(models.Venue), [
+            {"venue_name": f"Venue {v}", "address_line1": "1 Street", "city": "London",
+             "postal_code": "N1", "country": "UK", "total_capacity": seats_per_venue}
+            for v in range(1, venues + 1)
+        ])
+        _insert_chunked(connection, models.Seat, (
+            {"venue_id": v, "row_number": chr(65 + s // 25), "seat_number": str(s % 25 + 1),
+             "seat_category": "Standard", "is_active": True}
+            for v in range(1, venues + 1) for s in range(seats_per_venue)
+        ))
+        connection.execute(insert(models.Show), [
+            {"title": f"Show {s}", "genre_id": 1, "duration_minutes": 120, "show_status": "Active"}
+            for s in range(1, shows + 1)
+        ])
+        _insert_chunked(connection, models.Performance, (
+            {"show_id": rng.randint(1, shows), "venue_id": rng.randint(1, venues),
+             "performance_date": today + timedelta(days=rng.randint(-365, 180)),
+             "start_time": dt_time(19, 30), "total_seats": seats_per_venue,
+             "available_seats": seats_per_venue,
+             "performance_status": rng.choice(["Scheduled"] * 9 + ["Cancelled"])}
+            for _ in range(performances)
+        ))
+        _insert_chunked(connection, models.User, (
+            {"first_name": "User", "last_name": str(u), "email": f"user{u}@example.com",
+             "password_hash": "x", "registration_date": today}
+            for u in range(1, users + 1)
+        ))
+
+        print(f"  inserting {bookings:,} bookings ...")
+        _insert_chunked(connection, models.Booking, (
+            {"user_id": rng.randint(1, users), "performance_id": rng.randint(1, performances),
+             "booking_reference": f"BK{b:012d}",
+             "booking_date": now - timedelta(minutes=rng.randint(0, 525600)),
+             "total_amount": 50, "booking_status": rng.choice(["Confirmed"] * 7 + ["Pending", "Cancelled", "Refunded"])}
+            for b in range(1, bookings + 1)
+        ))
+        print("  inserting booking details and payments ...")
+        _insert_chunked(connection, models.BookingDetail, (
+            {"booking_id": b, "seat_id": rng.randint(1, venues * seats_per_venue), "seat_price": 25,
+             "row_number": "A", "seat_number": "1", "seat_category": "Standard"}
+            for b in range(1, bookings + 1) for _ in range(2)
+        ))
+        _insert_chunked(connection, models.Payment, (
+            {"booking_id": b, "payment_amount": 50, "payment_method": "Card",
+             "payment_status": rng.choice(["Completed"] * 8 + ["Failed", "Refunded"])}
+            for b in range(1, bookings + 1)
+        ))
+
+    return performances, users
+
+
+# =============================================
+# Queries under test
+# =============================================
+
+def hot_path_queries(performances: int, users: int):
+    """(name, statement, index the plan should use, or a tuple of acceptable ones)"""
+    rng = random.Random(7)
+    performance_id = rng.randint(1, performances)
+    booking_id = rng.randint(1, performances * 10)
+    active = ["Pending", "Confirmed"]
+    return [
+        ("seat availability",
+         select(models.BookingDetail.seat_id).join(models.Booking).where(
+             models.Booking.performance_id == performance_id,
+             models.Booking.booking_status.in_(active)),
+         "ix_booking_performance_status"),
+        ("double-booking check",
+         select(models.BookingDetail.seat_id).join(models.Booking).where(
+             models.BookingDetail.seat_id.in_([1, 2, 3, 4]),
+             models.Booking.performance_id == performance_id,
+             models.Booking.booking_status.in_(active)),
+         ("ix_booking_performance_status", "ix_booking_detail_seat_booking")),
+        ("show performances",
+         select(models.Performance).where(
+             models.Performance.show_id == 7,
+             models.Performance.performance_date >= date.today(),
+             models.Performance.performance_status == "Scheduled"),
+         "ix_performance_show_date_status"),
+        ("upcoming performances",
+         select(models.Performance.performance_id).where(
+             models.Performance.performance_date >= date.today(),
+             models.Performance.performance_date < date.today() + timedelta(days=14),
+             models.Performance.performance_status == "Scheduled"),
+         ("ix_performance_date_status", "ix_performance_status_date_time")),
+        ("payment by booking",
+         select(models.Payment).where(
+             models.Payment.booking_id == booking_id,
+             models.Payment.payment_status == "Completed"),
+         "ix_payment_booking_status"),
+        ("user bookings",
+         select(models.Booking).where(models.Booking.user_id == rng.randint(1, users)).order_by(
+             models.Booking.booking_date.desc()),
+         "ix_booking_user_date"),
+        ("upcoming listing page",
+         select(models.Performance.performance_id).where(
+             models.Performance.performance_status == "Scheduled",
+             models.Performance.performance_date >= date.today()).order_by(
+             models.Performance.performance_date, models.Performance.start_time,
+             models.Performance.performance_id).limit(50),
+         ("ix_performance_status_date_time", "ix_performance_date_status")),
+        ("shows by title page",
+         select(models.Show.show_id).where(models.Show.show_status == "Active").order_by(
+             models.Show.title, models.Show.show_id).limit(50),
+         "ix_show_status_title"),
+        ("daily revenue (7 days)",
+         select(func.date(models.Booking.booking_date), func.count(models.Booking.booking_id),
+                func.sum(models.Booking.total_amount)).where(
+             models.Booking.booking_date >= datetime.now() - timedelta(days=7)).group_by(
+             func.date(models.Booking.booking_date)),
+         "ix_booking_booking_date"),
+    ]
+
+
+def explain(connection, statement) -> str:
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite" else "EXPLAIN "
+    rows = connection.execute(text(prefix + sql)).fetchall()
+    return "\n".join("    " + " | ".join(str(value) for value in row) for row in rows)
+
+
+def analyze(engine):
+    """Refresh planner statistics"""
+    with engine.begin() as connection:
+        if connection.dialect.name == "sqlite":
+            connection.execute(text("ANALYZE"))
+        else:
+            connection.execute(text("ANALYZE TABLE booking, booking_detail, performance, payment"))
+
+
+def median_ms(connection, statement, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        connection.execute(statement).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def measure(engine, queries, runs: int) -> dict:
+    results = {}
+    with engine.connect() as connection:
+        for name, statement, _ in queries:
+            results[name] = (explain(connection, statement), median_ms(connection, statement, runs))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN and time booking hot-path queries with and without indexes")
+    parser.add_argument("--url", default="sqlite:///./index_benchmark.db", help="Scratch database URL (dropped and recreated)")
+    parser.add_argument("--bookings", type=int, default=1000000)
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per query")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    print(f"Building scratch database at {args.url}")
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    for index in HOT_PATH_INDEXES.values():
+        index.drop(bind=engine)
+
+    started = time.perf_counter()
+    performances, users = populate(engine, args.bookings)
+    print(f"  loaded in {time.perf_counter() - started:.1f}s")
+
+    queries = hot_path_queries(performances, users)
+    analyze(engine)
+    before = measure(engine, queries, args.runs)
+
+    print("Creating hot-path indexes")
+    for index in HOT_PATH_INDEXES.values():
+        index.create(bind=engine)
+    analyze(engine)
+    after = measure(engine, queries, args.runs)
+
+    failures = 0
+    for name, _, expected in queries:
+        expected = expected if isinstance(expected, tuple) else (expected,)
+        plan_before, ms_before = before[name]
+        plan_after, ms_after = after[name]
+        used = [index_name for index_name in expected if index_name in plan_after]
+        failures += not used
+        print(f"\n=== {name} ===")
+        print(f"  without indexes: {ms_before:9.2f} ms\n{plan_before}")
+        print(f"  with indexes:    {ms_after:9.2f} ms\n{plan_after}")
+        print(f"  {', '.join(used) + ': used' if used else ' / '.join(expected) + ': NOT USED'}"
+              f" ({ms_before / ms_after if ms_after else float('inf'):.1f}x)")
+
+    print(f"\n{len(queries) - failures}/{len(queries)} queries use their index")
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+JSON serialization and compression benchmark
+
+Builds payloads shaped like the heaviest responses (the seat map of a large
+venue and the admin booking / audit log lists) and compares:
+- default:  FastAPI's path, jsonable_encoder + json.dumps (JSONResponse)
+- fast:     FastJSONResponse (orjson, no encoder pass)
+and the body size uncompressed, gzipped and brotli-compressed (when the
+Brotli package is installed), with the time each compression takes.
+
+Usage:
+    python benchmark_responses.py [--seats 2000] [--rows 500] [--runs 20]
+
+Needs no database.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from fastapi.encoders import jsonable_encoder
+from app import compression
+from app.responses import dumps
+
+
+def seat_map(seats: int) -> dict:
+    categories = ("VIP", "Premium", "Standard")
+    return {
+        "performance_id": 1,
+        "performance_date": str(date.today()),
+        "start_time": "19:30:00",
+        "available_seats": seats // 2,
+        "seats": [
+            {
+                "seat_id": i,
+                "row": chr(65 + (i // 40) % 26),
+                "number": str(i % 40 + 1),
+                "category": categories[i % 3],
+                "section": "Stalls" if i < seats // 2 else "Circle",
+                "is_accessible": i % 50 == 0,
+                "is_booked": i % 2 == 0,
+                "price": (Decimal("120.00"), Decimal("85.50"), Decimal("49.99"))[i % 3]
+            }
+            for i in range(seats)
+        ]
+    }
+
+
+def booking_list(rows: int) -> dict:
+    now = datetime(2026, 1, 1, 19, 30)
+    return {
+        "bookings": [
+            {
+                "booking_id": i,
+                "booking_reference": f"BK{i:08d}",
+                "user_id": i % 97,
+                "user_name": "Jo Doe",
+                "user_email": f"user{i % 97}@example.com",
+                "performance_id": i % 40,
+                "show_title": "The Importance of Being Earnest",
+                "performance_date": (now + timedelta(days=i % 60)).date(),
+                "total_amount": Decimal("171.00"),
+                "booking_status": ("Confirmed", "Pending", "Cancelled")[i % 3],
+                "booking_date": now - timedelta(minutes=i),
+                "seat_count": 2
+            }
+            for i in range(rows)
+        ],
+        "total": rows
+    }
+
+
+def audit_log_list(rows: int) -> dict:
+    now = datetime(2026, 1, 1, 12, 0)
+    return {
+        "logs": [
+            {
+                "log_id": i,
+                "user_id": 1,
+                "user_name": "Ad Min",
+                "user_email": "admin@theatre.com",
+                "action": "UPDATE_PERFORMANCE",
+                "entity_type": "Performance",
+                "entity_id": i,
+                "old_values": {"available_seats": 120, "performance_status": "Scheduled"},
+                "new_values": {"available_seats": 118, "performance_status": "Scheduled"},
+                "ip_address": "10.0.0.1",
+                "timestamp": now - timedelta(seconds=i)
+            }
+            for i in range(rows)
+        ],
+        "total": rows
+    }
+
+
+def default_render(content) -> bytes:
+    """What FastAPI does for a returned dict: jsonable_encoder, then JSONResponse.render"""
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def timed(function, argument, runs: int):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function(argument)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON encoders and response compression")
+    parser.add_argument("--seats", type=int, default=2000, help="Seats in the seat map payload")
+    parser.add_argument("--rows", type=int, default=500, help="Rows in the admin list payloads")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {
+        f"seat map ({args.seats} seats)": seat_map(args.seats),
+        f"admin bookings ({args.rows})": booking_list(args.rows),
+        f"audit logs ({args.rows})": audit_log_list(args.rows),
+    }
+
+    print(f"\n{'payload':<28}{'default ms':>12}{'fast ms':>10}{'speedup':>9}")
+    bodies = {}
+    for name, payload in payloads.items():
+        default_ms, default_body = timed(default_render, payload, args.runs)
+        fast_ms, fast_body = timed(dumps, payload, args.runs)
+        if json.loads(default_body) != json.loads(fast_body):
+            raise SystemExit(f"{name}: encoders disagree")
+        bodies[name] = fast_body
+        print(f"{name:<28}{default_ms:>12.2f}{fast_ms:>10.2f}{default_ms / fast_ms:>8.1f}x")
+
+    encodings = ["gzip"] + (["br"] if compression.brotli is not None else [])
+    print(f"\n{'payload':<28}{'raw KB':>9}" + "".join(f"{e + ' KB':>10}{e + ' ms':>9}" for e in encodings))
+    for name, body in bodies.items():
+        row = f"{name:<28}{len(body) / 1024:>9.1f}"
+        for encoding in encodings:
+            ms, compressed = timed(lambda b: compression.compress(b, encoding), body, max(args.runs // 4, 1))
+            row += f"{len(compressed) / 1024:>10.1f}{ms:>9.2f}"
+        print(row)
+    if compression.brotli is None:
+        print("\nBrotli is not installed; only gzip was measured.")
+
+
+if __name__ == "__main__":
+    main()
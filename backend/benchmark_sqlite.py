@@ -0,0 +1,194 @@
+"""
+SQLite profile benchmark: default connection settings vs the tuned profile
+
+Runs the same mixed workload against a scratch SQLite file twice:
+- default: plain engine (rollback journal, default cache, deferred writes)
+- tuned:   database.SQLITE_PRAGMAS (WAL, synchronous=NORMAL, busy timeout,
+           cache/mmap/temp_store) plus the serialized BEGIN IMMEDIATE writer
+
+Writer threads run booking-shaped transactions (availability check, booking
+plus two detail rows, seat counter update); reader threads run the seat-map
+availability query. Prints committed writes/s, reads/s, write p99 and how
+many transactions failed with "database is locked".
+
+Usage:
+    python benchmark_sqlite.py [--writers 4] [--readers 4] [--duration 10]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, time as dt_time
+
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import Base, apply_sqlite_pragmas, make_sqlite_writer_engine
+
+SEATS = 500
+PERFORMANCES = 20
+
+
+def build(url: str):
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(models.Genre), [{"genre_name": "Drama"}])
+        connection.execute(insert(models.Venue), [{
+            "venue_name": "Main", "address_line1": "1 Street", "city": "London",
+            "postal_code": "N1", "country": "UK", "total_capacity": SEATS
+        }])
+        connection.execute(insert(models.Seat), [
+            {"venue_id": 1, "row_number": str(s // 20), "seat_number": str(s % 20 + 1),
+             "seat_category": "Standard", "is_active": True}
+            for s in range(SEATS)
+        ])
+        connection.execute(insert(models.Show), [{"title": "Show", "genre_id": 1, "duration_minutes": 120}])
+        connection.execute(insert(models.Performance), [
+            {"show_id": 1, "venue_id": 1, "performance_date": date.today(), "start_time": dt_time(19, 30),
+             "total_seats": SEATS, "available_seats": SEATS}
+            for _ in range(PERFORMANCES)
+        ])
+        connection.execute(insert(models.User), [{
+            "first_name": "Load", "last_name": "Test", "email": "load@example.com",
+            "password_hash": "x", "registration_date": date.today()
+        }])
+    engine.dispose()
+
+
+def engines_for(profile: str, url: str):
+    """(read engine, write engine) for a profile"""
+    if profile == "default":
+        # The previous configuration: one plain engine for everything
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        return engine, engine
+    reader = create_engine(url, connect_args={"check_same_thread": False})
+    apply_sqlite_pragmas(reader)
+    return reader, make_sqlite_writer_engine(url)
+
+
+def book(Session, rng: random.Random, counter: list):
+    performance_id = rng.randint(1, PERFORMANCES)
+    seat_ids = rng.sample(range(1, SEATS + 1), 2)
+    with Session() as db:
+        taken = db.execute(
+            select(models.BookingDetail.seat_id).join(models.Booking).where(
+                models.BookingDetail.seat_id.in_(seat_ids),
+                models.Booking.performance_id == performance_id,
+                models.Booking.booking_status.in_(["Pending", "Confirmed"])
+            )
+        ).first()
+        if taken:
+            return
+        counter[0] += 1
+        booking = models.Booking(
+            user_id=1, performance_id=performance_id,
+            booking_reference=f"B{threading.get_ident() % 100000}-{counter[0]}-{rng.randint(0, 10**6)}",
+            total_amount=50, booking_status="Confirmed"
+        )
+        db.add(booking)
+        db.flush()
+        db.add_all([
+            models.BookingDetail(booking_id=booking.booking_id, seat_id=seat_id, seat_price=25,
+                                 row_number="A", seat_number="1", seat_category="Standard")
+            for seat_id in seat_ids
+        ])
+        db.execute(
+            update(models.Performance)
+            .where(models.Performance.performance_id == performance_id)
+            .values(available_seats=models.Performance.available_seats - 2)
+        )
+        db.commit()
+
+
+def seat_map(Session, rng: random.Random):
+    with Session() as db:
+        db.execute(
+            select(models.BookingDetail.seat_id).join(models.Booking).where(
+                models.Booking.performance_id == rng.randint(1, PERFORMANCES),
+                models.Booking.booking_status.in_(["Pending", "Confirmed"])
+            )
+        ).all()
+
+
+def run(profile: str, url: str, writers: int, readers: int, duration: float) -> dict:
+    read_engine, write_engine = engines_for(profile, url)
+    ReadSession = sessionmaker(bind=read_engine)
+    WriteSession = sessionmaker(bind=write_engine)
+    deadline = time.perf_counter() + duration
+    write_latencies, reads, locked, lock = [], [0], [0], threading.Lock()
+
+    def writer(seed):
+        rng, counter = random.Random(seed), [0]
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                book(WriteSession, rng, counter)
+            except OperationalError:
+                with lock:
+                    locked[0] += 1
+                continue
+            with lock:
+                write_latencies.append(time.perf_counter() - started)
+
+    def reader(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            try:
+                seat_map(ReadSession, rng)
+            except OperationalError:
+                with lock:
+                    locked[0] += 1
+                continue
+            with lock:
+                reads[0] += 1
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(1000 + i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    read_engine.dispose()
+    write_engine.dispose()
+
+    write_latencies.sort()
+    count = len(write_latencies)
+    return {
+        "writes_per_s": count / duration,
+        "reads_per_s": reads[0] / duration,
+        "write_p50_ms": statistics.median(write_latencies) * 1000 if count else 0.0,
+        "write_p99_ms": write_latencies[min(count - 1, int(count * 0.99))] * 1000 if count else 0.0,
+        "locked_errors": locked[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tuned SQLite profile against SQLite defaults")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        for profile in ("default", "tuned"):
+            path = os.path.join(scratch, f"{profile}.db")
+            url = f"sqlite:///{path}"
+            build(url)
+            results[profile] = run(profile, url, args.writers, args.readers, args.duration)
+
+    print(f"\n{'profile':<10}{'writes/s':>10}{'reads/s':>10}{'w p50 ms':>10}{'w p99 ms':>10}{'locked':>8}")
+    for profile, r in results.items():
+        print(f"{profile:<10}{r['writes_per_s']:>10.1f}{r['reads_per_s']:>10.1f}"
+              f"{r['write_p50_ms']:>10.2f}{r['write_p99_ms']:>10.2f}{r['locked_errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
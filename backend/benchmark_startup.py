@@ -0,0 +1,100 @@
+"""
+Worker cold-start benchmark
+
+Starts --runs fresh interpreters, each one standing in for a new uvicorn
+worker, and times:
+- import:  importing app.main (module-level work: routers, models, settings)
+- startup: the lifespan startup (pool pre-warm, background jobs)
+- total:   process spawn to ready, including interpreter start
+It also reports whether qrcode/Pillow were loaded, which should only happen
+once a ticket is generated. --importtime prints the slowest modules imported
+by app.main, from python -X importtime.
+
+Usage:
+    python benchmark_startup.py [--runs 5] [--importtime]
+
+Uses the database configured in .env / DATABASE_URL (startup pre-warms its
+pools but does not write).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CHILD = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        print(json.dumps({
+            "import_ms": (imported - started) * 1000,
+            "startup_ms": (ready - imported) * 1000,
+            "heavy_modules": sorted(m for m in ("qrcode", "PIL") if m in sys.modules),
+        }), flush=True)
+
+asyncio.run(boot())
+"""
+
+
+def cold_start() -> dict:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", CHILD], cwd=BACKEND_DIR, stdout=subprocess.PIPE, text=True
+    )
+    line = process.stdout.readline()
+    total_ms = (time.perf_counter() - started) * 1000
+    process.wait()
+    if not line:
+        raise SystemExit(f"Worker failed to start (exit code {process.returncode})")
+    result = json.loads(line)
+    result["total_ms"] = total_ms
+    return result
+
+
+def slowest_imports(limit: int = 15):
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    ).stderr
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        head, cumulative_us, module = line.split("|")
+        rows.append((int(cumulative_us), int(head.split(":")[1]), module.rstrip()))
+    print(f"\n{'cumulative ms':>14}{'self ms':>10}  module")
+    for cumulative_us, self_us, module in sorted(rows, reverse=True)[:limit]:
+        print(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-worker cold-start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", action="store_true", help="Also list the slowest imports")
+    args = parser.parse_args()
+
+    results = [cold_start() for _ in range(args.runs)]
+
+    print(f"\n{'':<10}{'median ms':>12}{'max ms':>10}")
+    for key, label in (("import_ms", "import"), ("startup_ms", "startup"), ("total_ms", "total")):
+        values = [r[key] for r in results]
+        print(f"{label:<10}{statistics.median(values):>12.1f}{max(values):>10.1f}")
+    heavy = sorted({m for r in results for m in r["heavy_modules"]})
+    print(f"\nHeavy optional modules loaded at startup: {', '.join(heavy) if heavy else 'none'}")
+
+    if args.importtime:
+        slowest_imports()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Static asset build
+
+Produces frontend/build/:
+- assets/    content-hashed copies of frontend/static, of the inline <script>
+             and <style> blocks extracted from the templates, and (when the
+             Tailwind CLI is installed) a compiled Tailwind stylesheet; each
+             text file gets .gz and, with the Brotli package, .br siblings
+- templates/ the templates with extracted blocks replaced by asset() links
+- manifest.json  logical name -> fingerprinted file
+
+Inline blocks are extracted when they are at least --inline-max bytes and
+contain no Jinja syntax; smaller ones (the pre-auth redirect guards) stay
+inline so they run before first paint without a request.
+
+Old fingerprinted files are kept so pages rendered by workers still on the
+previous manifest keep working; pass --clean to remove them. Restart the
+workers after a build. Delete frontend/build to serve the sources again.
+
+Usage:
+    python build_assets.py [--inline-max 1024] [--clean]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
+STATIC_DIR = FRONTEND_DIR / "static"
+TEMPLATES_DIR = FRONTEND_DIR / "templates"
+BUILD_DIR = FRONTEND_DIR / "build"
+ASSETS_DIR = BUILD_DIR / "assets"
+
+COMPRESSIBLE_SUFFIXES = {".js", ".css", ".svg", ".html", ".json", ".txt", ".map"}
+INLINE_BLOCK_RE = re.compile(r"<(script|style)(\s[^>]*)?>(.*?)</\1>", re.S)
+
+
+def fingerprint(name: str, content: bytes) -> str:
+    """Write content under a hashed name with precompressed variants; returns the relative path"""
+    path = Path(name)
+    digest = hashlib.blake2b(content, digest_size=8).hexdigest()
+    built = path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+    target = ASSETS_DIR / built
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        if path.suffix in COMPRESSIBLE_SUFFIXES:
+            target.with_name(target.name + ".gz").write_bytes(gzip.compress(content, compresslevel=9, mtime=0))
+            if brotli is not None:
+                target.with_name(target.name + ".br").write_bytes(brotli.compress(content, quality=11))
+    return built
+
+
+def build_tailwind(manifest: dict):
+    """Compile the Tailwind classes used by the templates, if the CLI is available"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, output = Path(tmp) / "input.css", Path(tmp) / "tailwind.css"
+        source.write_text("@tailwind base;\n@tailwind components;\n@tailwind utilities;\n")
+        try:
+            subprocess.run(
+                ["npx", "--no-install", "tailwindcss", "-c", "tailwind.config.js",
+                 "-i", str(source), "-o", str(output), "--minify"],
+                cwd=FRONTEND_DIR, check=True, capture_output=True, timeout=120
+            )
+        except (OSError, subprocess.SubprocessError):
+            print("  Tailwind CLI not available; pages keep loading Tailwind from the CDN")
+            return
+        manifest["css/tailwind.css"] = fingerprint("css/tailwind.css", output.read_bytes())
+        print(f"  css/tailwind.css -> {manifest['css/tailwind.css']}")
+
+
+def extract_inline(template: Path, manifest: dict, inline_max: int) -> str:
+    """Template source with large, Jinja-free inline blocks replaced by asset links"""
+    source = template.read_text()
+    counter = 0
+
+    def replace(match):
+        nonlocal counter
+        tag, attributes, body = match.group(1), match.group(2) or "", match.group(3)
+        if len(body.encode()) < inline_max or "{{" in body or "{%" in body or "src=" in attributes:
+            return match.group(0)
+        counter += 1
+        suffix = "js" if tag == "script" else "css"
+        name = f"inline/{template.stem}-{counter}.{suffix}"
+        manifest[name] = fingerprint(name, body.strip().encode() + b"\n")
+        if tag == "script":
+            return f'<script{attributes} src="{{{{ asset(\'{name}\') }}}}"></script>'
+        return f'<link rel="stylesheet" href="{{{{ asset(\'{name}\') }}}}">'
+
+    built = INLINE_BLOCK_RE.sub(replace, source)
+    if counter:
+        print(f"  {template.name}: {counter} inline block(s) extracted")
+    return built
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint and precompress frontend assets")
+    parser.add_argument("--inline-max", type=int, default=1024,
+                        help="Inline blocks at least this many bytes are moved to files")
+    parser.add_argument("--clean", action="store_true", help="Remove fingerprinted files from earlier builds")
+    args = parser.parse_args()
+
+    if args.clean and ASSETS_DIR.exists():
+        shutil.rmtree(ASSETS_DIR)
+    ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+
+    print("Static files:")
+    for path in sorted(STATIC_DIR.rglob("*")):
+        if path.is_file():
+            name = path.relative_to(STATIC_DIR).as_posix()
+            manifest[name] = fingerprint(name, path.read_bytes())
+            print(f"  {name} -> {manifest[name]}")
+    build_tailwind(manifest)
+
+    print("Templates:")
+    templates_tmp = BUILD_DIR / "templates.tmp"
+    shutil.rmtree(templates_tmp, ignore_errors=True)
+    templates_tmp.mkdir()
+    for template in sorted(TEMPLATES_DIR.glob("*.html")):
+        (templates_tmp / template.name).write_text(extract_inline(template, manifest, args.inline_max))
+    shutil.rmtree(BUILD_DIR / "templates", ignore_errors=True)
+    templates_tmp.rename(BUILD_DIR / "templates")
+
+    (BUILD_DIR / "manifest.json").write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    total = sum(f.stat().st_size for f in ASSETS_DIR.rglob("*") if f.suffix not in (".gz", ".br"))
+    print(f"\n{len(manifest)} assets ({total / 1024:.0f} KB before compression) in {BUILD_DIR}")
+    if brotli is None:
+        print("Brotli is not installed; only .gz variants were written.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Concurrency check: cold concurrent reads must not hang the event loop
+
+The calendar (app/performance_calendar.py) and the show search index
+(app/show_search.py) are built on first use through AsyncSession.run_sync,
+where every query yields to the event loop. Holding a threading.Lock across
+those queries deadlocks the worker as soon as a second request arrives while
+the first is still building, so this starts the real app under uvicorn with
+cold caches, fires concurrent requests at both endpoints and fails if any of
+them times out.
+
+Usage:
+    python check_concurrency.py [--concurrency 32] [--rounds 3] [--timeout 10]
+
+Reads the database configured in .env / DATABASE_URL, which should already
+contain shows and performances. Exits non-zero on a hang or an error.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+PATHS = ["/api/performances/calendar", "/api/shows/search?q=a"]
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    # The burst comes from one client address; keep it clear of the rate limiter
+    env = dict(os.environ, RATE_LIMIT_ENABLED="false")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=env
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline and process.poll() is None:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"server did not start on port {port}")
+
+
+async def _burst(base_url: str, concurrency: int, timeout: float) -> list:
+    """Concurrent cold requests to every path; returns the failures"""
+    limits = httpx.Limits(max_connections=concurrency * len(PATHS))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        async def get(path: str):
+            try:
+                response = await client.get(path)
+            except httpx.TimeoutException:
+                return f"{path}: no response within {timeout:g}s"
+            except httpx.HTTPError as e:
+                return f"{path}: {type(e).__name__}"
+            if response.status_code != 200:
+                return f"{path}: HTTP {response.status_code}"
+            return None
+
+        results = await asyncio.gather(*(get(path) for _ in range(concurrency) for path in PATHS))
+    return [result for result in results if result is not None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that cold concurrent reads do not hang")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent requests per endpoint")
+    parser.add_argument("--rounds", type=int, default=3, help="Server restarts, each starting cold")
+    parser.add_argument("--timeout", type=float, default=10, help="Seconds before a request counts as hung")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    failed = False
+    for round_number in range(1, args.rounds + 1):
+        process = _start_server(args.port)
+        try:
+            started = time.perf_counter()
+            failures = asyncio.run(_burst(f"http://127.0.0.1:{args.port}", args.concurrency, args.timeout))
+            elapsed = time.perf_counter() - started
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                # A deadlocked worker does not shut down gracefully
+                process.kill()
+                process.wait()
+
+        if failures:
+            failed = True
+            print(f"round {round_number}: {len(failures)} failed requests in {elapsed:.2f}s")
+            for failure in sorted(set(failures)):
+                print(f"  {failure}")
+        else:
+            print(f"round {round_number}: {args.concurrency * len(PATHS)} requests ok in {elapsed:.2f}s")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
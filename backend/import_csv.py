@@ -0,0 +1,54 @@
+"""
+Bulk CSV import for the Theatre Booking System
+
+Streams a CSV file into the database with chunked validation and batched
+inserts, then prints a per-row error report. See app/csv_import.py for the
+expected columns of each file type.
+
+Usage:
+    python import_csv.py venues venues.csv
+    python import_csv.py seats seats.csv --dry-run
+    python import_csv.py performances season.csv
+
+Typical onboarding order: venues, seats, shows, performances.
+"""
+
+import argparse
+import sys
+import time
+
+from app.database import SessionLocal
+from app import csv_import
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import CSV data")
+    parser.add_argument("entity", choices=list(csv_import.IMPORTERS), help="Type of rows in the file")
+    parser.add_argument("path", help="Path to the CSV file (UTF-8, header row required)")
+    parser.add_argument("--dry-run", action="store_true", help="Validate only, write nothing")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        with open(args.path, newline="", encoding="utf-8-sig") as stream:
+            report = csv_import.import_csv(db, args.entity, stream, dry_run=args.dry_run)
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+
+    mode = " (dry run)" if report["dry_run"] else ""
+    print(f"📥 {report['entity']}{mode}: {report['rows_read']} rows read, "
+          f"{report['rows_valid']} valid, {report['rows_inserted']} inserted in {elapsed:.2f}s")
+
+    if report["error_count"]:
+        print(f"❌ {report['error_count']} rows rejected:")
+        for error in report["errors"]:
+            print(f"   line {error['line']}: {error['error']}")
+        if report["error_count"] > len(report["errors"]):
+            print(f"   ... {report['error_count'] - len(report['errors'])} more")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,10 @@
 Database initialization script for Theatre Booking System
 Creates tables and populates sample data
 """
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
 from app.database import engine, Base, SessionLocal
 from app.models import Genre, User, Show, Venue, Seat, Performance, SeatCategoryPricing, PerformancePricing, Booking, BookingDetail, Payment
 from app.auth import get_password_hash
@@ -12,10 +16,23 @@ def hash_password(password: str) -> str:
     """Hash password using passlib (consistent with auth.py)"""
     return get_password_hash(password)
 
+def stamp_migrations_head():
+    """Mark a schema created from the current models as fully migrated"""
+    backend_dir = Path(__file__).resolve().parent
+    config = Config(str(backend_dir / "alembic.ini"))
+    config.set_main_option("script_location", str(backend_dir / "alembic"))
+    command.stamp(config, "head")
+
 def init_database():
     print("Creating database tables...")
+    new_database = not inspect(engine).get_table_names()
     Base.metadata.create_all(bind=engine)
     print("✓ Tables created successfully")
+    if new_database:
+        stamp_migrations_head()
+        print("✓ Migrations stamped at head")
+    else:
+        print("Existing database: run `alembic upgrade head` to apply schema changes")
     
     db = SessionLocal()
     try:
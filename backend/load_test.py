@@ -0,0 +1,203 @@
+"""
+Load test: sync (threadpool) vs async (event loop) read endpoints
+
+Starts each variant under uvicorn on a local port, drives it with concurrent
+HTTP clients for a fixed duration and prints throughput and latency
+percentiles per endpoint.
+
+- sync:  the previous `def` handlers on database.get_db (Starlette threadpool)
+- async: the real shows/performances routers on database.get_async_db
+
+Usage:
+    python load_test.py [--concurrency 64] [--duration 10] [--performance-id 1]
+
+Both variants read the database configured in .env / DATABASE_URL, which
+should already contain shows, performances and seats.
+"""
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy.orm import Session, joinedload
+
+from app import database, models, pricing_engine, seat_layout
+from app.routers import performances, shows
+
+
+# =============================================
+# Variants under test
+# =============================================
+
+sync_app = FastAPI()
+
+
+@sync_app.get("/api/shows/")
+def sync_get_shows(status: str = "Active", db: Session = Depends(database.get_db)):
+    shows_data = [
+        {
+            "show_id": show.show_id,
+            "title": show.title,
+            "genre_name": show.genre.genre_name if show.genre else None,
+            "duration_minutes": show.duration_minutes,
+            "show_status": show.show_status
+        }
+        for show in db.query(models.Show).options(joinedload(models.Show.genre)).filter(
+            models.Show.show_status == status
+        ).all()
+    ]
+    return {"shows": shows_data, "count": len(shows_data)}
+
+
+@sync_app.get("/api/performances/")
+def sync_get_performances(db: Session = Depends(database.get_db)):
+    performances_data = [
+        {
+            "performance_id": p.performance_id,
+            "show_id": p.show_id,
+            "venue_id": p.venue_id,
+            "performance_date": p.performance_date.isoformat(),
+            "start_time": str(p.start_time),
+            "performance_status": p.performance_status
+        }
+        for p in db.query(models.Performance).filter(
+            models.Performance.performance_date >= date.today(),
+            models.Performance.performance_status == "Scheduled"
+        ).all()
+    ]
+    return {"performances": performances_data, "count": len(performances_data)}
+
+
+@sync_app.get("/api/performances/{performance_id}/seats")
+def sync_get_seats(performance_id: int, db: Session = Depends(database.get_db)):
+    performance = db.query(models.Performance).filter(
+        models.Performance.performance_id == performance_id
+    ).first()
+    if not performance:
+        raise HTTPException(status_code=404, detail="Performance not found")
+
+    layout = seat_layout.get_venue_layout(db, performance.venue_id)
+    booked_seat_ids = {
+        row[0] for row in db.query(models.BookingDetail.seat_id).join(models.Booking).filter(
+            models.Booking.performance_id == performance_id,
+            models.Booking.booking_status.in_(["Pending", "Confirmed"])
+        ).all()
+    }
+    live_prices = pricing_engine.get_prices(performance_id)
+    if live_prices is not None:
+        pricing_dict = {category: float(price) for category, price in live_prices.items()}
+    else:
+        pricing_dict = {
+            p.seat_category: float(p.price)
+            for p in db.query(models.PerformancePricing).filter(
+                models.PerformancePricing.performance_id == performance_id
+            ).all()
+        }
+    return {
+        "performance_id": performance_id,
+        "seats": [
+            {**seat, "is_booked": seat["seat_id"] in booked_seat_ids, "price": pricing_dict.get(seat["category"], 0.0)}
+            for seat in layout.seats
+        ]
+    }
+
+
+async_app = FastAPI()
+async_app.include_router(shows.router)
+async_app.include_router(performances.router)
+
+
+# =============================================
+# Driver
+# =============================================
+
+async def _worker(client: httpx.AsyncClient, path: str, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def _run_endpoint(base_url: str, path: str, concurrency: int, duration: float) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        # Warm up caches and connections before measuring
+        await asyncio.gather(*(client.get(path) for _ in range(concurrency)))
+
+        latencies, errors = [], []
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            _worker(client, path, deadline, latencies, errors) for _ in range(concurrency)
+        ))
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": len(errors),
+        "rps": count / duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[min(count - 1, int(count * 0.99))] * 1000 if latencies else 0.0
+    }
+
+
+def _start_server(variant: str, port: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"load_test:{variant}_app",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"]
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline and process.poll() is None:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{variant} server did not start on port {port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync vs async read endpoints under load")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent clients per endpoint")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per endpoint")
+    parser.add_argument("--performance-id", type=int, default=1, help="Performance used for the seat map")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    paths = ["/api/shows/", "/api/performances/", f"/api/performances/{args.performance_id}/seats"]
+    results = {}
+
+    for variant in ("sync", "async"):
+        process = _start_server(variant, args.port)
+        try:
+            for path in paths:
+                results[(variant, path)] = asyncio.run(
+                    _run_endpoint(f"http://127.0.0.1:{args.port}", path, args.concurrency, args.duration)
+                )
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(f"\n{'endpoint':<34}{'variant':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for path in paths:
+        for variant in ("sync", "async"):
+            r = results[(variant, path)]
+            print(f"{path:<34}{variant:<8}{r['rps']:>10.1f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
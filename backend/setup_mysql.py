@@ -19,7 +19,7 @@ Configuration:
 """
 
 import pymysql
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, insert
 from sqlalchemy.orm import sessionmaker
 import os
 import sys
@@ -225,7 +225,7 @@ def seed_data():
         seats = []
         for row in "ABCDEFGHIJ":
             for num in range(1, 21):
-                seats.append(Seat(
+                seats.append(dict(
                     venue_id=venue.venue_id,
                     row_number=row,
                     seat_number=str(num),
@@ -234,7 +234,8 @@ def seed_data():
                     is_accessible=(num in [1, 20]),  # Aisle seats are accessible
                     is_active=True
                 ))
-        db.add_all(seats)
+        # Single batched INSERT instead of one ORM object per seat
+        db.execute(insert(Seat), seats)
         db.commit()
         print("  ✓ 200 seats seeded")
         
@@ -23,6 +23,24 @@ async function apiRequest(endpoint, options = {}) {
     }
 }
 
+// Fetch every page of a cursor-paginated list endpoint (null if a request fails)
+async function fetchAllPages(url, key) {
+    const items = [];
+    let pageUrl = url;
+    while (pageUrl) {
+        const response = await fetch(pageUrl);
+        if (!response.ok) {
+            return null;
+        }
+        const data = await response.json();
+        items.push(...data[key]);
+        pageUrl = data.next_cursor
+            ? `${url}${url.includes('?') ? '&' : '?'}cursor=${encodeURIComponent(data.next_cursor)}`
+            : null;
+    }
+    return items;
+}
+
 // Check authentication status
 function isAuthenticated() {
     return !!localStorage.getItem('access_token');